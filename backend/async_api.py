@@ -0,0 +1,294 @@
+"""
+CoinDCX API Wrapper - asyncio
+=============================
+Same calls as CoinDCXAPI, as coroutines over one pooled aiohttp session,
+so hundreds of order/ticker calls can be in flight without a thread each.
+
+Only the ticker snapshot is cached, by TickerCache's rules: fresh for
+the TTL, then served stale for TICKER_MAX_STALE while one background
+refresh runs, then an error - never prices older than that. resolve_market()
+stays synchronous: it reads the last SymbolIndex and never does I/O.
+"""
+
+import asyncio
+import json
+import time
+import aiohttp
+from config import (
+    API_KEY, API_SECRET,
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_TICKER_TIMEOUT,
+    HTTP_RETRIES, HTTP_BACKOFF, TICKER_CACHE_TTL, TICKER_MAX_STALE, ASYNC_HTTP_LIMIT
+)
+from coindcx_api import CoinDCXAPI
+from symbols import SymbolIndex, futures_market
+from rate_limiter import RateLimiter, RateLimitTimeout, endpoint_class, PRIORITY_ORDER, PRIORITY_MARKET
+from metrics import record_request
+from event_log import EVENT_LOG
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class AsyncCoinDCXAPI:
+    
+    BASE_URL = CoinDCXAPI.BASE_URL
+    PUBLIC_URL = CoinDCXAPI.PUBLIC_URL
+    
+    # Pure helpers shared with the blocking client
+    _generate_signature = CoinDCXAPI._generate_signature
+    _order_body = staticmethod(CoinDCXAPI._order_body)
+    calculate_quantity = CoinDCXAPI.calculate_quantity
+    
+    def __init__(self, limit=ASYNC_HTTP_LIMIT, limiter=None, base_url=None):
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        self.api_key = API_KEY
+        self.api_secret = API_SECRET
+        self.limiter = limiter or RateLimiter()
+        self.limit = limit
+        self.session = None
+        self._index = None
+        self._index_source = None
+        self._tickers = None
+        self._tickers_at = 0
+        self._refresh = None  # in-flight ticker fetch (single-flight)
+        self._last_error = None
+        self.version = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+    
+    def _client(self):
+        """Pooled keep-alive session - created on first use, inside the loop"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit)
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=HTTP_CONNECT_TIMEOUT,
+                sock_read=HTTP_READ_TIMEOUT
+            )
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self.session
+    
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+    
+    async def _make_request(self, endpoint, body=None, method="POST", priority=None):
+        url = f"{self.BASE_URL}{endpoint}"
+        
+        if body is None:
+            body = {}
+        
+        kind = endpoint_class(endpoint)
+        try:
+            await self.limiter.acquire_async(kind, priority)
+        except RateLimitTimeout as e:
+            return {"error": str(e)}
+        
+        body['timestamp'] = int(time.time() * 1000)
+        signature = self._generate_signature(body)
+        
+        headers = {
+            'Content-Type': 'application/json',
+            'X-AUTH-APIKEY': self.api_key,
+            'X-AUTH-SIGNATURE': signature
+        }
+        
+        started = time.perf_counter()
+        try:
+            session = self._client()
+            if method == "POST":
+                # Send exactly the bytes that were signed
+                data = json.dumps(body, separators=(',', ':'))
+                async with session.post(url, data=data, headers=headers) as response:
+                    self.limiter.observe(kind, response.status, response.headers)
+                    record_request(endpoint, started, response.status >= 400)
+                    return await response.json(content_type=None)
+            async with session.get(url, headers=headers) as response:
+                self.limiter.observe(kind, response.status, response.headers)
+                record_request(endpoint, started, response.status >= 400)
+                return await response.json(content_type=None)
+        except Exception as e:
+            record_request(endpoint, started, True)
+            return {"error": str(e) or type(e).__name__}
+    
+    # ==========================================
+    # PUBLIC ENDPOINTS
+    # ==========================================
+    
+    async def _fetch_ticker(self):
+        """GET with retries/backoff - public data only, orders never retry"""
+        timeout = aiohttp.ClientTimeout(sock_connect=HTTP_CONNECT_TIMEOUT, sock_read=HTTP_TICKER_TIMEOUT)
+        error = None
+        for attempt in range(HTTP_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(HTTP_BACKOFF * (2 ** (attempt - 1)))
+            try:
+                await self.limiter.acquire_async("public", PRIORITY_MARKET)
+                started = time.perf_counter()
+                async with self._client().get(f"{self.BASE_URL}/exchange/ticker", timeout=timeout) as response:
+                    self.limiter.observe("public", response.status, response.headers)
+                    record_request("/exchange/ticker", started, response.status >= 400)
+                    if response.status in RETRY_STATUS:
+                        error = f"HTTP {response.status}"
+                        continue
+                    return await response.json(content_type=None)
+            except Exception as e:
+                error = str(e) or type(e).__name__
+        return {"error": error}
+    
+    async def get_ticker(self):
+        """Full ticker (shared list - do not mutate) or {"error": ...}"""
+        age = time.monotonic() - self._tickers_at
+        if self._tickers is not None and age < TICKER_CACHE_TTL:
+            self.hits += 1
+            return self._tickers
+        
+        # Stale-while-revalidate
+        if self._tickers is not None and age < TICKER_CACHE_TTL + TICKER_MAX_STALE:
+            self.stale_hits += 1
+            self._start_refresh()
+            return self._tickers
+        
+        # Nothing usable - join the in-flight fetch if any
+        self.misses += 1
+        await asyncio.shield(self._start_refresh())
+        return self._usable()
+    
+    def _usable(self):
+        age = time.monotonic() - self._tickers_at
+        if self._tickers is not None and age < TICKER_CACHE_TTL + TICKER_MAX_STALE:
+            return self._tickers
+        return {"error": self._last_error or "Ticker unavailable"}
+    
+    def _start_refresh(self):
+        """The in-flight ticker fetch - started if there is none"""
+        if self._refresh is None:
+            self._refresh = asyncio.ensure_future(self._refresh_ticker())
+        return self._refresh
+    
+    async def _refresh_ticker(self):
+        try:
+            tickers = await self._fetch_ticker()
+        finally:
+            self._refresh = None
+        
+        if isinstance(tickers, list):
+            self._tickers = tickers
+            self._tickers_at = time.monotonic()
+            self._last_error = None
+            self.version += 1
+        else:
+            # Keep serving the last good snapshot until it expires
+            self._last_error = tickers.get("error") if isinstance(tickers, dict) else str(tickers)
+    
+    def ticker_stats(self):
+        """Same fields as TickerCache.stats()"""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "version": self.version,
+            "age": round(time.monotonic() - self._tickers_at, 3) if self._tickers is not None else None,
+            "last_error": self._last_error
+        }
+    
+    async def get_symbol_index(self):
+        """SymbolIndex for the current ticker snapshot (None on error)"""
+        tickers = await self.get_ticker()
+        
+        if not isinstance(tickers, list):
+            return None
+        
+        # Rebuilt once per ticker refresh, not per lookup
+        if self._index_source is not tickers:
+            self._index = SymbolIndex(tickers, self._index)
+            self._index_source = tickers
+        return self._index
+    
+    def resolve_market(self, symbol):
+        """Exchange market name for any symbol alias (no I/O)"""
+        market = self._index.resolve(symbol) if self._index else None
+        return market or futures_market(symbol)
+    
+    async def get_price(self, market):
+        index = await self.get_symbol_index()
+        return index.market_price(market) if index else None
+    
+    async def get_futures_price(self, symbol):
+        try:
+            index = await self.get_symbol_index()
+            return index.price(symbol) if index else None
+        except Exception as e:
+            EVENT_LOG.message("error", f"Error getting futures price: {e}")
+            return None
+    
+    async def get_all_prices(self):
+        index = await self.get_symbol_index()
+        return index.flat_prices() if index else {}
+    
+    # ==========================================
+    # PRIVATE ENDPOINTS
+    # ==========================================
+    
+    async def get_balances(self):
+        return await self._make_request("/exchange/v1/users/balances")
+    
+    async def get_usdt_balance(self):
+        balances = await self.get_balances()
+        
+        if isinstance(balances, list):
+            for bal in balances:
+                if bal.get('currency') == 'USDT':
+                    return float(bal.get('balance', 0))
+        
+        return 0
+    
+    async def get_active_orders(self, market=None):
+        body = {}
+        if market:
+            body['market'] = market
+        return await self._make_request("/exchange/v1/orders/active_orders", body)
+    
+    async def get_order_status(self, order_id):
+        return await self._make_request("/exchange/v1/orders/status", {'id': order_id})
+    
+    async def get_orders_status(self, order_ids):
+        return await self._make_request("/exchange/v1/orders/status_multiple", {'ids': list(order_ids)})
+    
+    # ==========================================
+    # ORDER PLACEMENT
+    # ==========================================
+    
+    async def place_order(self, market, side, order_type, price=None, quantity=None, total_quantity=None,
+                          priority=PRIORITY_ORDER):
+        body = self._order_body(market, side, order_type, price, quantity, total_quantity)
+        
+        EVENT_LOG.message("info", f"📝 Placing order: {body}")
+        return await self._make_request("/exchange/v1/orders/create", body, priority=priority)
+    
+    async def place_orders(self, orders, priority=PRIORITY_ORDER):
+        """Several orders in one request (create_multiple - INR markets only)"""
+        body = {'orders': [dict(self._order_body(**order), ecode='I') for order in orders]}
+        
+        EVENT_LOG.message("info", f"📝 Placing {len(orders)} orders in one batch")
+        return await self._make_request("/exchange/v1/orders/create_multiple", body, priority=priority)
+    
+    async def place_market_buy(self, market, usdt_amount, priority=PRIORITY_ORDER):
+        return await self.place_order(market, "buy", "market_order", total_quantity=usdt_amount,
+                                      priority=priority)
+    
+    async def place_market_sell(self, market, quantity, priority=PRIORITY_ORDER):
+        return await self.place_order(market, "sell", "market_order", quantity=quantity,
+                                      priority=priority)
+    
+    async def place_limit_buy(self, market, price, quantity):
+        return await self.place_order(market, "buy", "limit_order", price=price, quantity=quantity)
+    
+    async def place_limit_sell(self, market, price, quantity):
+        return await self.place_order(market, "sell", "limit_order", price=price, quantity=quantity)
+    
+    async def cancel_order(self, order_id):
+        return await self._make_request("/exchange/v1/orders/cancel", {'id': order_id})
+    
+    async def cancel_all_orders(self, market):
+        return await self._make_request("/exchange/v1/orders/cancel_all", {'market': market})
\ No newline at end of file
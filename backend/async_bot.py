@@ -0,0 +1,260 @@
+"""
+Async Trailing Engine - one event loop for prices, triggers and orders
+======================================================================
+AsyncTrailingBot reuses TrailingBot's trade index, trigger books and
+TP/SL/level state machine unchanged (they never do I/O). What moves onto
+the loop is everything that waits on the network:
+
+- price polling (AsyncCoinDCXAPI ticker, or a PriceSource bridged in)
+- entry orders, bookings and exits (AsyncOrderExecutor, no thread each)
+- order reconciliation passes (a loop task instead of a thread)
+
+BotEngine runs the loop in a background thread so Flask request threads
+can submit commands:
+    
+    engine = BotEngine(AsyncTrailingBot())
+    engine.start()
+    engine.call(engine.bot.start_trade, config)   # from any thread
+
+An ASGI app on the same loop can simply `await bot.start_trade(config)`.
+"""
+
+import asyncio
+import threading
+import time
+from async_api import AsyncCoinDCXAPI
+from order_batch import batch_plan, split_results, fan_out
+from order_executor import AsyncOrderExecutor
+from trailing_bot import TrailingBot
+from metrics import PRICE_FETCH_SECONDS, LOOP_LAG_SECONDS
+from event_log import EVENT_LOG
+from config import PRICE_CHECK_INTERVAL
+
+
+class AsyncTrailingBot(TrailingBot):
+    
+    def __init__(self, socketio=None, api=None, price_source=None, ladder=None, journal=None,
+                 orders=None, interval=PRICE_CHECK_INTERVAL):
+        self.loop = None
+        self.interval = interval
+        self._monitor_task = None
+        self._reconcile_task = None
+        super().__init__(
+            socketio=socketio,
+            api=api or AsyncCoinDCXAPI(),
+            price_source=price_source,
+            ladder=ladder,
+            journal=journal,
+            orders=orders or AsyncOrderExecutor()
+        )
+    
+    def _default_price_source(self):
+        return None  # polled on the loop by _monitor()
+    
+    def attach(self, loop):
+        """Bind to the running loop and resume monitoring if trades exist"""
+        self.loop = loop
+        if self.is_running:
+            self.is_running = False
+            self.start_monitoring()
+        if self.reconciler.orders:
+            self._start_reconciler()
+    
+    # ==========================================
+    # MONITORING
+    # ==========================================
+    
+    def start_monitoring(self):
+        if self.is_running:
+            return
+        
+        self.is_running = True
+        if self.loop is None:
+            return  # started by attach()
+        
+        if self.price_source is not None:
+            self.price_source.subscribe(
+                {self.api.resolve_market(t.coin) for t in self.active_trades.values()}
+            )
+            # Thread-based sources hand their ticks over to the loop
+            self.price_source.start(
+                lambda prices, symbols: self.loop.call_soon_threadsafe(self._check_all_trades, prices, symbols)
+            )
+        else:
+            self._monitor_task = self.loop.create_task(self._monitor())
+        print("🔄 Price monitoring started (asyncio)")
+    
+    def stop_monitoring(self):
+        self.is_running = False
+        if self.price_source is not None:
+            self.price_source.stop()
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+        print("⏹️ Monitoring stopped")
+    
+    def _watch(self, market):
+        if self.price_source is not None:
+            self.price_source.subscribe([market])
+        if not self.is_running:
+            self.start_monitoring()
+    
+    def _start_reconciler(self):
+        if self.loop is None or self._reconcile_task is not None:
+            return  # started by attach()
+        self._reconcile_task = self.loop.create_task(self.reconciler.run_async())
+    
+    async def _monitor(self):
+        """Poll the ticker and run one tick - the loop is free in between"""
+        due = None
+        while self.is_running:
+            started = time.monotonic()
+            if due is not None:
+                # A busy loop or a slow tick pushes this one back
+                LOOP_LAG_SECONDS.observe(max(0.0, started - due))
+            due = started + self.interval
+            try:
+                index = await self.api.get_symbol_index()
+                PRICE_FETCH_SECONDS.observe(time.monotonic() - started)
+                if index is not None:
+                    self._check_all_trades(index, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                EVENT_LOG.message("error", f"Monitor error: {e}")
+            
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0, self.interval - elapsed))
+    
+    # ==========================================
+    # TRADES AND ORDERS
+    # ==========================================
+    
+    async def start_trade(self, trade_config):
+        trade_id = self._new_trade_id()
+        
+        try:
+            params = self._read_trade_config(trade_id, trade_config)
+            
+            current_price = await self.api.get_futures_price(params["coin"])
+            
+            plan = self._plan_trade(trade_id, params, current_price)
+            if "error" in plan:
+                return plan
+            
+            method, args = self._entry_order(plan)
+            order_result = await method(*args)
+            
+            return self._open_trade(trade_id, plan, order_result)
+        
+        except Exception as e:
+            error_msg = str(e)
+            self.log(trade_id, f"❌ Error: {error_msg}", "error")
+            return {"success": False, "error": error_msg}
+    
+    async def close_trade(self, trade_id):
+        trade = self._begin_close(trade_id)
+        if isinstance(trade, dict):
+            return trade
+        
+        try:
+            current_price = await self.api.get_futures_price(trade.coin) or trade.entry_price
+            return self._finish_close(trade, current_price)
+        except Exception as e:
+            # Already out of the monitor - the exit must still go out
+            self._exit_failed(trade, trade.entry_price, "manual", 1, e)
+            return {"success": False, "error": str(e)}
+    
+    def _submit_order(self, trade_id, key, prepare, on_done):
+        batch = getattr(self._tick, "batch", None)
+        if batch is not None:
+            batch.append((trade_id, key, (prepare, on_done)))
+            return True
+        
+        async def job():
+            prepared = prepare()
+            if prepared is None:
+                return None
+            tag, order = prepared
+            return tag, await self.api.place_order(**order)
+        
+        return self.orders.submit(trade_id, key, job, on_done)
+    
+    async def _run_batch(self, items):
+        legs, orders, owner = self._prepare_batch(items)
+        if not orders:
+            return [None] * len(legs)
+        
+        priority = min(order.pop("priority") for order in orders)
+        batched, single = batch_plan(orders)
+        
+        calls = [self.api.place_order(priority=priority, **orders[i]) for i in single]
+        if batched:
+            calls.append(self.api.place_orders([orders[i] for i in batched], priority))
+        placed = await asyncio.gather(*calls)
+        
+        results = dict(zip(single, placed))
+        if batched:
+            batch = split_results(placed[-1], len(batched))
+            if batch is None:
+                # Batch endpoint refused - its orders one request each, side by side
+                batch = await asyncio.gather(
+                    *(self.api.place_order(priority=priority, **orders[i]) for i in batched)
+                )
+            results.update(zip(batched, batch))
+        return fan_out(legs, owner, [results[i] for i in range(len(orders))])
+
+
+class BotEngine:
+    """Runs an AsyncTrailingBot's loop in a thread; call() from anywhere"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.loop = asyncio.new_event_loop()
+        self.thread = None
+        self._ready = threading.Event()
+    
+    def start(self):
+        if self.thread is not None:
+            return self
+        self.thread = threading.Thread(target=self._run, name="bot-engine", daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        return self
+    
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self.bot.attach, self.loop)
+        self.loop.call_soon(self._ready.set)
+        self.loop.run_forever()
+    
+    def call(self, fn, *args, timeout=None):
+        """
+        Run fn(*args) on the engine loop and return its result.
+        Coroutine functions are awaited; plain methods (reads) run as a
+        loop callback so they never race the monitor.
+        """
+        async def run():
+            result = fn(*args)
+            if asyncio.iscoroutine(result):
+                result = await result
+            return result
+        
+        return asyncio.run_coroutine_threadsafe(run(), self.loop).result(timeout)
+    
+    def stop(self, timeout=10):
+        async def shutdown():
+            self.bot.stop_monitoring()
+            if self.bot._reconcile_task is not None:
+                self.bot._reconcile_task.cancel()
+            await self.bot.orders.wait_idle(timeout)
+            await self.bot.api.close()
+        
+        if self.thread is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(timeout + 1)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout)
+            self.thread = None
\ No newline at end of file
@@ -0,0 +1,543 @@
+"""
+Backtest - replay candle history through the trailing logic
+===========================================================
+Streams OHLCV or tick files (CSV / Parquet, memory-mapped - see
+candles.py) through an unmodified TrailingBot: SimulatedExchange stands
+in for CoinDCXAPI, orders fill inline, and prices go through
+_check_all_trades() exactly as the monitor's ticks do.
+
+- skipping: a candle whose range stays between its symbol's trigger
+  bounds (book.bounds()) can't fire anything, so it is never replayed
+- intra-candle order: open, then low/high ("direction": low first on an
+  up candle; "nearest": the extreme nearer the open first), then close
+- fills: the price is walked trigger by trigger, so SL/TP/levels fill at
+  their trigger (plus slippage) - or at the open when a candle gaps
+  through
+- entries: a market entry every N candles, or a signals CSV
+  (timestamp, symbol, side[, stop_loss, take_profit])
+    
+    python backend/backtest.py data/BTCUSDT_1m.csv data/ETHUSDT_1m.csv --every 240 --side both
+    python backend/backtest.py data/*.parquet --signals signals.csv --ladder ladder.json
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import time
+from collections import Counter
+from candles import CandleFile, parse_time, np
+from coindcx_api import CoinDCXAPI
+from symbols import canonical_symbol, futures_market
+from trade import Ladder
+from trailing_bot import TrailingBot
+from config import TRAILING_CONFIG, BACKTEST_FEE, BACKTEST_SLIPPAGE, BACKTEST_INTRABAR
+
+# Step a hair past a trigger - books register triggers 1e-9 early
+NUDGE = 2e-9
+
+
+class SimulatedExchange:
+    """CoinDCXAPI stand-in: market orders fill at the replay price"""
+    
+    calculate_quantity = CoinDCXAPI.calculate_quantity
+    
+    def __init__(self, fee=BACKTEST_FEE, slippage=BACKTEST_SLIPPAGE):
+        self.prices = {}  # canonical symbol -> current replay price
+        self.fee = fee
+        self.slippage = slippage
+        self.filled = 0
+        self.last_fill = None
+    
+    # Price lookups (also the `prices` object handed to the bot's tick)
+    
+    def price(self, symbol):
+        return self.prices.get(symbol)
+    
+    def get_symbol_index(self):
+        return self
+    
+    def get_futures_price(self, symbol):
+        return self.prices.get(canonical_symbol(symbol))
+    
+    def resolve_market(self, symbol):
+        return futures_market(symbol)
+    
+    # Orders
+    
+    def place_order(self, market, side, order_type, price=None, quantity=None, total_quantity=None,
+                    priority=None):
+        last = self.prices[canonical_symbol(market)]
+        if order_type == "market_order":
+            fill = last * (1 + self.slippage) if side == "buy" else last * (1 - self.slippage)
+        else:
+            fill = float(price)  # limits are assumed to fill at their price
+        if not quantity:
+            quantity = total_quantity / fill
+        
+        self.filled += 1
+        order = {
+            "id": f"sim_{self.filled}",
+            "market": market,
+            "side": side,
+            "price": fill,
+            "quantity": quantity,
+            "status": "filled"
+        }
+        self.last_fill = order
+        return {"orders": [order]}
+    
+    def place_orders(self, orders, priority=None):
+        return {"orders": [self.place_order(**order)["orders"][0] for order in orders]}
+    
+    def place_market_buy(self, market, usdt_amount, priority=None):
+        return self.place_order(market, "buy", "market_order", total_quantity=usdt_amount)
+    
+    def place_market_sell(self, market, quantity, priority=None):
+        return self.place_order(market, "sell", "market_order", quantity=quantity)
+    
+    def place_limit_buy(self, market, price, quantity):
+        return self.place_order(market, "buy", "limit_order", price=price, quantity=quantity)
+    
+    def place_limit_sell(self, market, price, quantity):
+        return self.place_order(market, "sell", "limit_order", price=price, quantity=quantity)
+
+
+class TradeResult:
+    """Fills of one backtest trade, in the bot's own quantities"""
+    
+    __slots__ = ("trade_id", "symbol", "is_long", "entry", "risk", "open_qty",
+                 "pnl", "fees", "opened_at", "closed_at", "reason")
+    
+    def __init__(self, trade_id, symbol, is_long, entry, risk, quantity, fee, opened_at):
+        self.trade_id = trade_id
+        self.symbol = symbol
+        self.is_long = is_long
+        self.entry = entry
+        self.risk = risk
+        self.open_qty = quantity
+        self.pnl = 0.0
+        self.fees = quantity * entry * fee
+        self.opened_at = opened_at
+        self.closed_at = None
+        self.reason = None
+    
+    def reduce(self, units, price, fee):
+        move = price - self.entry if self.is_long else self.entry - price
+        self.pnl += move * units
+        self.fees += units * price * fee
+        self.open_qty -= units
+    
+    @property
+    def net(self):
+        return self.pnl - self.fees
+    
+    @property
+    def r(self):
+        return self.net / self.risk if self.risk > 0 else 0.0
+
+
+class BacktestBot(TrailingBot):
+    """TrailingBot with orders filled inline and no I/O or logging"""
+    
+    def __init__(self, exchange, ladder):
+        self.clock = 0.0
+        self.positions = {}  # trade_id -> TradeResult (open)
+        self.results = []    # closed TradeResults
+        self._ids = 0
+        super().__init__(api=exchange, ladder=ladder)
+        self.vectorized = False  # replay skipping needs TriggerBook.bounds()
+        self.slow_ticks.configure(None)  # replay ticks are not live latency
+    
+    def _default_price_source(self):
+        return None  # prices come from the replay
+    
+    def _watch(self, market):
+        pass
+    
+    def emit(self, event, data):
+        pass
+    
+    def log(self, trade_id, message, log_type="info"):
+        pass
+    
+    def _touch(self, trade):
+        pass
+    
+    def _track_order(self, trade_id, kind, quantity, result, applied):
+        pass  # replay fills are final when placed
+    
+    def _new_trade_id(self):
+        self._ids += 1
+        return f"bt_{self._ids}"
+    
+    def open_position(self, symbol, trade_config):
+        """start_trade() plus the entry fill - the trade id or None"""
+        result = self.start_trade(trade_config)
+        if not result.get("success"):
+            return None
+        trade = self.active_trades[result["trade_id"]]
+        fill = self.api.last_fill["price"]
+        self.positions[trade.id] = TradeResult(
+            trade.id, symbol, trade.is_long, fill, trade.risk_amount, trade.quantity,
+            self.api.fee, self.clock
+        )
+        return trade.id
+    
+    def _submit_order(self, trade_id, key, prepare, on_done):
+        """Fill now - bookings carry their quantity, exits close the rest"""
+        prepared = prepare()
+        if prepared is None:
+            on_done(None, None)
+            return True
+        
+        tag, order = prepared
+        order.pop("priority", None)
+        result = self.api.place_order(**order)
+        
+        position = self.positions.get(trade_id)
+        if position is not None:
+            units = tag if tag is not None else position.open_qty
+            position.reduce(units, result["orders"][0]["price"], self.api.fee)
+            if tag is None:
+                self._settle(trade_id, position)
+        
+        on_done((tag, result), None)
+        return True
+    
+    def _settle(self, trade_id, position):
+        trade = self.closed_trades.pop(trade_id, None)
+        position.closed_at = self.clock
+        position.reason = trade.status if trade is not None else "CLOSED"
+        del self.positions[trade_id]
+        self.results.append(position)
+
+
+def intrabar_path(o, h, l, c, mode=BACKTEST_INTRABAR):
+    """Prices visited after the open, in order"""
+    if mode == "nearest":
+        low_first = o - l <= h - o
+    else:
+        low_first = c >= o
+    return (l, h, c) if low_first else (h, l, c)
+
+
+def load_signals(path):
+    """{symbol: [(ts, trade_type, stop_loss, take_profit), ...]} sorted by time"""
+    signals = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            row = {k.strip().lower(): (v or "").strip() for k, v in row.items()}
+            side = row["side"].upper()
+            signals.setdefault(canonical_symbol(row["symbol"]), []).append((
+                parse_time(row.get("timestamp") or row.get("ts") or row["time"]),
+                "SHORT" if side in ("SHORT", "SELL") else "LONG",
+                float(row["stop_loss"]) if row.get("stop_loss") else None,
+                float(row["take_profit"]) if row.get("take_profit") else None
+            ))
+    for rows in signals.values():
+        rows.sort()
+    return signals
+
+
+class Backtest:
+    
+    def __init__(self, files, ladder_config=TRAILING_CONFIG, capital=100.0, leverage=1.0,
+                 every=240, side="long", stop_pct=1.0, tp_r=5.0, signals=None,
+                 fee=BACKTEST_FEE, slippage=BACKTEST_SLIPPAGE, intrabar=BACKTEST_INTRABAR,
+                 equity=1000.0):
+        self.series = [f if isinstance(f, CandleFile) else CandleFile(f) for f in files]
+        self.ladder_config = ladder_config
+        self.capital = capital
+        self.leverage = leverage
+        self.every = every
+        self.side = side
+        self.stop_pct = stop_pct
+        self.tp_r = tp_r
+        self.signals = signals
+        self.intrabar = intrabar
+        self.equity = equity
+        self.exchange = SimulatedExchange(fee, slippage)
+        self.bot = BacktestBot(self.exchange, Ladder(ladder_config))
+        self.replayed = 0
+        self.rejected = 0
+    
+    # ==========================================
+    # ENTRIES
+    # ==========================================
+    
+    def _entries(self, series):
+        """(candle index, trade_type, stop_loss, take_profit) in order"""
+        if self.signals is not None:
+            for ts, trade_type, stop_loss, take_profit in self.signals.get(series.symbol, ()):
+                yield series.index_at(ts), trade_type, stop_loss, take_profit
+            return
+        
+        for k, i in enumerate(range(self.every - 1, len(series), self.every)):
+            if self.side == "both":
+                trade_type = "LONG" if k % 2 == 0 else "SHORT"
+            else:
+                trade_type = self.side.upper()
+            yield i, trade_type, None, None
+    
+    def _open(self, series, trade_type, stop_loss, take_profit):
+        price = self.exchange.prices[series.symbol]
+        is_long = trade_type == "LONG"
+        if stop_loss is None:
+            offset = price * self.stop_pct / 100
+            stop_loss = price - offset if is_long else price + offset
+        if take_profit is None:
+            risk = abs(price - stop_loss)
+            take_profit = price + risk * self.tp_r if is_long else price - risk * self.tp_r
+        
+        trade_id = self.bot.open_position(series.symbol, {
+            "coin": series.symbol,
+            "trade_type": trade_type,
+            "entry_type": "MARKET",
+            "capital": self.capital,
+            "stop_loss": stop_loss,
+            "take_profit": take_profit,
+            "leverage": self.leverage
+        })
+        if trade_id is None:
+            self.rejected += 1
+    
+    # ==========================================
+    # REPLAY
+    # ==========================================
+    
+    def _bounds(self, symbol):
+        book = self.bot.trigger_books.get(symbol)
+        return book.bounds() if book is not None else (None, None)
+    
+    def _tick(self, symbol, price):
+        self.exchange.prices[symbol] = price
+        self.bot._check_all_trades(self.exchange, (symbol,))
+    
+    def _walk(self, symbol, target):
+        """Move the price to target, stopping at every trigger on the way"""
+        start = self.exchange.prices[symbol]
+        rising = target > start
+        last = None
+        while True:
+            up, down = self._bounds(symbol)
+            bound = up if rising else down
+            if bound is None or (bound > target if rising else bound < target) or bound == last:
+                break
+            last = bound
+            if rising:
+                price = min(max(bound * (1 + NUDGE), start), target)
+            else:
+                price = max(min(bound * (1 - NUDGE), start), target)
+            self._tick(symbol, price)
+        self.exchange.prices[symbol] = target
+    
+    def _replay(self, series, i):
+        o, h, l, c = series.candle(i)
+        symbol = series.symbol
+        self.replayed += 1
+        
+        # Gap: anything the open is already through fills at the open
+        self.exchange.prices[symbol] = o
+        up, down = self._bounds(symbol)
+        if (up is not None and o >= up) or (down is not None and o <= down):
+            self._tick(symbol, o)
+        
+        for target in intrabar_path(o, h, l, c, self.intrabar):
+            self._walk(symbol, target)
+    
+    def run(self):
+        started = time.perf_counter()
+        heap = []
+        lanes = []
+        for k, series in enumerate(self.series):
+            entries = self._entries(series)
+            lanes.append([series, 0, entries, next(entries, None)])
+            self._schedule(heap, k, lanes[k])
+        
+        while heap:
+            _, k, i = heapq.heappop(heap)
+            lane = lanes[k]
+            series = lane[0]
+            self.bot.clock = float(series.ts[i])
+            self._replay(series, i)
+            
+            while lane[3] is not None and lane[3][0] <= i:
+                _, trade_type, stop_loss, take_profit = lane[3]
+                if lane[3][0] == i:
+                    self._open(series, trade_type, stop_loss, take_profit)
+                lane[3] = next(lane[2], None)
+            
+            lane[1] = i + 1
+            self._schedule(heap, k, lane)
+        
+        self._close_remaining()
+        return self.report(time.perf_counter() - started)
+    
+    def _schedule(self, heap, k, lane):
+        """Queue the lane's next candle that can fire a trigger or opens a trade"""
+        series, start, _, entry = lane
+        end = len(series)
+        stop = min(entry[0], end) if entry is not None else end
+        stop = max(stop, start)
+        up, down = self._bounds(series.symbol)
+        i = series.next_cross(start, stop, up, down)
+        if i < end:
+            heapq.heappush(heap, (float(series.ts[i]), k, i))
+    
+    def _close_remaining(self):
+        """Trades still open at the end of the data close at the last price"""
+        for series in self.series:
+            if len(series):
+                self.exchange.prices[series.symbol] = float(series.close[-1])
+                self.bot.clock = max(self.bot.clock, float(series.ts[-1]))
+        settled = len(self.bot.results)
+        for trade_id in list(self.bot.active_trades):
+            self.bot.close_trade(trade_id)
+        for result in self.bot.results[settled:]:
+            result.reason = "END_OF_DATA"
+    
+    # ==========================================
+    # REPORT
+    # ==========================================
+    
+    def report(self, elapsed=0.0):
+        results = sorted(self.bot.results, key=lambda t: t.closed_at)
+        candles = sum(len(s) for s in self.series)
+        summary = {
+            "trades": len(results),
+            "rejected": self.rejected,
+            "candles": candles,
+            "replayed": self.replayed,
+            "elapsed": round(elapsed, 3)
+        }
+        if not results:
+            return summary
+        
+        net = np.array([t.net for t in results])
+        r = np.array([t.r for t in results])
+        equity = self.equity + np.cumsum(net)
+        peak = np.maximum.accumulate(np.concatenate(([self.equity], equity)))[1:]
+        drawdown = peak - equity
+        worst = int(drawdown.argmax())
+        gains = net[net > 0].sum()
+        losses = -net[net < 0].sum()
+        
+        by_symbol = {}
+        for t in results:
+            row = by_symbol.setdefault(t.symbol, {"trades": 0, "net_pnl": 0.0})
+            row["trades"] += 1
+            row["net_pnl"] += t.net
+        for row in by_symbol.values():
+            row["net_pnl"] = round(row["net_pnl"], 2)
+        
+        summary.update({
+            "win_rate": round(float((net > 0).mean()) * 100, 2),
+            "net_pnl": round(float(net.sum()), 2),
+            "fees": round(sum(t.fees for t in results), 2),
+            "profit_factor": round(float(gains / losses), 3) if losses > 0 else None,
+            "avg_r": round(float(r.mean()), 3),
+            "median_r": round(float(np.median(r)), 3),
+            "r_percentiles": {
+                f"p{p}": round(float(v), 3) for p, v in zip((10, 25, 50, 75, 90), np.percentile(r, (10, 25, 50, 75, 90)))
+            },
+            "r_histogram": {
+                f"{b:+.1f}": n for b, n in sorted(Counter((np.floor(r * 2) / 2).tolist()).items())
+            },
+            "max_drawdown": round(float(drawdown[worst]), 2),
+            "max_drawdown_pct": round(float(drawdown[worst] / peak[worst] * 100), 2),
+            "final_equity": round(float(equity[-1]), 2),
+            "exits": dict(Counter(t.reason for t in results)),
+            "by_symbol": by_symbol
+        })
+        return summary
+
+
+def print_report(report):
+    print(f"\n📊 {report['trades']} trades · {report['replayed']:,} of {report['candles']:,} candles replayed "
+          f"in {report['elapsed']:.2f}s")
+    if not report["trades"]:
+        return
+    print(f"   Net P/L: ${report['net_pnl']:,.2f}  (fees ${report['fees']:,.2f})  "
+          f"Win rate: {report['win_rate']}%  Profit factor: {report['profit_factor']}")
+    print(f"   Avg R: {report['avg_r']}  Median R: {report['median_r']}  "
+          f"Max drawdown: ${report['max_drawdown']:,.2f} ({report['max_drawdown_pct']}%)")
+    print(f"   R percentiles: {report['r_percentiles']}")
+    print(f"   Exits: {report['exits']}")
+    print("\n   R distribution")
+    largest = max(report["r_histogram"].values())
+    for bucket, n in report["r_histogram"].items():
+        print(f"   {bucket:>6}R {'█' * max(1, round(n / largest * 40))} {n}")
+    print("\n   By symbol")
+    for symbol, row in sorted(report["by_symbol"].items()):
+        print(f"   {symbol:<10} {row['trades']:>6} trades  ${row['net_pnl']:>12,.2f}")
+
+
+def load_files(args):
+    """SYMBOL=path or path (symbol from the file name)"""
+    files = []
+    for item in args:
+        if "=" in item:
+            symbol, path = item.split("=", 1)
+            files.append(CandleFile(path, canonical_symbol(symbol)))
+        else:
+            files.append(CandleFile(item))
+    return files
+
+
+def add_arguments(parser):
+    """Data and entry options shared with sweep.py"""
+    parser.add_argument("files", nargs="+", help="CSV/Parquet candle or tick files (SYMBOL=path to name the symbol)")
+    parser.add_argument("--every", type=int, default=240, help="open a trade every N candles")
+    parser.add_argument("--side", choices=("long", "short", "both"), default="long")
+    parser.add_argument("--stop-pct", type=float, default=1.0, help="SL distance from entry, percent")
+    parser.add_argument("--tp-r", type=float, default=5.0, help="take profit in R")
+    parser.add_argument("--capital", type=float, default=100.0)
+    parser.add_argument("--leverage", type=float, default=1.0)
+    parser.add_argument("--equity", type=float, default=1000.0, help="starting equity for drawdown %%")
+    parser.add_argument("--signals", help="CSV of timestamp,symbol,side[,stop_loss,take_profit]")
+    parser.add_argument("--fee", type=float, default=BACKTEST_FEE)
+    parser.add_argument("--slippage", type=float, default=BACKTEST_SLIPPAGE)
+    parser.add_argument("--intrabar", choices=("direction", "nearest"), default=BACKTEST_INTRABAR)
+
+
+def backtest_options(args):
+    """Backtest() keyword arguments from add_arguments() options"""
+    return {
+        "capital": args.capital,
+        "leverage": args.leverage,
+        "every": args.every,
+        "side": args.side,
+        "stop_pct": args.stop_pct,
+        "tp_r": args.tp_r,
+        "signals": load_signals(args.signals) if args.signals else None,
+        "fee": args.fee,
+        "slippage": args.slippage,
+        "intrabar": args.intrabar,
+        "equity": args.equity
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay candles through the trailing SL logic")
+    add_arguments(parser)
+    parser.add_argument("--ladder", help="JSON file with a TRAILING_CONFIG-style list")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    
+    ladder = TRAILING_CONFIG
+    if args.ladder:
+        with open(args.ladder) as f:
+            ladder = json.load(f)
+    
+    backtest = Backtest(load_files(args.files), ladder_config=ladder, **backtest_options(args))
+    report = backtest.run()
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
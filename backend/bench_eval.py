@@ -0,0 +1,169 @@
+"""
+Evaluation Benchmark - per-trade loop vs trigger book vs NumPy
+==============================================================
+Times one monitor tick over synthetic trade books, twice:
+- full tick: per-trade price_update payloads + TP/SL/level checks
+- triggers:  only the hit detection that drives orders
+ No network, no orders: emit is silenced and prices are fed
+straight into the bot.
+    
+    python backend/bench_eval.py                 # 10, 1k, 100k trades
+    python backend/bench_eval.py --sizes 5000 --ticks 50
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+from trailing_bot import TrailingBot
+from trade import Trade
+from vector_book import VECTOR_AVAILABLE
+
+SYMBOL = "BTCUSDT"
+
+
+class FixedPrice:
+    def __init__(self, price):
+        self.value = price
+    
+    def price(self, symbol):
+        return self.value
+
+
+class NoFeed:
+    def start(self, on_prices):
+        pass
+    
+    def stop(self):
+        pass
+    
+    def subscribe(self, markets):
+        pass
+
+
+def build_bot(n, vectorized, seed=7):
+    bot = TrailingBot(api=object(), price_source=NoFeed())
+    bot.vectorized = vectorized
+    bot.emit = lambda event, data: None
+    bot.log = lambda *args, **kwargs: None
+    
+    rng = random.Random(seed)
+    for i in range(n):
+        is_long = rng.random() < 0.5
+        entry = 100 * (1 + rng.uniform(-0.01, 0.01))
+        risk = entry * rng.uniform(0.02, 0.05)
+        stop_loss = entry - risk if is_long else entry + risk
+        take_profit = entry + 4 * risk if is_long else entry - 4 * risk
+        quantity = 100 / entry
+        trade_type = "LONG" if is_long else "SHORT"
+        
+        bot._add_trade(Trade(
+            id=f"bench_{i}",
+            coin=SYMBOL,
+            symbol=SYMBOL,
+            trade_type=trade_type,
+            entry_price=entry,
+            capital=100.0,
+            quantity=quantity,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            leverage=1.0,
+            risk_per_unit=risk,
+            risk_amount=risk * quantity,
+            risk_percent=risk / entry * 100,
+            order_id="bench",
+            created_at=datetime.now().isoformat(),
+            ladder=bot.ladder
+        ))
+    return bot
+
+
+def price_path(ticks, seed=11):
+    # Quiet market: a few basis points per tick, so few triggers fire
+    rng = random.Random(seed)
+    price = 100.0
+    path = []
+    for _ in range(ticks):
+        price *= 1 + rng.gauss(0, 0.0003)
+        path.append(price)
+    return path
+
+
+def run_loop(bot, path):
+    """Baseline: every trade through _check_trade on every tick"""
+    prices = FixedPrice(path[0])
+    start = time.perf_counter()
+    for p in path:
+        prices.value = p
+        for trade_id, trade in list(bot.active_trades.items()):
+            bot._check_trade(trade_id, trade, p)
+    return time.perf_counter() - start
+
+
+def run_loop_triggers(bot, path):
+    """Baseline: every trade through the TP/SL/level state machine"""
+    start = time.perf_counter()
+    for p in path:
+        for trade_id, trade in list(bot.active_trades.items()):
+            bot._evaluate_trade(trade_id, trade, p)
+    return time.perf_counter() - start
+
+
+def run_book_triggers(bot, path):
+    """Book lookup, then the state machine for fired trades only"""
+    book = bot.trigger_books[SYMBOL]
+    bucket = bot.trades_by_symbol[SYMBOL]
+    start = time.perf_counter()
+    for p in path:
+        for trade_id in book.crossed(p):
+            trade = bucket.get(trade_id)
+            if trade is not None:
+                bot._evaluate_trade(trade_id, trade, p)
+    return time.perf_counter() - start
+
+
+def run_tick(bot, path):
+    prices = FixedPrice(path[0])
+    symbols = {SYMBOL}
+    start = time.perf_counter()
+    for p in path:
+        prices.value = p
+        bot._check_all_trades(prices, symbols)
+    return time.perf_counter() - start
+
+
+def report(title, results, ticks):
+    base = results[0][1]
+    print(f"  {title}")
+    for name, elapsed in results:
+        per_tick = elapsed / ticks * 1000
+        print(f"    {name:<15} {per_tick:10.3f} ms/tick  {base / elapsed:7.1f}x")
+
+
+def bench(n, ticks):
+    path = price_path(ticks)
+    print(f"\n📊 {n:,} trades x {ticks} ticks")
+    
+    full = [("per-trade loop", run_loop(build_bot(n, False), path)),
+            ("trigger book", run_tick(build_bot(n, False), path))]
+    triggers = [("per-trade loop", run_loop_triggers(build_bot(n, False), path)),
+                ("trigger book", run_book_triggers(build_bot(n, False), path))]
+    if VECTOR_AVAILABLE:
+        full.append(("numpy columns", run_tick(build_bot(n, True), path)))
+        triggers.append(("numpy columns", run_book_triggers(build_bot(n, True), path)))
+    
+    report("full tick", full, ticks)
+    report("triggers", triggers, ticks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark monitor tick evaluation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args()
+    
+    if not VECTOR_AVAILABLE:
+        print("⚠️ numpy not installed - skipping the columnar backend")
+    
+    for size in args.sizes:
+        bench(size, args.ticks)
\ No newline at end of file
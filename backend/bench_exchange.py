@@ -0,0 +1,315 @@
+"""
+Exchange Benchmark - the bot and the API against mock_exchange.py
+=================================================================
+Runs TrailingBot end to end over real HTTP against a local MockExchange
+(no network, no real orders) and reports, per book size:
+- open:  start_trade() latency and trades opened per second
+- tick:  monitor tick latency - ticker fetch and trade evaluation
+- acks:  order round trip (request -> exchange ack) and exit
+         decision -> ack through the order executor
+- api:   Flask route latency via the test client (skipped without Flask)
+Stdout of the bot is silenced while measuring. --max-* flags turn the
+run into a CI gate: the exit code is 1 when a budget is exceeded.
+    
+    python backend/bench_exchange.py                       # 1, 100, 10k trades
+    python backend/bench_exchange.py --sizes 100 --latency-ms 20 --error-rate 0.01
+    python backend/bench_exchange.py --json --max-tick-p99-ms 50 --max-ack-p99-ms 100
+"""
+
+import os
+import tempfile
+
+# Before the project imports - keeps journals and logs out of the real data dir
+os.environ.setdefault("BOT_DATA_DIR", tempfile.mkdtemp(prefix="bench-exchange-"))
+
+import argparse
+import contextlib
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from mock_exchange import MockExchange
+from coindcx_api import CoinDCXAPI
+from rate_limiter import RateLimiter
+from trailing_bot import TrailingBot
+from event_log import EVENT_LOG
+
+SYMBOL = "BTCUSDT"
+PRICE = 65000.0
+# The mock has no real limits - keep the client limiter out of the numbers
+OPEN_LIMITS = {"public": (1e6, 1e6), "orders": (1e6, 1e6), "account": (1e6, 1e6)}
+
+
+class NoFeed:
+    """Ticks are driven by the benchmark, not a poller"""
+    
+    def start(self, on_prices):
+        pass
+    
+    def stop(self):
+        pass
+    
+    def subscribe(self, markets):
+        pass
+
+
+def percentiles(samples):
+    """p50/p90/p99/max in ms"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return {
+        "count": len(ordered),
+        "p50": round(pick(0.50), 3),
+        "p90": round(pick(0.90), 3),
+        "p99": round(pick(0.99), 3),
+        "max": round(ordered[-1] * 1000, 3)
+    }
+
+
+def trade_configs(n, seed=7):
+    """Mixed LONG/SHORT market entries with 1-3% stops"""
+    rng = random.Random(seed)
+    for _ in range(n):
+        is_long = rng.random() < 0.5
+        risk = PRICE * rng.uniform(0.01, 0.03)
+        yield {
+            "coin": SYMBOL,
+            "trade_type": "LONG" if is_long else "SHORT",
+            "entry_type": "MARKET",
+            "capital": 100,
+            "stop_loss": PRICE - risk if is_long else PRICE + risk,
+            "take_profit": PRICE + 4 * risk if is_long else PRICE - 4 * risk,
+            "leverage": 1
+        }
+
+
+# ==========================================
+# INSTRUMENTATION
+# ==========================================
+
+def time_orders(api, samples):
+    """Record the round trip of every order call on this client"""
+    make_request = api._make_request
+    
+    def timed(endpoint, *args, **kwargs):
+        if "/orders/create" not in endpoint:
+            return make_request(endpoint, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return make_request(endpoint, *args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+    
+    api._make_request = timed
+
+
+def time_exits(bot, samples):
+    """Record exit/booking decision -> ack through the order executor"""
+    orders = bot.orders
+    submit, submit_group = orders.submit, orders.submit_group
+    
+    def acked(on_done):
+        started = time.perf_counter()
+        
+        def done(*args):
+            samples.append(time.perf_counter() - started)
+            if on_done is not None:
+                on_done(*args)
+        return done
+    
+    orders.submit = lambda trade_id, key, job, on_done=None: submit(trade_id, key, job, acked(on_done))
+    orders.submit_group = lambda items, job, on_done=None: submit_group(items, job, acked(on_done))
+
+
+# ==========================================
+# BOT
+# ==========================================
+
+def bench_bot(exchange, url, n, ticks, threads, seed):
+    exchange.set_price(SYMBOL, PRICE)
+    api = CoinDCXAPI(limiter=RateLimiter(OPEN_LIMITS, None), base_url=url)
+    bot = TrailingBot(api=api, price_source=NoFeed())
+    ack, exit_ack, opened, tick_fetch, tick_eval = [], [], [], [], []
+    time_orders(api, ack)
+    time_exits(bot, exit_ack)
+    
+    def open_one(config):
+        started = time.perf_counter()
+        result = bot.start_trade(config)
+        opened.append(time.perf_counter() - started)
+        return result.get("success", False)
+    
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            ok = sum(pool.map(open_one, trade_configs(n, seed)))
+        open_elapsed = time.perf_counter() - started
+        
+        # Scripted path: a drift up with noise, so levels, TPs and SLs fire
+        rng = random.Random(seed)
+        price = PRICE
+        started = time.perf_counter()
+        for _ in range(ticks):
+            price *= 1 + rng.gauss(0.0005, 0.004)
+            exchange.set_price(SYMBOL, price)
+            api.ticker_cache.invalidate()
+            
+            t0 = time.perf_counter()
+            index = api.get_symbol_index()
+            t1 = time.perf_counter()
+            with bot._tick_lock:
+                bot._check_all_trades(index)
+            tick_eval.append(time.perf_counter() - t1)
+            tick_fetch.append(t1 - t0)
+        bot.orders.wait_idle(timeout=60)
+        tick_elapsed = time.perf_counter() - started
+        bot.orders.shutdown()
+        bot.reconciler.stop()
+        EVENT_LOG.flush()
+    
+    return {
+        "trades": n,
+        "opened": ok,
+        "open": dict(percentiles(opened), per_second=round(len(opened) / open_elapsed, 1)),
+        "tick": percentiles([f + e for f, e in zip(tick_fetch, tick_eval)]),
+        "tick_fetch": percentiles(tick_fetch),
+        "tick_eval": percentiles(tick_eval),
+        "evaluations_per_second": round(ok * ticks / max(sum(tick_eval), 1e-9)),
+        "order_ack": dict(percentiles(ack), per_second=round(len(ack) / (open_elapsed + tick_elapsed), 1)),
+        "exit_ack": percentiles(exit_ack),
+        "still_active": len(bot.active_trades),
+        "closed": len(bot.closed_trades)
+    }
+
+
+# ==========================================
+# FLASK API
+# ==========================================
+
+def bench_api(url, n, requests_per_route):
+    """Route latency through the Flask test client - None without Flask"""
+    CoinDCXAPI.BASE_URL = url  # the server builds its own client on import
+    try:
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            import server
+    except ImportError as e:
+        print(f"⚠️ Skipping the API benchmark ({e})")
+        return None
+    
+    server.api.limiter = RateLimiter(OPEN_LIMITS, None)
+    client = server.app.test_client()
+    results = {}
+    
+    def measure(name, call, count):
+        samples = []
+        for _ in range(count):
+            started = time.perf_counter()
+            response = call()
+            samples.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{name}: HTTP {response.status_code}")
+        results[name] = percentiles(samples)
+    
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        configs = trade_configs(n)
+        measure("POST /api/bot/start", lambda: client.post("/api/bot/start", json=next(configs)), n)
+        trade_id = next(iter(server.bot.active_trades), None)
+        version = server.bot.trades_version
+        measure("GET /api/ticker", lambda: client.get("/api/ticker"), requests_per_route)
+        measure("GET /api/bot/trades", lambda: client.get("/api/bot/trades"), requests_per_route)
+        measure("GET /api/bot/trades?limit=100", lambda: client.get("/api/bot/trades?limit=100"), requests_per_route)
+        measure("GET /api/bot/trades?since_version",
+                lambda: client.get(f"/api/bot/trades?since_version={version}"), requests_per_route)
+        if trade_id is not None:
+            measure("GET /api/bot/status/<id>", lambda: client.get(f"/api/bot/status/{trade_id}"), requests_per_route)
+        server.bot.stop_monitoring()
+        EVENT_LOG.flush()
+    return results
+
+
+# ==========================================
+# REPORT
+# ==========================================
+
+def print_row(name, stats):
+    if not stats.get("count"):
+        print(f"    {name:<34} -")
+        return
+    rate = f"  {stats['per_second']:>9,.1f}/s" if "per_second" in stats else ""
+    print(f"    {name:<34} p50 {stats['p50']:>9.3f}  p90 {stats['p90']:>9.3f}  "
+          f"p99 {stats['p99']:>9.3f}  max {stats['max']:>9.3f} ms{rate}")
+
+
+def print_report(run):
+    print(f"\n📊 {run['trades']:,} trades ({run['opened']:,} opened, "
+          f"{run['closed']:,} closed, {run['still_active']:,} still active)")
+    print_row("start_trade", run["open"])
+    print_row("tick (fetch + evaluate)", run["tick"])
+    print_row("  ticker fetch", run["tick_fetch"])
+    print_row("  evaluate", run["tick_eval"])
+    print_row("order -> ack", run["order_ack"])
+    print_row("exit decision -> ack", run["exit_ack"])
+    print(f"    {'evaluations':<34} {run['evaluations_per_second']:,}/s")
+
+
+def check_budgets(runs, args):
+    """Budget violations as messages"""
+    failures = []
+    for run in runs:
+        for label, stats, budget in (
+            ("tick p99", run["tick"], args.max_tick_p99_ms),
+            ("order ack p99", run["order_ack"], args.max_ack_p99_ms)
+        ):
+            if budget is not None and stats.get("count") and stats["p99"] > budget:
+                failures.append(f"{run['trades']:,} trades: {label} {stats['p99']:.3f} ms > {budget} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bot and API against the mock exchange")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8, help="concurrent start_trade callers")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mock exchange latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--api-trades", type=int, default=100, help="trades opened through Flask (0 = skip)")
+    parser.add_argument("--api-requests", type=int, default=200, help="requests per read route")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--max-tick-p99-ms", type=float, help="fail when tick p99 exceeds this")
+    parser.add_argument("--max-ack-p99-ms", type=float, help="fail when order ack p99 exceeds this")
+    args = parser.parse_args()
+    
+    exchange = MockExchange(
+        port=0, tick_interval=0, seed=args.seed,
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, error_rate=args.error_rate
+    )
+    url = exchange.start()
+    try:
+        runs = [bench_bot(exchange, url, n, args.ticks, args.threads, args.seed) for n in args.sizes]
+        api = bench_api(url, args.api_trades, args.api_requests) if args.api_trades else None
+    finally:
+        exchange.stop()
+    
+    if args.json:
+        print(json.dumps({"bot": runs, "api": api, "exchange": exchange.stats}, indent=2))
+    else:
+        for run in runs:
+            print_report(run)
+        if api:
+            print(f"\n🌐 Flask API ({args.api_trades} trades)")
+            for name, stats in api.items():
+                print_row(name, stats)
+    
+    failures = check_budgets(runs, args)
+    for failure in failures:
+        print(f"❌ {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
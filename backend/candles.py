@@ -0,0 +1,210 @@
+"""
+Candle Files - memory-mapped OHLCV / tick history
+================================================
+A CSV or Parquet file is converted once, in blocks, to a columnar .npy
+cache (rows: ts, open, high, low, close) under BACKTEST_CACHE_DIR and
+then memory-mapped. Nothing is loaded whole: the OS pages columns in as
+they are scanned, and several processes can map the same cache.
+
+- CSV/Parquet columns: a timestamp (ts / time / timestamp / open_time /
+  date - epoch s, epoch ms or ISO) plus open/high/low/close, or a single
+  price column for tick files (open = high = low = close)
+- next_cross() finds the next candle whose range reaches a price bound
+  with a vectorised scan, which is what lets a backtest skip quiet candles
+
+NumPy is required; Parquet also needs pyarrow.
+"""
+
+import csv
+import os
+from datetime import datetime, timezone
+from symbols import canonical_symbol
+from config import BACKTEST_CACHE_DIR
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CANDLES_AVAILABLE = np is not None
+
+TIME_COLUMNS = ("ts", "time", "timestamp", "open_time", "date", "datetime")
+PRICE_COLUMNS = ("open", "high", "low", "close")
+BLOCK_ROWS = 65536
+
+
+def parse_time(value):
+    """Epoch seconds for epoch s / ms or an ISO string"""
+    try:
+        ts = float(value)
+    except ValueError:
+        dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    return ts / 1000 if ts > 1e11 else ts
+
+
+def _columns(names):
+    """Indexes of (ts, open, high, low, close) - tick files repeat price"""
+    lower = [name.strip().lower() for name in names]
+    ts = next((lower.index(n) for n in TIME_COLUMNS if n in lower), None)
+    if ts is None:
+        raise ValueError(f"No timestamp column in {names}")
+    if all(n in lower for n in PRICE_COLUMNS):
+        return [ts] + [lower.index(n) for n in PRICE_COLUMNS]
+    for n in ("price", "last_price", "close"):
+        if n in lower:
+            return [ts] + [lower.index(n)] * 4
+    raise ValueError(f"No open/high/low/close or price columns in {names}")
+
+
+def _csv_blocks(path):
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        index = _columns(next(reader))
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            rows.append(row)
+            if len(rows) == BLOCK_ROWS:
+                yield _csv_block(rows, index)
+                rows = []
+        if rows:
+            yield _csv_block(rows, index)
+
+
+def _csv_block(rows, index):
+    block = np.empty((5, len(rows)))
+    stamps = [row[index[0]] for row in rows]
+    try:
+        ts = np.array(stamps, dtype=float)
+        block[0] = np.where(ts > 1e11, ts / 1000, ts)
+    except ValueError:
+        block[0] = [parse_time(s) for s in stamps]
+    for k in range(1, 5):
+        block[k] = np.array([row[index[k]] for row in rows], dtype=float)
+    return block
+
+
+def _parquet_blocks(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet files need pyarrow (pip install pyarrow)")
+    
+    source = pq.ParquetFile(path)
+    names = source.schema_arrow.names
+    index = _columns(names)
+    wanted = list(dict.fromkeys(names[i] for i in index))
+    for batch in source.iter_batches(batch_size=BLOCK_ROWS, columns=wanted):
+        cols = {name: batch.column(name) for name in wanted}
+        ts_col = cols[names[index[0]]]
+        if str(ts_col.type).startswith("timestamp"):
+            ts = ts_col.cast("int64").to_numpy() / {"s": 1, "ms": 1e3, "us": 1e6, "ns": 1e9}[ts_col.type.unit]
+        elif str(ts_col.type) in ("string", "large_string"):
+            ts = np.array([parse_time(s) for s in ts_col.to_pylist()])
+        else:
+            ts = ts_col.to_numpy().astype(float)
+            ts = np.where(ts > 1e11, ts / 1000, ts)
+        block = np.empty((5, len(ts)))
+        block[0] = ts
+        for k in range(1, 5):
+            block[k] = cols[names[index[k]]].to_numpy().astype(float)
+        yield block
+
+
+def _cache_path(path):
+    """Cache name tied to the source's size and mtime - stale caches are ignored"""
+    stat = os.stat(path)
+    name = os.path.basename(path)
+    return os.path.join(BACKTEST_CACHE_DIR, f"{name}.{stat.st_size}.{int(stat.st_mtime)}.npy")
+
+
+def convert(path, cache=None):
+    """Write path's candles to a (5, n) .npy cache, one block at a time"""
+    cache = cache or _cache_path(path)
+    os.makedirs(os.path.dirname(cache), exist_ok=True)
+    blocks = _parquet_blocks(path) if path.endswith((".parquet", ".pq")) else _csv_blocks(path)
+    
+    # Columns go to raw files first - the row count isn't known up front
+    parts = [f"{cache}.{k}.part" for k in range(5)]
+    files = [open(part, "wb") for part in parts]
+    rows = 0
+    try:
+        for block in blocks:
+            for f, column in zip(files, block):
+                f.write(column.tobytes())
+            rows += block.shape[1]
+    finally:
+        for f in files:
+            f.close()
+    
+    tmp = f"{cache}.tmp"
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float64, shape=(5, rows))
+    for k, part in enumerate(parts):
+        if rows:
+            out[k] = np.memmap(part, dtype=np.float64, mode="r", shape=(rows,))
+        os.remove(part)
+    out.flush()
+    del out
+    os.replace(tmp, cache)
+    return cache
+
+
+def symbol_for(path):
+    """BTCUSDT from .../BTCUSDT_1m.csv"""
+    name = os.path.basename(path).split(".")[0]
+    return canonical_symbol(name.split("_")[0].split("-")[0])
+
+
+class CandleFile:
+    """One symbol's history as memory-mapped columns"""
+    
+    def __init__(self, path, symbol=None):
+        if not CANDLES_AVAILABLE:
+            raise ImportError("Backtesting needs numpy (pip install numpy)")
+        self.path = path
+        self.symbol = symbol or symbol_for(path)
+        self.cache = path if path.endswith(".npy") else _cache_path(path)
+        if not os.path.exists(self.cache):
+            print(f"📦 Converting {path} -> {self.cache}")
+            convert(path, self.cache)
+        self.data = np.load(self.cache, mmap_mode="r")
+        self.ts, self.open, self.high, self.low, self.close = self.data
+    
+    def __len__(self):
+        return self.data.shape[1]
+    
+    def candle(self, i):
+        return (float(self.open[i]), float(self.high[i]), float(self.low[i]), float(self.close[i]))
+    
+    def index_at(self, ts):
+        """First candle at or after ts"""
+        return int(np.searchsorted(self.ts, ts, side="left"))
+    
+    def next_cross(self, start, end, up, down):
+        """
+        First index in [start, end) whose high reaches up or low reaches
+        down - end if none. Scans in growing chunks, so a trigger that is
+        hit soon costs little and a quiet year costs a few array passes.
+        """
+        if up is None and down is None:
+            return end
+        i = start
+        chunk = 256
+        while i < end:
+            j = min(end, i + chunk)
+            if up is None:
+                hit = self.low[i:j] <= down
+            elif down is None:
+                hit = self.high[i:j] >= up
+            else:
+                hit = (self.high[i:j] >= up) | (self.low[i:j] <= down)
+            k = int(hit.argmax())
+            if hit[k]:
+                return i + k
+            i = j
+            chunk = min(chunk * 4, 1 << 20)
+        return end
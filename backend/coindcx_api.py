@@ -4,33 +4,82 @@ CoinDCX API Wrapper - Spot + Futures
 """
 
 import hmac
+import threading
 import hashlib
 import time
 import json
 import requests
-from config import API_KEY, API_SECRET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import (
+    API_KEY, API_SECRET, COINDCX_BASE_URL,
+    HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+    HTTP_TICKER_TIMEOUT, HTTP_RETRIES, HTTP_BACKOFF
+)
+from ticker_cache import TickerCache
+from symbols import SymbolIndex, futures_market
+from rate_limiter import RateLimiter, RateLimitTimeout, endpoint_class, PRIORITY_ORDER, PRIORITY_MARKET
+from metrics import record_request
+from event_log import EVENT_LOG
 
 
 class CoinDCXAPI:
     
-    BASE_URL = "https://api.coindcx.com"
+    BASE_URL = COINDCX_BASE_URL
     PUBLIC_URL = "https://public.coindcx.com"
     
-    def __init__(self):
+    def __init__(self, limiter=None, base_url=None):
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
         self.api_key = API_KEY
         self.api_secret = API_SECRET
+        self.limiter = limiter or RateLimiter()  # share one per API key
+        self.session = self._create_session()
+        self.ticker_cache = TickerCache(self._fetch_ticker)
+        self._index = None
+        self._index_source = None
+        self._index_lock = threading.Lock()
+    
+    def _create_session(self, pool_size=HTTP_POOL_SIZE):
+        """
+        Pooled keep-alive session shared by Flask threads and the monitor.
+        Only GETs are retried (with backoff) - orders are never re-sent.
+        """
+        retry = Retry(
+            total=HTTP_RETRIES,
+            backoff_factor=HTTP_BACKOFF,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False
+        )
+        session = requests.Session()
+        for host in (self.BASE_URL, self.PUBLIC_URL):
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=pool_size,
+                max_retries=retry
+            )
+            session.mount(host, adapter)
+        return session
     
     def _generate_signature(self, body):
         secret_bytes = bytes(self.api_secret, encoding='utf-8')
         body_bytes = bytes(json.dumps(body, separators=(',', ':')), encoding='utf-8')
         return hmac.new(secret_bytes, body_bytes, hashlib.sha256).hexdigest()
     
-    def _make_request(self, endpoint, body=None, method="POST"):
+    def _make_request(self, endpoint, body=None, method="POST", priority=None):
         url = f"{self.BASE_URL}{endpoint}"
         
         if body is None:
             body = {}
         
+        # Wait for a token first so the timestamp is fresh when sent
+        kind = endpoint_class(endpoint)
+        try:
+            self.limiter.acquire(kind, priority)
+        except RateLimitTimeout as e:
+            return {"error": str(e)}
+        
         body['timestamp'] = int(time.time() * 1000)
         signature = self._generate_signature(body)
         
@@ -40,39 +89,76 @@ class CoinDCXAPI:
             'X-AUTH-SIGNATURE': signature
         }
         
+        started = time.perf_counter()
         try:
+            timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
             if method == "POST":
-                response = requests.post(url, json=body, headers=headers, timeout=30)
+                # Send exactly the bytes that were signed
+                data = json.dumps(body, separators=(',', ':'))
+                response = self.session.post(url, data=data, headers=headers, timeout=timeout)
             else:
-                response = requests.get(url, headers=headers, timeout=30)
+                response = self.session.get(url, headers=headers, timeout=timeout)
             
+            self.limiter.observe(kind, response.status_code, response.headers)
+            record_request(endpoint, started, response.status_code >= 400)
             return response.json()
         except Exception as e:
+            record_request(endpoint, started, True)
             return {"error": str(e)}
     
     # ==========================================
     # PUBLIC ENDPOINTS - SPOT
     # ==========================================
     
-    def get_ticker(self):
+    def _fetch_ticker(self):
         try:
-            response = requests.get(f"{self.BASE_URL}/exchange/ticker", timeout=10)
+            self.limiter.acquire("public", PRIORITY_MARKET)
+            started = time.perf_counter()
+            response = self.session.get(
+                f"{self.BASE_URL}/exchange/ticker",
+                timeout=(HTTP_CONNECT_TIMEOUT, HTTP_TICKER_TIMEOUT)
+            )
+            self.limiter.observe("public", response.status_code, response.headers)
+            record_request("/exchange/ticker", started, response.status_code >= 400)
             return response.json()
         except Exception as e:
             return {"error": str(e)}
     
-    def get_price(self, market):
-        """Get price for spot market"""
+    def get_ticker(self):
+        """Full ticker - served from the shared TTL cache"""
+        return self.ticker_cache.get()
+    
+    def ticker_stats(self):
+        return self.ticker_cache.stats()
+    
+    def get_symbol_index(self):
+        """SymbolIndex for the current ticker snapshot (None on error)"""
         tickers = self.get_ticker()
         
-        if isinstance(tickers, dict) and "error" in tickers:
+        if not isinstance(tickers, list):
             return None
         
-        for ticker in tickers:
-            if ticker.get('market') == market:
-                return float(ticker.get('last_price', 0))
+        with self._index_lock:
+            # Rebuilt once per ticker refresh, not per lookup
+            if self._index_source is not tickers:
+                self._index = SymbolIndex(tickers, self._index)
+                self._index_source = tickers
+            return self._index
+    
+    def resolve_market(self, symbol):
+        """Exchange market name for any symbol alias"""
+        index = self.get_symbol_index()
+        market = index.resolve(symbol) if index else None
+        return market or futures_market(symbol)
+    
+    def get_price(self, market):
+        """Get price for spot market"""
+        index = self.get_symbol_index()
+        
+        if index is None:
+            return None
         
-        return None
+        return index.market_price(market)
     
     # ==========================================
     # PUBLIC ENDPOINTS - FUTURES / USDT PAIRS
@@ -82,8 +168,9 @@ class CoinDCXAPI:
         """Get all futures/USDT pairs"""
         try:
             # CoinDCX uses same ticker endpoint, filter USDT pairs
-            response = requests.get(f"{self.BASE_URL}/exchange/ticker", timeout=10)
-            data = response.json()
+            data = self.get_ticker()
+            if isinstance(data, dict) and "error" in data:
+                return data
             
             # Filter USDT pairs
             usdt_pairs = [t for t in data if 'USDT' in t.get('market', '')]
@@ -94,44 +181,26 @@ class CoinDCXAPI:
     def get_futures_price(self, symbol):
         """Get price for futures/USDT pair"""
         try:
-            tickers = self.get_ticker()
+            index = self.get_symbol_index()
             
-            if isinstance(tickers, dict) and "error" in tickers:
+            if index is None:
                 return None
             
-            # Try exact match first
-            for ticker in tickers:
-                if ticker.get('market') == symbol:
-                    return float(ticker.get('last_price', 0))
-            
-            # Try with B- prefix (CoinDCX format)
-            for ticker in tickers:
-                market = ticker.get('market', '')
-                if symbol in market or market.replace('B-', '') == symbol:
-                    return float(ticker.get('last_price', 0))
-            
-            return None
+            return index.price(symbol)
         except Exception as e:
-            print(f"Error getting futures price: {e}")
+            EVENT_LOG.message("error", f"Error getting futures price: {e}")
             return None
     
     def get_all_prices(self):
         """Get all prices as dictionary"""
         try:
-            tickers = self.get_ticker()
-            prices = {}
+            index = self.get_symbol_index()
             
-            if isinstance(tickers, list):
-                for ticker in tickers:
-                    market = ticker.get('market', '')
-                    price = float(ticker.get('last_price', 0))
-                    prices[market] = price
-                    
-                    # Also store without B- prefix
-                    if market.startswith('B-'):
-                        prices[market[2:]] = price
+            if index is None:
+                return {}
             
-            return prices
+            # Includes names without the B- prefix
+            return index.flat_prices()
         except Exception as e:
             return {}
     
@@ -159,11 +228,20 @@ class CoinDCXAPI:
             body['market'] = market
         return self._make_request("/exchange/v1/orders/active_orders", body)
     
+    def get_order_status(self, order_id):
+        return self._make_request("/exchange/v1/orders/status", {'id': order_id})
+    
+    def get_orders_status(self, order_ids):
+        """Several orders in one request (status_multiple) - a list of order dicts"""
+        return self._make_request("/exchange/v1/orders/status_multiple", {'ids': list(order_ids)})
+    
     # ==========================================
     # ORDER PLACEMENT
     # ==========================================
     
-    def place_order(self, market, side, order_type, price=None, quantity=None, total_quantity=None):
+    @staticmethod
+    def _order_body(market, side, order_type, price=None, quantity=None, total_quantity=None,
+                    priority=None):
         body = {
             'market': market,
             'side': side,
@@ -177,25 +255,43 @@ class CoinDCXAPI:
         elif total_quantity:
             body['total_quantity'] = total_quantity
         
-        print(f"📝 Placing order: {body}")
-        return self._make_request("/exchange/v1/orders/create", body)
+        return body
     
-    def place_market_buy(self, market, usdt_amount):
+    def place_order(self, market, side, order_type, price=None, quantity=None, total_quantity=None,
+                    priority=PRIORITY_ORDER):
+        body = self._order_body(market, side, order_type, price, quantity, total_quantity)
+        
+        EVENT_LOG.message("info", f"📝 Placing order: {body}")
+        return self._make_request("/exchange/v1/orders/create", body, priority=priority)
+    
+    def place_orders(self, orders, priority=PRIORITY_ORDER):
+        """
+        Several orders in one request (create_multiple - INR markets only).
+        orders: place_order() kwargs - response "orders" follow the same order
+        """
+        body = {'orders': [dict(self._order_body(**order), ecode='I') for order in orders]}
+        
+        EVENT_LOG.message("info", f"📝 Placing {len(orders)} orders in one batch")
+        return self._make_request("/exchange/v1/orders/create_multiple", body, priority=priority)
+    
+    def place_market_buy(self, market, usdt_amount, priority=PRIORITY_ORDER):
         """Buy with USDT amount"""
         return self.place_order(
             market=market,
             side="buy",
             order_type="market_order",
-            total_quantity=usdt_amount
+            total_quantity=usdt_amount,
+            priority=priority
         )
     
-    def place_market_sell(self, market, quantity):
+    def place_market_sell(self, market, quantity, priority=PRIORITY_ORDER):
         """Sell quantity"""
         return self.place_order(
             market=market,
             side="sell",
             order_type="market_order",
-            quantity=quantity
+            quantity=quantity,
+            priority=priority
         )
     
     def place_limit_buy(self, market, price, quantity):
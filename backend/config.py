@@ -3,6 +3,8 @@ CoinDCX Futures Trading Bot - Configuration
 ============================================
 """
 
+import os
+
 # =============================================
 # 🔑 YOUR COINDCX API KEYS
 # =============================================
@@ -10,12 +12,122 @@ CoinDCX Futures Trading Bot - Configuration
 API_KEY = "e998372062e1bea070f03c856f807bbe5c5fd57418d279e0"
 API_SECRET = "198bfc592645f8e9b0da5279ebcf99e600942d0cb0fb81611b4ded9ef733b901"
 
+# REST endpoint - point at mock_exchange.py for local runs and benchmarks
+COINDCX_BASE_URL = os.environ.get("COINDCX_BASE_URL", "https://api.coindcx.com")
+
 # =============================================
 # ⚙️ BOT SETTINGS
 # =============================================
 
 PRICE_CHECK_INTERVAL = 2  # seconds
 
+# Engine: "threads" (monitor thread + order worker pool) or
+# "asyncio" (one event loop for prices and orders, aiohttp client)
+BOT_ENGINE = os.environ.get("BOT_ENGINE", "threads")
+ASYNC_HTTP_LIMIT = 100         # pooled connections for the aiohttp client
+ASYNC_ORDER_CONCURRENCY = 50   # order calls in flight at once
+
+# Price feed: "rest" (poll ticker) or "stream" (socket push, REST fallback)
+PRICE_FEED = "rest"
+STREAM_URL = "wss://stream.coindcx.com/socket.io/?EIO=4&transport=websocket"
+STREAM_CHANNEL = "{market}@trades"
+STREAM_EVENTS = ("new-trade", "price-change")
+STREAM_RECONNECT_MAX = 30  # seconds between reconnect attempts (max)
+
+# Trigger evaluation: "book" (sorted trigger prices) or
+# "numpy" (columnar arrays - faster for very large books, needs numpy)
+EVALUATION_BACKEND = "book"
+
+# Ticker cache (shared by the bot and all dashboard routes)
+TICKER_CACHE_TTL = 1      # seconds a ticker snapshot is served as fresh
+TICKER_MAX_STALE = 10     # extra seconds served stale while refreshing
+
+# HTTP connection pool (kept alive across requests and threads)
+HTTP_POOL_SIZE = 10        # keep-alive connections per host
+HTTP_CONNECT_TIMEOUT = 3.05
+HTTP_READ_TIMEOUT = 10     # signed/order calls
+HTTP_TICKER_TIMEOUT = 5    # public market data
+HTTP_RETRIES = 3           # idempotent GETs only
+HTTP_BACKOFF = 0.3         # 0.3s, 0.6s, 1.2s...
+
+# Exchange rate limits: (requests/second, burst) per endpoint class.
+# Conservative defaults - the limiter also adapts to 429s and
+# X-RateLimit-* headers at runtime.
+RATE_LIMITS = {
+    "public": (8, 16),     # ticker / market data
+    "orders": (8, 16),     # create / cancel
+    "account": (4, 8),     # balances, open orders
+}
+RATE_LIMIT_GLOBAL = (16, 32)  # everything sent with this key / IP
+RATE_LIMIT_MAX_WAIT = 30      # seconds a call may queue for a token before it fails
+
+# Order execution (bookings and exits leave the monitor thread)
+ORDER_WORKERS = 4          # concurrent order requests (one at a time per trade)
+BATCH_ORDERS = True        # net one tick's exits per market/side, send as one batch
+EXIT_RETRY_BACKOFF = (1, 2, 5, 10, 30)  # seconds before retrying a failed exit (last one repeats)
+
+# Order reconciliation (reconciler.py): open orders checked in bulk, not per trade
+RECONCILE_INTERVAL = 5     # seconds between passes
+RECONCILE_BATCH = 50       # order ids per status_multiple request
+RECONCILE_MAX_MISSES = 3   # passes an order may be missing from every response before it is dropped
+
+# Local state (trade log spill files, ...)
+DATA_DIR = os.environ.get("BOT_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+# Trade logs: newest entries stay in memory, older ones spill to DATA_DIR
+TRADE_LOG_BUFFER = 200     # entries kept in memory per trade
+TRADE_LOG_SPILL_INTERVAL = 1.0  # seconds between background appends of spilled entries
+TRADE_LOG_SUMMARY = 5      # newest entries included in trade payloads
+TRADE_LOG_PAGE = 100       # default page size for /api/bot/logs
+TRADES_PAGE = 100          # default page size for /api/bot/trades
+
+# Process log (event_log.py): queued on the caller, written by a background thread
+LOG_LEVEL = os.environ.get("BOT_LOG_LEVEL", "info")  # debug also logs sampled price_update
+LOG_CONSOLE = True
+LOG_FILE = os.environ.get("BOT_LOG_FILE")  # JSON lines, e.g. data/bot.log (None = off)
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024      # rotate past this size
+LOG_FILE_BACKUPS = 5                       # bot.log.1 .. bot.log.5
+LOG_QUEUE_SIZE = 100000    # records waiting for the writer before new ones are dropped
+LOG_FLUSH_INTERVAL = 0.25  # seconds between writer batches
+LOG_SAMPLE = {"price_update": 50}  # event -> keep 1 in N
+
+# Trade journal (SQLite WAL) - replayed on startup so a restart resumes
+# trailing open positions. Point BOT_DATA_DIR at a persistent volume.
+JOURNAL_ENABLED = True
+JOURNAL_PATH = os.path.join(DATA_DIR, "journal.db")
+JOURNAL_SYNCHRONOUS = "FULL"   # fsync per batch commit ("NORMAL" = at checkpoints)
+JOURNAL_FLUSH_INTERVAL = 0.05  # writer wake-up (seconds)
+JOURNAL_BATCH_MAX = 500        # events per commit
+JOURNAL_SNAPSHOT_EVERY = 1000  # events between snapshot + compaction
+JOURNAL_KEEP_CLOSED = 500      # closed trades kept in snapshots
+
+# Dashboard push channel (/api/events, server-sent events)
+EVENT_QUEUE_SIZE = 256     # frames buffered per browser before dropping
+EVENT_KEEPALIVE = 15       # seconds between keep-alive comments
+EVENT_RETRY_MS = 3000      # browser reconnect delay
+EVENT_PRICE_INTERVAL = 2   # seconds between dashboard price pushes
+
+# Latency histograms (/metrics) - bucket upper bounds in seconds
+METRICS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Profiling (/api/admin/profile, /api/admin/slow-ticks)
+PROFILE_INTERVAL = 0.005   # seconds between stack samples
+PROFILE_MAX_SECONDS = 60   # longest capture one request may ask for
+SLOW_TICK_SECONDS = None   # ticks slower than this are kept - off until POST /api/admin/slow-ticks
+SLOW_TICK_RING = 50        # slow ticks kept
+
+# Dashboard files (static_assets.py) - hashed, precompressed, served from memory
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend")
+STATIC_MAX_AGE = 31536000  # seconds hashed assets are cached (immutable)
+STATIC_GZIP_LEVEL = 9      # compressed once at startup, so use the smallest
+
+# Backtesting (backtest.py)
+BACKTEST_CACHE_DIR = os.path.join(DATA_DIR, "backtest")  # memory-mapped candle caches
+BACKTEST_FEE = 0.0005       # per fill, fraction of notional
+BACKTEST_SLIPPAGE = 0.0002  # market orders fill this much worse than the trigger
+BACKTEST_INTRABAR = "direction"  # "direction" (up candle: low first) or "nearest" (extreme nearer the open first)
+SWEEP_WORKERS = None        # sweep.py processes (None = all cores)
+
 # Available Futures Pairs
 FUTURES_PAIRS = [
     {"symbol": "BTCUSDT", "name": "Bitcoin", "icon": "₿"},
@@ -0,0 +1,250 @@
+"""
+Event Log - queued, structured console / file logging
+=====================================================
+The bot's emit() and log() used to json.dumps and print on the monitor
+thread for every event. Now a call is a level check, a sampling check
+and one deque append; a background writer drains the queue every
+LOG_FLUSH_INTERVAL and hands the batch to the sinks:
+
+- ConsoleSink  the old "[event] {...}" / "[12:00:00] [INFO] ..." lines
+- FileSink     JSON lines with size-based rotation (bot.log, bot.log.1, ...)
+
+Records stay as (time, level, kind, name, trade_id, data) tuples until a
+sink needs them - each format is rendered at most once per batch, on the
+writer thread. price_update is logged at debug and sampled (LOG_SAMPLE),
+so at the default level it is dropped before it is queued.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from config import (
+    LOG_LEVEL, LOG_CONSOLE, LOG_FILE, LOG_FILE_MAX_BYTES, LOG_FILE_BACKUPS,
+    LOG_QUEUE_SIZE, LOG_FLUSH_INTERVAL, LOG_SAMPLE
+)
+
+LEVELS = {"debug": 10, "info": 20, "success": 20, "warning": 30, "error": 40}
+# Events logged below info - everything else is info
+EVENT_LEVELS = {"price_update": "debug"}
+
+_clock = [None, ""]
+
+
+def hms(now=None):
+    """HH:MM:SS local time - formatted once per second, not per call"""
+    second = int(now or time.time())
+    if _clock[0] != second:
+        _clock[1] = time.strftime("%H:%M:%S", time.localtime(second))
+        _clock[0] = second
+    return _clock[1]
+
+
+# ==========================================
+# FORMATS
+# ==========================================
+
+def _text(record):
+    ts, level, kind, name, trade_id, data = record
+    if kind == "event":
+        return f"[{name}] {json.dumps(data, default=str)[:200]}"
+    return f"[{hms(ts)}] [{level.upper()}] {data}"
+
+
+def _json(record):
+    ts, level, kind, name, trade_id, data = record
+    entry = {"ts": datetime.fromtimestamp(ts).isoformat(timespec="milliseconds"), "level": level}
+    if kind == "event":
+        entry["event"] = name
+        entry["data"] = data
+    else:
+        entry["message"] = data
+    if trade_id is not None:
+        entry["trade_id"] = trade_id
+    return json.dumps(entry, default=str)
+
+
+FORMATS = {"text": _text, "json": _json}
+
+
+class ConsoleSink:
+    
+    format = "text"
+    
+    def write(self, lines):
+        # Looked up per batch so redirect_stdout() still applies
+        stream = sys.stdout
+        stream.write("\n".join(lines) + "\n")
+        stream.flush()
+    
+    def close(self):
+        pass
+
+
+class FileSink:
+    """JSON lines, rotated to path.1 .. path.N past max_bytes"""
+    
+    format = "json"
+    
+    def __init__(self, path, max_bytes=LOG_FILE_MAX_BYTES, backups=LOG_FILE_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+        self.size = self.file.tell()
+    
+    def write(self, lines):
+        chunk = []
+        size = self.size
+        for line in lines:
+            if self.max_bytes and size and size + len(line) + 1 > self.max_bytes:
+                self._append(chunk)
+                self._rotate()
+                chunk = []
+                size = 0
+            chunk.append(line)
+            size += len(line) + 1
+        self._append(chunk)
+    
+    def _append(self, lines):
+        if lines:
+            data = "\n".join(lines) + "\n"
+            self.file.write(data)
+            self.file.flush()
+            self.size += len(data)
+    
+    def _rotate(self):
+        self.file.close()
+        for n in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{n}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{n + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.size = 0
+    
+    def close(self):
+        self.file.close()
+
+
+def default_sinks():
+    sinks = []
+    if LOG_CONSOLE:
+        sinks.append(ConsoleSink())
+    if LOG_FILE:
+        sinks.append(FileSink(LOG_FILE))
+    return sinks
+
+
+# ==========================================
+# QUEUE + WRITER
+# ==========================================
+
+class EventLog:
+    
+    def __init__(self, sinks=None, level=LOG_LEVEL, sample=LOG_SAMPLE,
+                 maxlen=LOG_QUEUE_SIZE, interval=LOG_FLUSH_INTERVAL):
+        self.sinks = default_sinks() if sinks is None else sinks
+        self.level = LEVELS[level]
+        self.sample = dict(sample)    # event -> keep 1 in N
+        self.seen = {}                # event -> count, for sampling
+        self.maxlen = maxlen
+        self.interval = interval
+        self.queue = deque()          # append/popleft are thread-safe
+        self.flush_lock = threading.Lock()
+        self.thread = None
+        self._stopped = threading.Event()
+        self.queued = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.written = 0
+    
+    def event(self, name, data, trade_id=None):
+        """An emit() - data is kept as is and serialized on the writer"""
+        level = EVENT_LEVELS.get(name, "info")
+        if LEVELS[level] < self.level:
+            return
+        every = self.sample.get(name)
+        if every:
+            n = self.seen[name] = self.seen.get(name, 0) + 1
+            if n % every:
+                self.sampled_out += 1
+                return
+        self._put((time.time(), level, "event", name, trade_id, data))
+    
+    def message(self, level, text, trade_id=None):
+        if LEVELS.get(level, 20) < self.level:
+            return
+        self._put((time.time(), level, "message", None, trade_id, text))
+    
+    def _put(self, record):
+        if len(self.queue) >= self.maxlen:
+            self.dropped += 1
+            return
+        self.queue.append(record)
+        self.queued += 1
+        if self.thread is None:
+            self.start()
+    
+    def start(self):
+        with self.flush_lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+            self.thread.start()
+        atexit.register(self.close)
+    
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.flush()
+    
+    def flush(self):
+        """Write everything queued so far - on the writer thread, or at exit"""
+        with self.flush_lock:
+            records = []
+            queue = self.queue
+            while queue:
+                records.append(queue.popleft())
+            if not records:
+                return
+            rendered = {}
+            for sink in self.sinks:
+                lines = rendered.get(sink.format)
+                if lines is None:
+                    lines = rendered[sink.format] = [FORMATS[sink.format](r) for r in records]
+                try:
+                    sink.write(lines)
+                except Exception as e:
+                    sys.stderr.write(f"Log sink error: {e}\n")
+            self.written += len(records)
+    
+    def configure(self, level=None, sample=None):
+        if level is not None:
+            self.level = LEVELS[level]
+        if sample is not None:
+            self.sample = dict(sample)
+    
+    def close(self):
+        self._stopped.set()
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+    
+    def stats(self):
+        return {
+            "queued": self.queued,
+            "pending": len(self.queue),
+            "written": self.written,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out
+        }
+
+
+EVENT_LOG = EventLog()  # shared by every bot in the process
@@ -0,0 +1,208 @@
+"""
+Event Stream - server-sent events for the dashboard
+===================================================
+One EventBroadcaster is handed to the bot as its `socketio`. Every
+emit() is serialized once and fanned out to each connected browser's
+own bounded queue, so a slow tab never holds up the monitor or the
+other tabs:
+
+- a price_update still waiting in a client's queue is replaced by the
+  newer one for the same trade (the browser only needs the latest)
+- a full queue drops the oldest price update; if only trade events are
+  left the client gets "resync" and is disconnected - it reconnects and
+  refetches the trade
+- feed() pushes one shared ticker snapshot to every client, fetched only
+  while someone is listening - cost no longer grows with open tabs
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from event_log import EVENT_LOG
+from config import EVENT_QUEUE_SIZE, EVENT_KEEPALIVE, EVENT_RETRY_MS
+
+
+def _frame(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def coalesce_key(event, data):
+    """Queued frames with the same key keep only the newest (None = keep all)"""
+    if event == "price_update":
+        return (event, data.get("trade_id"))
+    return None
+
+
+class EventClient:
+    """One browser connection - a bounded queue of encoded frames"""
+    
+    __slots__ = ("frames", "latest", "cond", "maxlen", "closed", "overflowed", "dropped", "coalesced")
+    
+    def __init__(self, maxlen=EVENT_QUEUE_SIZE):
+        self.frames = deque()   # [key, frame]
+        self.latest = {}        # key -> queued entry since the last trade event
+        self.cond = threading.Condition()
+        self.maxlen = maxlen
+        self.closed = False
+        self.overflowed = False
+        self.dropped = 0
+        self.coalesced = 0
+    
+    def push(self, key, frame):
+        with self.cond:
+            if self.closed:
+                return
+            if key is not None:
+                entry = self.latest.get(key)
+                if entry is not None:
+                    entry[1] = frame
+                    self.coalesced += 1
+                    return
+            else:
+                # Later updates must stay behind this event
+                self.latest.clear()
+            
+            if len(self.frames) >= self.maxlen and not self._make_room():
+                return
+            
+            entry = [key, frame]
+            self.frames.append(entry)
+            if key is not None:
+                self.latest[key] = entry
+            self.cond.notify()
+    
+    def _make_room(self):
+        """Drop the oldest price update - or give up on this client"""
+        for i, entry in enumerate(self.frames):
+            if entry[0] is not None:
+                del self.frames[i]
+                if self.latest.get(entry[0]) is entry:
+                    del self.latest[entry[0]]
+                self.dropped += 1
+                return True
+        self.overflowed = True
+        self.close()
+        return False
+    
+    def pop(self, timeout):
+        """All queued frames, [] after timeout, None once closed"""
+        with self.cond:
+            if not self.frames and not self.closed:
+                self.cond.wait(timeout)
+            if self.closed:
+                return None
+            frames = [entry[1] for entry in self.frames]
+            self.frames.clear()
+            self.latest.clear()
+            return frames
+    
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+
+
+class EventBroadcaster:
+    
+    def __init__(self, maxlen=EVENT_QUEUE_SIZE, keepalive=EVENT_KEEPALIVE):
+        self.maxlen = maxlen
+        self.keepalive = keepalive
+        self.clients = ()           # replaced on (un)subscribe - emit() reads it lock-free
+        self.lock = threading.Lock()
+        self.listening = threading.Event()
+        self.retained = {}          # feed event -> last frame, sent on connect
+        self.emitted = 0
+        self.disconnected = 0
+    
+    # ==========================================
+    # PUBLISH
+    # ==========================================
+    
+    def emit(self, event, data):
+        """socketio.emit() stand-in - called by the bot on every event"""
+        clients = self.clients
+        self.emitted += 1
+        if not clients:
+            return
+        
+        key = coalesce_key(event, data)
+        frame = _frame(event, data)  # once, shared by every client
+        for client in clients:
+            client.push(key, frame)
+    
+    def feed(self, event, fetch, interval):
+        """Push fetch() as `event` every interval seconds while clients are connected"""
+        thread = threading.Thread(
+            target=self._run_feed,
+            args=(event, fetch, interval),
+            name=f"feed-{event}",
+            daemon=True
+        )
+        thread.start()
+        return thread
+    
+    def _run_feed(self, event, fetch, interval):
+        last = None
+        while True:
+            self.listening.wait()
+            started = time.monotonic()
+            try:
+                data = fetch()
+                if data and data != last:
+                    last = data
+                    frame = _frame(event, data)
+                    self.retained[event] = frame
+                    for client in self.clients:
+                        client.push((event,), frame)
+            except Exception as e:
+                EVENT_LOG.message("error", f"Feed error {event}: {e}")
+            time.sleep(max(0, interval - (time.monotonic() - started)))
+    
+    # ==========================================
+    # CLIENTS
+    # ==========================================
+    
+    def subscribe(self):
+        client = EventClient(self.maxlen)
+        for event, frame in list(self.retained.items()):
+            client.push((event,), frame)
+        with self.lock:
+            self.clients = self.clients + (client,)
+            self.listening.set()
+        return client
+    
+    def unsubscribe(self, client):
+        client.close()
+        with self.lock:
+            if client not in self.clients:
+                return
+            self.clients = tuple(c for c in self.clients if c is not client)
+            self.disconnected += 1
+            if not self.clients:
+                self.listening.clear()
+    
+    def stream(self, client):
+        """text/event-stream body for one client - ends when it disconnects"""
+        try:
+            yield f"retry: {EVENT_RETRY_MS}\n\n"
+            while True:
+                frames = client.pop(self.keepalive)
+                if frames is None:
+                    if client.overflowed:
+                        yield _frame("resync", {"dropped": client.dropped})
+                    return
+                yield "".join(frames) if frames else ": keepalive\n\n"
+        finally:
+            self.unsubscribe(client)
+    
+    def stats(self):
+        clients = self.clients
+        return {
+            "clients": len(clients),
+            "emitted": self.emitted,
+            "queued": sum(len(c.frames) for c in clients),
+            "coalesced": sum(c.coalesced for c in clients),
+            "dropped": sum(c.dropped for c in clients),
+            "disconnected": self.disconnected
+        }
@@ -0,0 +1,200 @@
+"""
+Trade Journal - durable trade state for crash recovery
+======================================================
+Every state change (open, level/SL move, partial booking, exit, close) is
+appended to a SQLite database in WAL mode. The monitor thread only puts
+a small state dict on a queue; a background writer commits batches in
+one transaction each, so one fsync covers every change in the batch.
+
+Every JOURNAL_SNAPSHOT_EVERY events the writer stores a snapshot of the
+latest state per trade and deletes the events it covers (compaction).
+load() = newest snapshot + events after it -> latest state per trade.
+"""
+
+import os
+import json
+import time
+import queue
+import sqlite3
+import threading
+from config import (JOURNAL_PATH, JOURNAL_SNAPSHOT_EVERY, JOURNAL_FLUSH_INTERVAL,
+                    JOURNAL_BATCH_MAX, JOURNAL_KEEP_CLOSED, JOURNAL_SYNCHRONOUS)
+from trade import OPEN_STATUSES
+from event_log import EVENT_LOG
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    trade_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    last_seq INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    trades TEXT NOT NULL
+);
+"""
+
+_STOP = object()
+
+
+class TradeJournal:
+    
+    def __init__(self, path=JOURNAL_PATH, snapshot_every=JOURNAL_SNAPSHOT_EVERY):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.states = {}        # trade_id -> latest state (writer's own copy)
+        self.queue = queue.Queue()
+        self.pending = 0        # events since the last snapshot
+        self.written = 0
+        self.batches = 0
+        self.errors = 0         # batches that failed - the writer keeps going
+        self._thread = None
+    
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={JOURNAL_SYNCHRONOUS}")
+        conn.executescript(SCHEMA)
+        return conn
+    
+    # ==========================================
+    # REPLAY
+    # ==========================================
+    
+    def load(self):
+        """Latest state of every journaled trade (snapshot + tail)"""
+        conn = self._connect()
+        try:
+            states = {}
+            last_seq = 0
+            row = conn.execute(
+                "SELECT last_seq, trades FROM snapshots ORDER BY last_seq DESC LIMIT 1"
+            ).fetchone()
+            if row:
+                last_seq = row[0]
+                for state in json.loads(row[1]):
+                    states[state["id"]] = state
+            
+            tail = conn.execute(
+                "SELECT trade_id, state FROM events WHERE seq > ? ORDER BY seq", (last_seq,)
+            ).fetchall()
+            for trade_id, state in tail:
+                states[trade_id] = json.loads(state)
+            
+            self.states = states
+            self.pending = len(tail)
+            return list(states.values())
+        finally:
+            conn.close()
+    
+    # ==========================================
+    # WRITER
+    # ==========================================
+    
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="trade-journal", daemon=True)
+        self._thread.start()
+    
+    def record(self, kind, trade):
+        """Queue a trade's current state - never blocks on disk"""
+        self.queue.put((time.time(), trade.id, kind, trade.to_state()))
+    
+    def flush(self):
+        """Block until everything queued so far is committed"""
+        if self._thread and self._thread.is_alive():
+            self.queue.join()
+    
+    def close(self):
+        if self._thread and self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join()
+    
+    def _run(self):
+        conn = self._connect()
+        try:
+            while True:
+                try:
+                    item = self.queue.get(timeout=JOURNAL_FLUSH_INTERVAL)
+                except queue.Empty:
+                    continue
+                
+                # Group everything already queued into one commit
+                batch = [item]
+                while len(batch) < JOURNAL_BATCH_MAX:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                stop = any(entry is _STOP for entry in batch)
+                events = [entry for entry in batch if entry is not _STOP]
+                try:
+                    if events:
+                        self._write(conn, events)
+                    if self.pending >= self.snapshot_every or (stop and self.pending):
+                        self._snapshot(conn)
+                except Exception as e:
+                    # Never let one bad batch kill the writer - record() would queue forever
+                    self.errors += 1
+                    EVENT_LOG.message("error", f"Journal write error: {type(e).__name__}: {e}")
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+                if stop:
+                    return
+        finally:
+            conn.close()
+    
+    def _write(self, conn, events):
+        rows = []
+        for ts, trade_id, kind, state in events:
+            rows.append((ts, trade_id, kind, json.dumps(state)))
+            self.states[trade_id] = state
+        with conn:
+            conn.executemany(
+                "INSERT INTO events (ts, trade_id, kind, state) VALUES (?, ?, ?, ?)", rows
+            )
+        self.pending += len(rows)
+        self.written += len(rows)
+        self.batches += 1
+    
+    def _snapshot(self, conn):
+        """Store the latest state per trade and drop the events it covers"""
+        last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+        
+        # Keep every open trade and unsent exit, but only the newest closed ones
+        active = [s for s in self.states.values() if s["status"] in OPEN_STATUSES or s.get("exit")]
+        closed = [s for s in self.states.values() if s["status"] not in OPEN_STATUSES and not s.get("exit")]
+        if len(closed) > JOURNAL_KEEP_CLOSED:
+            closed.sort(key=lambda s: s["created_at"])
+            for state in closed[:-JOURNAL_KEEP_CLOSED]:
+                del self.states[state["id"]]
+            closed = closed[-JOURNAL_KEEP_CLOSED:]
+        
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (last_seq, ts, trades) VALUES (?, ?, ?)",
+                (last_seq, time.time(), json.dumps(closed + active))
+            )
+            conn.execute("DELETE FROM snapshots WHERE last_seq < ?", (last_seq,))
+            conn.execute("DELETE FROM events WHERE seq <= ?", (last_seq,))
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.pending = 0
+    
+    def stats(self):
+        return {
+            "queued": self.queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "errors": self.errors,
+            "since_snapshot": self.pending,
+            "trades": len(self.states)
+        }
\ No newline at end of file
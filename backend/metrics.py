@@ -0,0 +1,248 @@
+"""
+Metrics - hot-path histograms and counters, Prometheus text output
+==================================================================
+observe() / inc() never take a lock: every thread writes its own shard
+(a plain list) and render() adds the shards up when /metrics is scraped.
+A torn read can only be off by the observation in flight. When a thread
+exits its shard is folded into a retired total, so per-request and
+refresh threads don't pile up shards.
+
+- bot_tick_seconds          monitor tick: trigger checks + order hand-off
+- bot_price_fetch_seconds   ticker snapshot per tick (cache or HTTP)
+- bot_trade_eval_seconds    tick time divided by the trades it covered
+- bot_loop_lag_seconds      how late a tick started vs PRICE_CHECK_INTERVAL
+- coindcx_request_seconds   REST round trip per endpoint
+- coindcx_request_errors_total
+Existing stats() (ticker cache, rate limiter, order executor, events)
+are added at scrape time with REGISTRY.collect().
+"""
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from event_log import EVENT_LOG
+from config import METRICS_BUCKETS
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (list(extra.items()) if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Holder:
+    """A thread's shard - dropped with the thread's locals when it exits"""
+    
+    __slots__ = ("shard", "__weakref__")
+    
+    def __init__(self, shard):
+        self.shard = shard
+
+
+class _Shards:
+    """One labelled series - a list of counters per live writing thread"""
+    
+    __slots__ = ("size", "local", "shards", "retired", "lock")
+    
+    def __init__(self, size):
+        self.size = size
+        self.local = threading.local()
+        self.shards = {}             # id(shard) -> shard, live threads only
+        self.retired = [0] * size    # folded-in shards of exited threads
+        self.lock = threading.RLock()  # _retire may run from GC inside total()
+    
+    def shard(self):
+        holder = getattr(self.local, "holder", None)
+        if holder is None:
+            shard = [0] * self.size
+            holder = self.local.holder = _Holder(shard)
+            with self.lock:
+                self.shards[id(shard)] = shard
+            weakref.finalize(holder, self._retire, shard)
+        return holder.shard
+    
+    def _retire(self, shard):
+        with self.lock:
+            self.shards.pop(id(shard), None)
+            for i, value in enumerate(shard):
+                self.retired[i] += value
+    
+    def total(self):
+        with self.lock:
+            shards = list(self.shards.values())
+            totals = list(self.retired)
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class _Family:
+    """Metric with optional labels - one _Shards per label combination"""
+    
+    kind = None
+    
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self.series = {}
+        self.lock = threading.Lock()
+    
+    def labels(self, *values):
+        series = self.series.get(values)
+        if series is None:
+            with self.lock:
+                series = self.series.setdefault(values, self._new_series())
+        return series
+    
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, series in list(self.series.items()):
+            lines.extend(self._samples(values, series.total()))
+        return lines
+
+
+class _Counter(_Shards):
+    
+    __slots__ = ()
+    
+    def inc(self, amount=1):
+        self.shard()[0] += amount
+
+
+class Counter(_Family):
+    
+    kind = "counter"
+    
+    def _new_series(self):
+        return _Counter(1)
+    
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+    
+    def _samples(self, values, totals):
+        return [f"{self.name}{_labels(self.labelnames, values)} {_number(totals[0])}"]
+
+
+class _Histogram(_Shards):
+    
+    __slots__ = ("bounds",)
+    
+    def __init__(self, bounds):
+        super().__init__(len(bounds) + 2)  # buckets, +Inf, sum
+        self.bounds = bounds
+    
+    def observe(self, value):
+        shard = self.shard()
+        shard[bisect_left(self.bounds, value)] += 1
+        shard[-1] += value
+
+
+class Histogram(_Family):
+    
+    kind = "histogram"
+    
+    def __init__(self, name, help, labels=(), buckets=METRICS_BUCKETS):
+        super().__init__(name, help, labels)
+        self.bounds = tuple(sorted(buckets))
+    
+    def _new_series(self):
+        return _Histogram(self.bounds)
+    
+    def observe(self, value):
+        self.labels().observe(value)
+    
+    def _samples(self, values, totals):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), totals):
+            cumulative += count
+            labels = _labels(self.labelnames, values, {"le": _number(bound)})
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_number(totals[-1])}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    
+    def __init__(self):
+        self.families = []
+        self.collectors = []
+    
+    def histogram(self, name, help, labels=(), buckets=METRICS_BUCKETS):
+        family = Histogram(name, help, labels, buckets)
+        self.families.append(family)
+        return family
+    
+    def counter(self, name, help, labels=()):
+        family = Counter(name, help, labels)
+        self.families.append(family)
+        return family
+    
+    def collect(self, fn):
+        """
+        fn() -> [(name, kind, help, [(labels dict, value), ...]), ...]
+        Called on every scrape - for numbers already kept elsewhere.
+        """
+        self.collectors.append(fn)
+        return fn
+    
+    def render(self):
+        """Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for family in self.families:
+            lines.extend(family.render())
+        for fn in self.collectors:
+            try:
+                samples = fn()
+            except Exception as e:
+                EVENT_LOG.message("error", f"Metrics collector error: {e}")
+                continue
+            for name, kind, help, values in samples:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in values:
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+TICK_SECONDS = REGISTRY.histogram(
+    "bot_tick_seconds", "Monitor tick duration: trigger checks and order hand-off")
+PRICE_FETCH_SECONDS = REGISTRY.histogram(
+    "bot_price_fetch_seconds", "Ticker snapshot fetch per tick (cache hit or HTTP)")
+TRADE_EVAL_SECONDS = REGISTRY.histogram(
+    "bot_trade_eval_seconds", "Tick duration divided by the open trades it covered",
+    buckets=(1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3))
+LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "bot_loop_lag_seconds", "How late a monitor tick started after PRICE_CHECK_INTERVAL")
+REQUEST_SECONDS = REGISTRY.histogram(
+    "coindcx_request_seconds", "CoinDCX REST round trip", labels=("endpoint",))
+REQUEST_ERRORS = REGISTRY.counter(
+    "coindcx_request_errors_total", "CoinDCX calls that failed or returned HTTP >= 400", labels=("endpoint",))
+
+
+def record_request(endpoint, started, failed=False):
+    """One REST call that began at perf_counter() == started"""
+    REQUEST_SECONDS.labels(endpoint).observe(time.perf_counter() - started)
+    if failed:
+        REQUEST_ERRORS.labels(endpoint).inc()
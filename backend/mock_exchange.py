@@ -0,0 +1,376 @@
+"""
+Mock CoinDCX Exchange - Local stand-in REST server
+==================================================
+Enough of api.coindcx.com to run the bot, the dashboard and benchmarks
+with no network. Standard library only.
+
+- GET  /exchange/ticker                        all markets, spot + B- names
+- POST /exchange/v1/users/balances
+- POST /exchange/v1/orders/create              market orders fill at once,
+- POST /exchange/v1/orders/create_multiple     limit orders rest until crossed
+- POST /exchange/v1/orders/cancel | cancel_all | active_orders
+- POST /exchange/v1/orders/status | status_multiple
+
+Signed calls are checked like the real exchange: X-AUTH-APIKEY must match
+and X-AUTH-SIGNATURE must be the HMAC-SHA256 of the raw body bytes.
+Latency, jitter, 5xx errors and 429s are configurable, and prices follow
+a path ("walk", "trend", "flat" or a callable) or set_price().
+    
+    python backend/mock_exchange.py --port 9000 --latency-ms 20 --error-rate 0.01
+
+then start the server with COINDCX_BASE_URL=http://127.0.0.1:9000.
+
+From Python (tests/benchmarks):
+    
+    exchange = MockExchange(port=0, tick_interval=0)
+    url = exchange.start()          # runs in a background thread
+    api = CoinDCXAPI(base_url=url)
+    exchange.set_price("BTCUSDT", 65000)
+"""
+
+import argparse
+import hashlib
+import hmac
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from symbols import canonical_symbol, futures_market
+from config import API_KEY, API_SECRET, FUTURES_PAIRS
+
+START_PRICES = {
+    "BTCUSDT": 65000.0, "ETHUSDT": 3500.0, "SOLUSDT": 150.0, "XRPUSDT": 0.6,
+    "DOGEUSDT": 0.15, "MATICUSDT": 0.7, "ADAUSDT": 0.45, "AVAXUSDT": 35.0
+}
+
+
+class MockExchange:
+    
+    def __init__(self, host="127.0.0.1", port=9000, api_key=API_KEY, api_secret=API_SECRET,
+                 prices=None, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0,
+                 path="walk", volatility=0.0005, drift=0.0, tick_interval=0.5,
+                 balance=10000.0, seed=None):
+        self.host = host
+        self.port = port
+        self.api_key = api_key
+        self.secret = bytes(api_secret, encoding="utf-8")
+        self.prices = dict(prices or {p["symbol"]: START_PRICES.get(p["symbol"], 100.0) for p in FUTURES_PAIRS})
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.path = path
+        self.volatility = volatility
+        self.drift = drift
+        self.tick_interval = tick_interval
+        self.balance = balance
+        self.rng = random.Random(seed)
+        self.orders = {}  # id -> order dict
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.step = 0
+        self.server = None
+        self.thread = None
+        self._stopped = threading.Event()
+        self.stats = {"requests": 0, "orders": 0, "rejected": 0, "errors": 0, "throttled": 0}
+    
+    # ==========================================
+    # LIFECYCLE
+    # ==========================================
+    
+    def start(self):
+        """Serve in a background thread, return the base URL"""
+        self.server = ThreadingHTTPServer((self.host, self.port), _handler(self))
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        if self.tick_interval:
+            threading.Thread(target=self._run_path, daemon=True).start()
+        return f"http://{self.host}:{self.port}"
+    
+    def stop(self):
+        self._stopped.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+    
+    # ==========================================
+    # PRICES
+    # ==========================================
+    
+    def set_price(self, symbol, price):
+        """Move one market (any alias) and fill resting limit orders it crosses"""
+        with self.lock:
+            self.prices[canonical_symbol(symbol)] = float(price)
+            self._match(canonical_symbol(symbol))
+    
+    def advance(self):
+        """One step of the price path for every market"""
+        with self.lock:
+            self.step += 1
+            for symbol, price in self.prices.items():
+                if callable(self.path):
+                    price = self.path(symbol, self.step, price)
+                elif self.path == "walk":
+                    price *= 1 + self.rng.gauss(0, self.volatility)
+                elif self.path == "trend":
+                    price *= 1 + self.drift + self.rng.gauss(0, self.volatility)
+                self.prices[symbol] = price
+                self._match(symbol)
+    
+    def _run_path(self):
+        while not self._stopped.wait(self.tick_interval):
+            self.advance()
+    
+    def ticker(self):
+        now = int(time.time() * 1000)
+        rows = []
+        with self.lock:
+            for symbol, price in self.prices.items():
+                for market in (symbol, futures_market(symbol)):
+                    rows.append({
+                        "market": market,
+                        "last_price": f"{price:.8g}",
+                        "bid": f"{price * 0.9999:.8g}",
+                        "ask": f"{price * 1.0001:.8g}",
+                        "volume": "1000",
+                        "timestamp": now
+                    })
+        return rows
+    
+    # ==========================================
+    # ORDERS
+    # ==========================================
+    
+    def create(self, body):
+        """One order body -> order dict (or an error dict)"""
+        market = body.get("market", "")
+        symbol = canonical_symbol(market)
+        side = body.get("side")
+        order_type = body.get("order_type")
+        if symbol not in self.prices:
+            return {"code": 422, "message": f"Invalid market {market}"}
+        if side not in ("buy", "sell") or order_type not in ("market_order", "limit_order"):
+            return {"code": 422, "message": "Invalid side or order_type"}
+        
+        price = self.prices[symbol]
+        quantity = float(body.get("quantity") or 0)
+        if not quantity and body.get("total_quantity"):
+            quantity = float(body["total_quantity"]) / price
+        if quantity <= 0:
+            return {"code": 422, "message": "Quantity required"}
+        
+        now = int(time.time() * 1000)
+        order = {
+            "id": f"mock-{next(self.ids)}",
+            "market": market,
+            "order_type": order_type,
+            "side": side,
+            "status": "open",
+            "fee_amount": 0.0,
+            "fee": 0.1,
+            "total_quantity": quantity,
+            "remaining_quantity": quantity,
+            "avg_price": 0.0,
+            "price_per_unit": float(body.get("price_per_unit") or 0),
+            "created_at": now,
+            "updated_at": now
+        }
+        self.orders[order["id"]] = order
+        self.stats["orders"] += 1
+        if order_type == "market_order":
+            self._fill(order, price)
+        else:
+            self._match(symbol)
+        return dict(order)
+    
+    def _fill(self, order, price):
+        order["status"] = "filled"
+        order["avg_price"] = price
+        order["remaining_quantity"] = 0.0
+        order["fee_amount"] = order["total_quantity"] * price * order["fee"] / 100
+        order["updated_at"] = int(time.time() * 1000)
+    
+    def _match(self, symbol):
+        """Fill open limit orders on symbol that the price has crossed"""
+        price = self.prices[symbol]
+        for order in self.orders.values():
+            if order["status"] != "open" or canonical_symbol(order["market"]) != symbol:
+                continue
+            limit = order["price_per_unit"]
+            if (order["side"] == "buy" and price <= limit) or (order["side"] == "sell" and price >= limit):
+                self._fill(order, limit)
+    
+    def cancel(self, order_ids):
+        cancelled = 0
+        for order_id in order_ids:
+            order = self.orders.get(order_id)
+            if order is not None and order["status"] == "open":
+                order["status"] = "cancelled"
+                order["updated_at"] = int(time.time() * 1000)
+                cancelled += 1
+        return cancelled
+    
+    def handle(self, path, body):
+        """(status, payload) for one signed call"""
+        with self.lock:
+            if path == "/exchange/v1/users/balances":
+                return 200, [
+                    {"currency": "USDT", "balance": self.balance, "locked_balance": 0.0},
+                    {"currency": "INR", "balance": 0.0, "locked_balance": 0.0}
+                ]
+            if path == "/exchange/v1/orders/create":
+                order = self.create(body)
+                if "code" in order:
+                    self.stats["rejected"] += 1
+                    return order["code"], order
+                return 200, {"orders": [order]}
+            if path == "/exchange/v1/orders/create_multiple":
+                items = body.get("orders", [])
+                if any(not str(item.get("market", "")).endswith("INR") or item.get("ecode") != "I"
+                       for item in items):
+                    # Like the real endpoint: INR markets with ecode "I" only
+                    self.stats["rejected"] += 1
+                    return 422, {"code": 422, "message": "create_multiple supports INR markets only"}
+                orders = [self.create(item) for item in items]
+                failed = [order for order in orders if "code" in order]
+                if failed:
+                    self.stats["rejected"] += len(failed)
+                    return 422, {"code": 422, "message": failed[0]["message"]}
+                return 200, {"orders": orders}
+            if path == "/exchange/v1/orders/cancel":
+                if not self.cancel([body.get("id")]):
+                    return 404, {"code": 404, "message": "Order not found or not open"}
+                return 200, {"code": 200, "message": "success", "status": 200}
+            if path == "/exchange/v1/orders/cancel_all":
+                market = body.get("market")
+                ids = [o["id"] for o in self.orders.values() if o["market"] == market]
+                return 200, {"code": 200, "message": f"{self.cancel(ids)} cancelled", "status": 200}
+            if path == "/exchange/v1/orders/active_orders":
+                market = body.get("market")
+                return 200, {"orders": [
+                    dict(o) for o in self.orders.values()
+                    if o["status"] == "open" and (not market or o["market"] == market)
+                ]}
+            if path == "/exchange/v1/orders/status":
+                order = self.orders.get(body.get("id"))
+                if order is None:
+                    return 404, {"code": 404, "message": "Order not found"}
+                return 200, dict(order)
+            if path == "/exchange/v1/orders/status_multiple":
+                return 200, [dict(self.orders[i]) for i in body.get("ids", []) if i in self.orders]
+        return 404, {"code": 404, "message": f"Unknown endpoint {path}"}
+    
+    # ==========================================
+    # AUTH AND FAULTS
+    # ==========================================
+    
+    def verify(self, headers, raw):
+        """None if the call is signed like _generate_signature(), else an error"""
+        if headers.get("X-AUTH-APIKEY") != self.api_key:
+            return "Invalid API key"
+        expected = hmac.new(self.secret, raw, hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(expected, headers.get("X-AUTH-SIGNATURE", "")):
+            return "Invalid signature"
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            return "Invalid JSON body"
+        if "timestamp" not in body:
+            return "Timestamp required"
+        return None
+    
+    def fault(self):
+        """Injected delay, then (status, payload, headers) for an injected failure or None"""
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        roll = self.rng.random()
+        if roll < self.throttle_rate:
+            self.stats["throttled"] += 1
+            return 429, {"code": 429, "message": "Too many requests"}, {"Retry-After": "1"}
+        if roll < self.throttle_rate + self.error_rate:
+            self.stats["errors"] += 1
+            return 500, {"code": 500, "message": "Mock internal error"}, {}
+        return None
+
+
+def _handler(exchange):
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+        disable_nagle_algorithm = True
+        wbufsize = -1                  # headers + body in one write
+        
+        def log_message(self, format, *args):
+            pass
+        
+        def _reply(self, status, payload, headers=None):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+        
+        def _serve(self, raw):
+            exchange.stats["requests"] += 1
+            injected = exchange.fault()
+            if injected is not None:
+                return self._reply(*injected)
+            
+            path = self.path.split("?", 1)[0]
+            if path == "/exchange/ticker":
+                return self._reply(200, exchange.ticker())
+            
+            error = exchange.verify(self.headers, raw)
+            if error is not None:
+                exchange.stats["rejected"] += 1
+                return self._reply(401, {"code": 401, "message": error})
+            self._reply(*exchange.handle(path, json.loads(raw or b"{}")))
+        
+        def do_GET(self):
+            self._serve(b"")
+        
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self._serve(self.rfile.read(length))
+    
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock CoinDCX REST exchange")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of calls answered 429")
+    parser.add_argument("--path", choices=("walk", "trend", "flat"), default="walk")
+    parser.add_argument("--volatility", type=float, default=0.0005)
+    parser.add_argument("--drift", type=float, default=0.0)
+    parser.add_argument("--tick", type=float, default=0.5, help="seconds between price steps")
+    args = parser.parse_args()
+    
+    exchange = MockExchange(
+        host=args.host, port=args.port,
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        path=args.path, volatility=args.volatility, drift=args.drift, tick_interval=args.tick
+    )
+    url = exchange.start()
+    print(f"🏦 Mock exchange on {url}")
+    try:
+        exchange.thread.join()
+    except KeyboardInterrupt:
+        exchange.stop()
+
+
+if __name__ == "__main__":
+    main()
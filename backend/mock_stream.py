@@ -0,0 +1,217 @@
+"""
+Mock CoinDCX Stream - Local stand-in websocket server
+=====================================================
+Speaks just enough Engine.IO v4 / Socket.IO to drive StreamingPriceSource
+without touching stream.coindcx.com. Standard library only.
+
+    python backend/mock_stream.py --port 8765
+
+then set STREAM_URL = "ws://127.0.0.1:8765/socket.io/?EIO=4&transport=websocket"
+and PRICE_FEED = "stream" in config.py.
+
+From Python (tests/benchmarks):
+
+    server = MockStreamServer(port=0)
+    url = server.start()            # runs in a background thread
+    server.push("B-BTC_USDT", 50000)
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import struct
+import threading
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class MockStreamServer:
+    
+    def __init__(self, host="127.0.0.1", port=8765, tick_interval=0.5,
+                 start_prices=None, volatility=0.0005, ping_interval=25):
+        self.host = host
+        self.port = port
+        self.tick_interval = tick_interval
+        self.prices = dict(start_prices or {})
+        self.volatility = volatility
+        self.ping_interval = ping_interval
+        
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.clients = {}  # writer -> set of joined markets
+        self._ready = threading.Event()
+    
+    # ==========================================
+    # LIFECYCLE
+    # ==========================================
+    
+    def start(self):
+        """Start in a background thread, return the ws:// URL"""
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self._ready.wait(5)
+        return f"ws://{self.host}:{self.port}/socket.io/?EIO=4&transport=websocket"
+    
+    def stop(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+    
+    def push(self, market, price):
+        """Send one trade tick for market to every subscribed client"""
+        self.prices[market] = price
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._broadcast, market, price)
+    
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port)
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        if self.tick_interval:
+            self.loop.create_task(self._random_walk())
+        self._ready.set()
+        self.loop.run_forever()
+    
+    # ==========================================
+    # WEBSOCKET
+    # ==========================================
+    
+    async def _handle(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+        
+        headers = {}
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        
+        key = headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+        
+        self.clients[writer] = set()
+        open_packet = {"sid": "mock", "upgrades": [], "pingInterval": self.ping_interval * 1000,
+                       "pingTimeout": 20000, "maxPayload": 1000000}
+        self._send(writer, "0" + json.dumps(open_packet))
+        pinger = self.loop.create_task(self._ping(writer))
+        
+        try:
+            while True:
+                opcode, payload = await self._read_frame(reader)
+                if opcode == 0x8:
+                    break
+                if opcode == 0x9:
+                    self._write_frame(writer, 0xA, payload)
+                elif opcode == 0x1:
+                    self._on_message(writer, payload.decode())
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            pinger.cancel()
+            self.clients.pop(writer, None)
+            writer.close()
+    
+    async def _read_frame(self, reader):
+        head = await reader.readexactly(2)
+        opcode = head[0] & 0x0F
+        masked = head[1] & 0x80
+        length = head[1] & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", await reader.readexactly(8))[0]
+        mask = await reader.readexactly(4) if masked else None
+        payload = await reader.readexactly(length)
+        if mask:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return opcode, payload
+    
+    def _write_frame(self, writer, opcode, payload):
+        length = len(payload)
+        if length < 126:
+            head = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 65536:
+            head = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            head = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        try:
+            writer.write(head + payload)
+        except Exception:
+            pass
+    
+    def _send(self, writer, text):
+        self._write_frame(writer, 0x1, text.encode())
+    
+    async def _ping(self, writer):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            self._send(writer, "2")
+    
+    # ==========================================
+    # SOCKET.IO
+    # ==========================================
+    
+    def _on_message(self, writer, message):
+        if message.startswith("40"):
+            self._send(writer, '40{"sid":"mock"}')
+        elif message.startswith("42"):
+            try:
+                event, data = json.loads(message[2:])[:2]
+            except ValueError:
+                return
+            if event == "join":
+                market = data.get("channelName", "").split("@")[0]
+                self.clients.setdefault(writer, set()).add(market)
+            elif event == "leave":
+                market = data.get("channelName", "").split("@")[0]
+                self.clients.get(writer, set()).discard(market)
+    
+    def _broadcast(self, market, price):
+        data = json.dumps({"p": str(price), "s": market})
+        packet = "42" + json.dumps(["new-trade", {"event": "new-trade", "data": data}])
+        for writer, markets in list(self.clients.items()):
+            if market in markets:
+                self._send(writer, packet)
+    
+    async def _random_walk(self):
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            subscribed = set()
+            for markets in self.clients.values():
+                subscribed |= markets
+            for market in subscribed:
+                price = self.prices.get(market, 100.0)
+                price *= 1 + random.gauss(0, self.volatility)
+                self.prices[market] = price
+                self._broadcast(market, round(price, 6))
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Mock CoinDCX socket stream")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between ticks")
+    args = parser.parse_args()
+    
+    server = MockStreamServer(args.host, args.port, tick_interval=args.interval)
+    print(f"📡 Mock stream on {server.start()}")
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Order Batching - net one tick's orders, fan the fills back out
+==============================================================
+When a sharp move fires many bookings/exits on one tick, the bot sends
+them as one batch instead of one request each:
+
+- net_orders(): market orders for the same market, side and size field
+  are merged into one order (sells sum quantity, buys sum USDT)
+- batch_plan(): which netted orders can share one create_multiple call -
+  CoinDCX takes INR markets only there, so USDT/B- orders go out one
+  request each, side by side
+- split_results(): the batched response, one result per netted order
+- fan_out(): every trade gets {"orders": [...]} for the order carrying
+  its leg, so each completion callback applies its own quantity
+
+Opposite sides of one market are not netted against each other: a buy
+sized in USDT and a sell sized in coins only offset at a fill price, and
+each trade still needs its own fill. Long and short exits on one market
+in the same tick go out as two orders.
+"""
+
+BATCH_QUOTE = "INR"  # create_multiple accepts INR markets only
+
+
+def net_orders(specs):
+    """
+    specs: place_order() kwargs (with "priority").
+    Returns (orders, owner) - owner[i] = index of the order carrying specs[i].
+    """
+    orders = []
+    owner = []
+    by_key = {}
+    
+    for spec in specs:
+        if spec.get("order_type") == "market_order":
+            size_field = "quantity" if spec.get("quantity") else "total_quantity"
+            key = (spec["market"], spec["side"], size_field)
+            i = by_key.get(key)
+            if i is not None:
+                merged = orders[i]
+                merged[size_field] += spec[size_field]
+                merged["priority"] = min(merged["priority"], spec["priority"])
+                owner.append(i)
+                continue
+            by_key[key] = len(orders)
+        owner.append(len(orders))
+        orders.append(dict(spec))
+    
+    return orders, owner
+
+
+def batch_plan(orders):
+    """(batched, single) indices into orders - batched is empty unless 2+ can share a call"""
+    batched = [i for i, order in enumerate(orders) if order["market"].endswith(BATCH_QUOTE)]
+    if len(batched) < 2:
+        batched = []
+    single = [i for i in range(len(orders)) if i not in batched]
+    return batched, single
+
+
+def split_results(result, count):
+    """One result per order from a batched response - None if it failed"""
+    if not isinstance(result, dict):
+        return None
+    placed = result.get("orders")
+    if not isinstance(placed, list) or len(placed) != count:
+        return None
+    return [{"orders": [order]} for order in placed]
+
+
+def fan_out(legs, owner, results):
+    """
+    legs: prepare() outputs, (tag, spec) or None, in item order.
+    Returns one (tag, result) or None per leg.
+    """
+    outcomes = []
+    carried = iter(owner)
+    for leg in legs:
+        if leg is None:
+            outcomes.append(None)
+            continue
+        tag = leg[0]
+        outcomes.append((tag, results[next(carried)]))
+    return outcomes
\ No newline at end of file
@@ -0,0 +1,353 @@
+"""
+Order Executor - exchange I/O off the monitor thread
+====================================================
+The monitor only decides (TP/SL/level hit) and submits a job here.
+A small worker pool sends the orders:
+
+- per-trade ordering: jobs for one trade run one after another, in
+  submit order (a booking always completes before that trade's exit)
+- in-flight dedup: a key such as (trade_id, "exit") is accepted once
+  until its job finishes, so repeated ticks can't double-send
+- completion callbacks: on_done(result, error) runs on the worker once
+  the order returns, and applies the fill to the trade
+
+submit_group() queues one job for several trades (a batched order): it
+waits in every involved lane and runs once it is first in all of them.
+
+AsyncOrderExecutor is the same contract on an asyncio loop: jobs are
+coroutine functions and a semaphore caps concurrent order calls.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from event_log import EVENT_LOG
+from config import ORDER_WORKERS, ASYNC_ORDER_CONCURRENCY
+
+
+class OrderGroup:
+    """A job shared by several trades' lanes"""
+    
+    __slots__ = ("trade_ids", "items", "job", "on_done", "arrived")
+    
+    def __init__(self, trade_ids, items, job, on_done):
+        self.trade_ids = trade_ids
+        self.items = items      # accepted (trade_id, key, payload)
+        self.job = job
+        self.on_done = on_done
+        self.arrived = 0        # lanes that reached this job
+    
+    def keys(self):
+        return [item[1] for item in self.items]
+
+
+class OrderExecutor:
+    
+    def __init__(self, workers=ORDER_WORKERS):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="orders")
+        self.workers = workers
+        self.fanout = None     # pool for run_all(), made on first use
+        self.lanes = {}        # trade_id -> deque of pending jobs
+        self.inflight = set()  # dedup keys queued or running
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.submitted = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.groups = 0
+    
+    def submit(self, trade_id, key, job, on_done=None):
+        """
+        Queue job() for trade_id. Returns False if key is already in flight.
+        job runs on a worker; its return value (or exception) goes to on_done.
+        """
+        with self.lock:
+            if key in self.inflight:
+                self.duplicates += 1
+                return False
+            self.inflight.add(key)
+            self.submitted += 1
+            start = self._enqueue(trade_id, (key, job, on_done))
+        
+        if start:
+            self.pool.submit(self._drain, trade_id)
+        return True
+    
+    def submit_group(self, items, job, on_done=None):
+        """
+        items: (trade_id, key, payload). Items whose key is in flight are
+        dropped; job(accepted) runs once it is first in every trade's lane
+        and on_done(accepted, result, error) follows. Returns accepted.
+        """
+        with self.lock:
+            accepted = []
+            for item in items:
+                if item[1] in self.inflight:
+                    self.duplicates += 1
+                    continue
+                self.inflight.add(item[1])
+                accepted.append(item)
+            if not accepted:
+                return accepted
+            self.submitted += len(accepted)
+            self.groups += 1
+            
+            trade_ids = list(dict.fromkeys(item[0] for item in accepted))
+            group = OrderGroup(trade_ids, accepted, job, on_done)
+            start = [tid for tid in trade_ids if self._enqueue(tid, group)]
+        
+        for trade_id in start:
+            self.pool.submit(self._drain, trade_id)
+        return accepted
+    
+    def _enqueue(self, trade_id, entry):
+        """Append to a lane - True if the lane is new and needs a drainer"""
+        lane = self.lanes.get(trade_id)
+        if lane is not None:
+            lane.append(entry)  # runs after the current job
+            return False
+        self.lanes[trade_id] = deque([entry])
+        return True
+    
+    def _drain(self, trade_id):
+        """Run one trade's jobs in order until its lane is empty"""
+        while True:
+            with self.lock:
+                entry = self.lanes[trade_id][0]
+                if isinstance(entry, OrderGroup):
+                    entry.arrived += 1
+                    if entry.arrived < len(entry.trade_ids):
+                        return  # parked - the last lane to arrive runs it
+            
+            if isinstance(entry, OrderGroup):
+                self._run(trade_id, entry.job, entry.on_done, entry.items)
+                with self.lock:
+                    resume = self._finish(entry.trade_ids, entry.keys())
+                for other in resume:
+                    if other != trade_id:
+                        self.pool.submit(self._drain, other)
+                if trade_id not in resume:
+                    return
+                continue
+            
+            key, job, on_done = entry
+            self._run(trade_id, job, on_done)
+            with self.lock:
+                if trade_id not in self._finish([trade_id], [key]):
+                    return
+    
+    def _run(self, trade_id, job, on_done, items=None):
+        result, error = None, None
+        try:
+            result = job() if items is None else job(items)
+        except Exception as e:
+            error = e
+            self.failed += 1
+        
+        if on_done is not None:
+            try:
+                if items is None:
+                    on_done(result, error)
+                else:
+                    on_done(items, result, error)
+            except Exception as e:
+                EVENT_LOG.message("error", f"Order callback error {trade_id}: {e}", trade_id)
+    
+    def _finish(self, trade_ids, keys):
+        """Pop the finished job from its lanes - returns lanes with more work"""
+        for key in keys:
+            self.inflight.discard(key)
+        resume = []
+        for trade_id in trade_ids:
+            lane = self.lanes[trade_id]
+            lane.popleft()
+            if lane:
+                resume.append(trade_id)
+            else:
+                del self.lanes[trade_id]
+        if not self.lanes:
+            self.idle.notify_all()
+        return resume
+    
+    def is_pending(self, key):
+        with self.lock:
+            return key in self.inflight
+    
+    def wait_idle(self, timeout=None):
+        """Block until every submitted job (and callback) has finished"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
+            while self.lanes:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.idle.wait(remaining)
+        return True
+    
+    def run_all(self, calls):
+        """
+        Run calls side by side - their results, in order. A separate pool:
+        a job waiting on its own pool could starve it.
+        """
+        if len(calls) == 1:
+            return [calls[0]()]
+        with self.lock:
+            if self.fanout is None:
+                self.fanout = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="orders-fanout")
+        futures = [self.fanout.submit(call) for call in calls]
+        return [future.result() for future in futures]
+    
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait)
+        if self.fanout is not None:
+            self.fanout.shutdown(wait=wait)
+    
+    def stats(self):
+        with self.lock:
+            return {
+                "in_flight": len(self.inflight),
+                "trades_with_orders": len(self.lanes),
+                "submitted": self.submitted,
+                "groups": self.groups,
+                "duplicates": self.duplicates,
+                "failed": self.failed
+            }
+
+
+class AsyncOrderExecutor:
+    """OrderExecutor for the asyncio engine - call submit() on the loop"""
+    
+    def __init__(self, concurrency=ASYNC_ORDER_CONCURRENCY):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.lanes = {}        # trade_id -> deque of pending jobs
+        self.inflight = set()  # dedup keys queued or running
+        self.tasks = set()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.submitted = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.groups = 0
+    
+    def submit(self, trade_id, key, job, on_done=None):
+        """Queue `await job()` for trade_id. False if key is already in flight."""
+        if key in self.inflight:
+            self.duplicates += 1
+            return False
+        self.inflight.add(key)
+        self.submitted += 1
+        if self._enqueue(trade_id, (key, job, on_done)):
+            self._start(trade_id)
+        return True
+    
+    def submit_group(self, items, job, on_done=None):
+        """submit_group() of OrderExecutor - `await job(accepted)`"""
+        accepted = []
+        for item in items:
+            if item[1] in self.inflight:
+                self.duplicates += 1
+                continue
+            self.inflight.add(item[1])
+            accepted.append(item)
+        if not accepted:
+            return accepted
+        self.submitted += len(accepted)
+        self.groups += 1
+        
+        trade_ids = list(dict.fromkeys(item[0] for item in accepted))
+        group = OrderGroup(trade_ids, accepted, job, on_done)
+        for trade_id in trade_ids:
+            if self._enqueue(trade_id, group):
+                self._start(trade_id)
+        return accepted
+    
+    def _enqueue(self, trade_id, entry):
+        lane = self.lanes.get(trade_id)
+        if lane is not None:
+            lane.append(entry)
+            return False
+        self.lanes[trade_id] = deque([entry])
+        self.idle.clear()
+        return True
+    
+    def _start(self, trade_id):
+        task = asyncio.get_running_loop().create_task(self._drain(trade_id))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+    
+    async def _drain(self, trade_id):
+        while True:
+            entry = self.lanes[trade_id][0]
+            
+            if isinstance(entry, OrderGroup):
+                entry.arrived += 1
+                if entry.arrived < len(entry.trade_ids):
+                    return  # parked - the last lane to arrive runs it
+                await self._run(trade_id, entry.job, entry.on_done, entry.items)
+                resume = self._finish(entry.trade_ids, entry.keys())
+                for other in resume:
+                    if other != trade_id:
+                        self._start(other)
+                if trade_id not in resume:
+                    return
+                continue
+            
+            key, job, on_done = entry
+            await self._run(trade_id, job, on_done)
+            if trade_id not in self._finish([trade_id], [key]):
+                return
+    
+    async def _run(self, trade_id, job, on_done, items=None):
+        result, error = None, None
+        try:
+            async with self.semaphore:
+                result = await (job() if items is None else job(items))
+        except Exception as e:
+            error = e
+            self.failed += 1
+        
+        if on_done is not None:
+            try:
+                if items is None:
+                    on_done(result, error)
+                else:
+                    on_done(items, result, error)
+            except Exception as e:
+                EVENT_LOG.message("error", f"Order callback error {trade_id}: {e}", trade_id)
+    
+    def _finish(self, trade_ids, keys):
+        for key in keys:
+            self.inflight.discard(key)
+        resume = []
+        for trade_id in trade_ids:
+            lane = self.lanes[trade_id]
+            lane.popleft()
+            if lane:
+                resume.append(trade_id)
+            else:
+                del self.lanes[trade_id]
+        if not self.lanes:
+            self.idle.set()
+        return resume
+    
+    def is_pending(self, key):
+        return key in self.inflight
+    
+    async def wait_idle(self, timeout=None):
+        try:
+            await asyncio.wait_for(self.idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def stats(self):
+        return {
+            "in_flight": len(self.inflight),
+            "trades_with_orders": len(self.lanes),
+            "submitted": self.submitted,
+            "groups": self.groups,
+            "duplicates": self.duplicates,
+            "failed": self.failed
+        }
\ No newline at end of file
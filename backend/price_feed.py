@@ -0,0 +1,261 @@
+"""
+Price Sources for TrailingBot
+=============================
+A price source calls on_prices(prices, symbols) whenever prices move:
+- prices:  object with .price(symbol) (SymbolIndex or StreamPrices)
+- symbols: set of canonical symbols that ticked, or None for "all"
+
+RestPricePoller   - polls the cached REST ticker every PRICE_CHECK_INTERVAL
+StreamingPriceSource - CoinDCX socket.io push feed, REST poller as fallback
+"""
+
+import json
+import time
+import threading
+from symbols import canonical_symbol
+from metrics import PRICE_FETCH_SECONDS, LOOP_LAG_SECONDS
+from event_log import EVENT_LOG
+from config import (
+    PRICE_CHECK_INTERVAL, STREAM_URL, STREAM_CHANNEL,
+    STREAM_EVENTS, STREAM_RECONNECT_MAX
+)
+
+try:
+    import websocket  # websocket-client
+except ImportError:
+    websocket = None
+
+
+class PriceSource:
+    """Interface every price source implements"""
+    
+    def start(self, on_prices):
+        raise NotImplementedError
+    
+    def stop(self):
+        raise NotImplementedError
+    
+    def subscribe(self, markets):
+        """Markets the bot holds trades on (push feeds join their channels)"""
+        pass
+
+
+# ==========================================
+# REST POLLING
+# ==========================================
+
+class RestPricePoller(PriceSource):
+    
+    def __init__(self, api, interval=PRICE_CHECK_INTERVAL):
+        self.api = api
+        self.interval = interval
+        self.is_running = False
+        self.thread = None
+        self.on_prices = None
+        self._stopped = None
+    
+    def start(self, on_prices):
+        if self.is_running:
+            return
+        self.on_prices = on_prices
+        self.is_running = True
+        # Fresh event per run so a quick stop/start never leaves two loops
+        self._stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(self._stopped,), name="price-monitor", daemon=True)
+        self.thread.start()
+        print("🔄 REST price polling started")
+    
+    def stop(self):
+        self.is_running = False
+        if self._stopped:
+            self._stopped.set()
+    
+    def _run(self, stopped):
+        due = None
+        while not stopped.is_set():
+            started = time.monotonic()
+            if due is not None:
+                # Time spent on the last tick delays this one
+                LOOP_LAG_SECONDS.observe(max(0.0, started - due))
+            due = started + self.interval
+            try:
+                # One ticker snapshot per tick, shared by every trade
+                index = self.api.get_symbol_index()
+                PRICE_FETCH_SECONDS.observe(time.monotonic() - started)
+                if index is not None:
+                    self.on_prices(index, None)
+                stopped.wait(self.interval)
+            except Exception as e:
+                EVENT_LOG.message("error", f"Monitor error: {e}")
+                due = None
+                stopped.wait(5)
+
+
+# ==========================================
+# STREAMING (socket.io over websocket)
+# ==========================================
+
+class StreamPrices:
+    """Latest pushed price per canonical symbol"""
+    
+    def __init__(self):
+        self.prices = {}
+    
+    def update(self, symbol, price):
+        key = canonical_symbol(symbol)
+        self.prices[key] = price
+        return key
+    
+    def price(self, symbol):
+        return self.prices.get(canonical_symbol(symbol))
+
+
+class StreamingPriceSource(PriceSource):
+    """
+    Minimal Engine.IO v4 / Socket.IO client for the CoinDCX stream.
+    Evaluates only the symbol that just ticked. While the socket is down
+    the fallback source (REST poller) keeps trades protected.
+    """
+    
+    def __init__(self, url=STREAM_URL, fallback=None,
+                 channel=STREAM_CHANNEL, events=STREAM_EVENTS):
+        self.url = url
+        self.fallback = fallback
+        self.channel = channel
+        self.events = set(events)
+        
+        self.prices = StreamPrices()
+        self.markets = set()
+        self.on_prices = None
+        self.is_running = False
+        self.connected = False
+        self.ws = None
+        self.thread = None
+        self._lock = threading.Lock()
+    
+    def start(self, on_prices):
+        if self.is_running:
+            return
+        self.on_prices = on_prices
+        self.is_running = True
+        
+        if websocket is None:
+            print("⚠️ websocket-client not installed - using REST fallback")
+            self._use_fallback(True)
+            return
+        
+        # Cover the gap until the socket is joined
+        self._use_fallback(True)
+        self.thread = threading.Thread(target=self._run, name="price-stream", daemon=True)
+        self.thread.start()
+        print("📡 Streaming price feed started")
+    
+    def stop(self):
+        self.is_running = False
+        self._use_fallback(False)
+        if self.ws:
+            try:
+                self.ws.close()
+            except Exception:
+                pass
+    
+    def subscribe(self, markets):
+        with self._lock:
+            new = [m for m in markets if m not in self.markets]
+            self.markets.update(new)
+        if self.connected:
+            for market in new:
+                self._join(market)
+    
+    def _use_fallback(self, enabled):
+        if not self.fallback:
+            return
+        if enabled:
+            self.fallback.start(self.on_prices)
+        else:
+            self.fallback.stop()
+    
+    def _run(self):
+        delay = 1
+        while self.is_running:
+            started = time.time()
+            self.ws = websocket.WebSocketApp(
+                self.url,
+                on_message=self._on_message,
+                on_error=self._on_error
+            )
+            self.ws.run_forever()
+            self._on_close(self.ws)
+            
+            if not self.is_running:
+                break
+            # Reset backoff after a connection that stayed up a while
+            if time.time() - started > 30:
+                delay = 1
+            time.sleep(delay)
+            delay = min(delay * 2, STREAM_RECONNECT_MAX)
+    
+    def _join(self, market):
+        payload = {"channelName": self.channel.format(market=market)}
+        self._send(f'42{json.dumps(["join", payload])}')
+    
+    def _send(self, message):
+        try:
+            self.ws.send(message)
+        except Exception as e:
+            EVENT_LOG.message("error", f"Stream send error: {e}")
+    
+    def _on_message(self, ws, message):
+        if message.startswith('42'):
+            self._on_event(message[2:])
+        elif message == '2':
+            self._send('3')  # Engine.IO ping -> pong
+        elif message.startswith('40'):
+            # Socket.IO namespace joined
+            self.connected = True
+            with self._lock:
+                markets = list(self.markets)
+            for market in markets:
+                self._join(market)
+            self._use_fallback(False)
+            EVENT_LOG.message("info", "📡 Stream connected")
+        elif message.startswith('0'):
+            self._send('40')  # Engine.IO open -> connect namespace
+        elif message.startswith('41'):
+            ws.close()
+    
+    def _on_event(self, raw):
+        try:
+            event, data = json.loads(raw)[:2]
+        except (ValueError, TypeError):
+            return
+        if event not in self.events:
+            return
+        
+        if isinstance(data, dict) and isinstance(data.get("data"), str):
+            data = json.loads(data["data"])
+        if not isinstance(data, dict):
+            return
+        
+        symbol = data.get("s") or data.get("market")
+        price = data.get("p") or data.get("last_price")
+        if not symbol or price is None:
+            return
+        
+        key = self.prices.update(symbol, float(price))
+        try:
+            self.on_prices(self.prices, {key})
+        except Exception as e:
+            EVENT_LOG.message("error", f"Stream tick error: {e}")
+    
+    def _on_error(self, ws, error):
+        EVENT_LOG.message("error", f"Stream error: {error}")
+    
+    def _on_close(self, ws, *args):
+        was_connected = self.connected
+        self.connected = False
+        if not self.is_running:
+            return
+        if was_connected:
+            EVENT_LOG.message("warning", "📡 Stream disconnected - REST fallback active")
+        self._use_fallback(True)
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Profiling - on-demand stack sampling and slow-tick capture
+==========================================================
+SamplingProfiler walks every thread's stack (sys._current_frames) every
+few milliseconds for a fixed window and returns collapsed stacks, one
+"thread;file:func;file:func count" line per distinct stack - the input
+format of flamegraph.pl and speedscope. Nothing runs between captures.
+
+SlowTickRecorder keeps a bounded ring of monitor ticks that took longer
+than SLOW_TICK_SECONDS, with the tick's phases (fetch, per-symbol
+publish and evaluate, batch hand-off) and its slowest trade evaluations.
+It ships off (SLOW_TICK_SECONDS = None): begin() returns None and the
+tick skips every timing call until POST /api/admin/slow-ticks sets a
+threshold.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from config import PROFILE_INTERVAL, PROFILE_MAX_SECONDS, SLOW_TICK_SECONDS, SLOW_TICK_RING
+
+# Leaf frames of a thread parked with nothing to do
+IDLE_FILES = ("threading.py", "selectors.py", "queue.py", "socketserver.py")
+
+
+def _frame_name(code):
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    
+    def __init__(self, interval=PROFILE_INTERVAL, max_seconds=PROFILE_MAX_SECONDS):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.lock = threading.Lock()  # one capture at a time
+    
+    def capture(self, seconds, interval=None, threads=None, idle=False):
+        """
+        Sample for `seconds` and return (collapsed stacks text, samples).
+        threads: substrings of thread names to keep (None = all)
+        idle:    keep threads parked in wait/select/queue.get
+        """
+        if not self.lock.acquire(blocking=False):
+            return None
+        try:
+            seconds = min(float(seconds), self.max_seconds)
+            return self._sample(seconds, interval or self.interval, threads, idle)
+        finally:
+            self.lock.release()
+    
+    def _sample(self, seconds, interval, threads, idle):
+        stacks = Counter()
+        me = threading.get_ident()
+        names = {}
+        samples = 0
+        deadline = time.monotonic() + seconds
+        
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            frames = sys._current_frames()
+            if len(names) != len(frames):
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == me:
+                    continue
+                name = names.get(ident, str(ident))
+                if threads and not any(part in name for part in threads):
+                    continue
+                if not idle and os.path.basename(frame.f_code.co_filename) in IDLE_FILES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                stack.append(name)
+                stacks[";".join(reversed(stack))] += 1
+            del frames
+            samples += 1
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        
+        text = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        return text, samples
+
+
+# ==========================================
+# SLOW TICKS
+# ==========================================
+
+class TickTrace:
+    """Timings for one tick - only allocated while the recorder is on"""
+    
+    __slots__ = ("started", "phases", "calls")
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []  # (phase, symbol, seconds, count)
+        self.calls = []   # (seconds, phase, trade_id)
+    
+    def phase(self, name, seconds, symbol=None, count=None):
+        self.phases.append((name, symbol, seconds, count))
+    
+    def call(self, name, trade_id, seconds):
+        self.calls.append((seconds, name, trade_id))
+
+
+class SlowTickRecorder:
+    
+    def __init__(self, threshold=SLOW_TICK_SECONDS, size=SLOW_TICK_RING, slowest=10):
+        self.threshold = threshold
+        self.ring = deque(maxlen=size)
+        self.slowest = slowest
+        self.recorded = 0
+        self.lock = threading.Lock()
+    
+    def begin(self):
+        """A TickTrace, or None when recording is off"""
+        if self.threshold is None:
+            return None
+        return TickTrace()
+    
+    def finish(self, trace, covered):
+        elapsed = time.perf_counter() - trace.started
+        if self.threshold is None or elapsed < self.threshold:
+            return
+        entry = {
+            "at": datetime.now().isoformat(timespec="milliseconds"),
+            "total_ms": round(elapsed * 1000, 3),
+            "trades": covered,
+            "phases": [
+                {"phase": name, "symbol": symbol, "ms": round(seconds * 1000, 3), "count": count}
+                for name, symbol, seconds, count in trace.phases
+            ],
+            "slowest": [
+                {"phase": name, "trade_id": trade_id, "ms": round(seconds * 1000, 3)}
+                for seconds, name, trade_id in sorted(trace.calls, reverse=True)[:self.slowest]
+            ]
+        }
+        with self.lock:
+            self.recorded += 1
+            self.ring.append(entry)
+    
+    def configure(self, threshold):
+        """Threshold in seconds - None turns recording off"""
+        self.threshold = threshold
+    
+    def clear(self):
+        with self.lock:
+            self.ring.clear()
+    
+    def stats(self):
+        with self.lock:
+            ticks = list(reversed(self.ring))  # newest first
+        return {
+            "threshold_ms": None if self.threshold is None else round(self.threshold * 1000, 3),
+            "recorded": self.recorded,
+            "ticks": ticks
+        }
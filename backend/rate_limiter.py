@@ -0,0 +1,272 @@
+"""
+Rate Limiter - token buckets per endpoint class, priority lanes
+===============================================================
+Every exchange call takes a token from its class bucket and from the
+shared bucket before it is sent:
+
+- "public"  market data (ticker)
+- "orders"  create / cancel
+- "account" balances, open orders, order status
+
+Waiting calls are served in priority order (PRIORITY_EXIT first), so an
+SL exit never queues behind a balance or ticker refresh. A waiter whose
+own class is empty does not hold up other classes. A call that waits
+longer than RATE_LIMIT_MAX_WAIT (or is cancelled) leaves the queue and
+raises RateLimitTimeout / CancelledError.
+
+observe() adapts to responses: a 429 (or Retry-After) pauses the class
+and halves its rate, X-RateLimit-Remaining caps the local tokens, and
+successes slowly restore the configured rate.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from bisect import insort
+from config import RATE_LIMITS, RATE_LIMIT_GLOBAL, RATE_LIMIT_MAX_WAIT
+
+PRIORITY_EXIT = 0     # SL/TP exits, manual closes
+PRIORITY_ORDER = 1    # entries, bookings, cancels
+PRIORITY_ACCOUNT = 2  # balances, open orders
+PRIORITY_MARKET = 3   # ticker refreshes
+
+# Order endpoints that only read - they share the account budget, not the order one
+ORDER_READS = (
+    "/exchange/v1/orders/active_orders",
+    "/exchange/v1/orders/status",
+    "/exchange/v1/orders/status_multiple"
+)
+
+DEFAULT_PRIORITY = {"orders": PRIORITY_ORDER, "account": PRIORITY_ACCOUNT, "public": PRIORITY_MARKET}
+
+
+def endpoint_class(endpoint):
+    """Bucket for an API path"""
+    if endpoint.startswith("/exchange/v1/orders/") and endpoint not in ORDER_READS:
+        return "orders"
+    if endpoint.startswith("/exchange/v1/"):
+        return "account"
+    return "public"
+
+
+class TokenBucket:
+    
+    def __init__(self, rate, burst):
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+    
+    def refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+    
+    def wait_time(self, now):
+        """Seconds until one token is available (0 = now)"""
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+    
+    def take(self):
+        self.tokens -= 1
+    
+    def throttle(self, retry_after, now):
+        """Exchange said slow down: pause, empty, halve the rate"""
+        self.paused_until = max(self.paused_until, now + retry_after)
+        self.tokens = 0.0
+        self.rate = max(self.base_rate * 0.1, self.rate * 0.5)
+    
+    def recover(self):
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+
+
+class RateLimitTimeout(Exception):
+    pass
+
+
+class RateLimiter:
+    
+    def __init__(self, limits=RATE_LIMITS, global_limit=RATE_LIMIT_GLOBAL, max_wait=RATE_LIMIT_MAX_WAIT):
+        self.max_wait = max_wait
+        self.buckets = {kind: TokenBucket(*limit) for kind, limit in limits.items()}
+        self.shared = TokenBucket(*global_limit) if global_limit else None
+        self.waiting = []  # sorted tickets: [priority, seq, kind]
+        self.seq = itertools.count()
+        self.cond = threading.Condition()
+        self.metrics = {
+            kind: {"acquired": 0, "throttled": 0, "timeouts": 0, "wait_total": 0.0, "wait_max": 0.0}
+            for kind in self.buckets
+        }
+    
+    # ==========================================
+    # ACQUIRE
+    # ==========================================
+    
+    def _enqueue(self, kind, priority):
+        if priority is None:
+            priority = DEFAULT_PRIORITY.get(kind, PRIORITY_MARKET)
+        ticket = [priority, next(self.seq), kind]
+        insort(self.waiting, ticket)
+        return ticket
+    
+    def _ready(self, kind, now):
+        wait = self.buckets[kind].wait_time(now)
+        if self.shared is not None:
+            wait = max(wait, self.shared.wait_time(now))
+        return wait
+    
+    def _poll(self, ticket, now):
+        """0 if ticket got its tokens, else seconds to wait before retrying"""
+        for bucket in self.buckets.values():
+            bucket.refill(now)
+        if self.shared is not None:
+            self.shared.refill(now)
+        
+        for ahead in self.waiting:
+            if ahead is ticket:
+                break
+            # Higher-priority call that can go now goes first
+            if self._ready(ahead[2], now) == 0:
+                return 0.005
+        
+        wait = self._ready(ticket[2], now)
+        if wait > 0:
+            return wait
+        
+        self.buckets[ticket[2]].take()
+        if self.shared is not None:
+            self.shared.take()
+        self.waiting.remove(ticket)
+        return 0.0
+    
+    def _abandon(self, ticket):
+        """Drop a ticket that gave up - with self.cond held"""
+        if ticket in self.waiting:
+            self.waiting.remove(ticket)
+            self.cond.notify_all()  # calls queued behind it may be ready
+    
+    def _timed_out(self, ticket, start):
+        self._abandon(ticket)
+        self.metrics[ticket[2]]["timeouts"] += 1
+        return RateLimitTimeout(f"No {ticket[2]} rate-limit token after {time.monotonic() - start:.1f}s")
+    
+    def _record(self, kind, waited):
+        m = self.metrics[kind]
+        m["acquired"] += 1
+        m["wait_total"] += waited
+        if waited > m["wait_max"]:
+            m["wait_max"] = waited
+    
+    def acquire(self, kind, priority=None, timeout=None):
+        """
+        Block until a call of this class may be sent - returns seconds waited.
+        Raises RateLimitTimeout after timeout (default max_wait) seconds.
+        """
+        start = time.monotonic()
+        deadline = start + (self.max_wait if timeout is None else timeout)
+        with self.cond:
+            ticket = self._enqueue(kind, priority)
+            while True:
+                now = time.monotonic()
+                wait = self._poll(ticket, now)
+                if wait == 0:
+                    break
+                if now >= deadline:
+                    raise self._timed_out(ticket, start)
+                self.cond.wait(min(wait, deadline - now))
+            waited = time.monotonic() - start
+            self._record(kind, waited)
+            self.cond.notify_all()
+        return waited
+    
+    async def acquire_async(self, kind, priority=None, timeout=None):
+        """acquire() for the asyncio client - sleeps instead of blocking"""
+        start = time.monotonic()
+        deadline = start + (self.max_wait if timeout is None else timeout)
+        with self.cond:
+            ticket = self._enqueue(kind, priority)
+        try:
+            while True:
+                with self.cond:
+                    now = time.monotonic()
+                    wait = self._poll(ticket, now)
+                    if wait == 0:
+                        waited = now - start
+                        self._record(kind, waited)
+                        self.cond.notify_all()
+                        return waited
+                    if now >= deadline:
+                        raise self._timed_out(ticket, start)
+                await asyncio.sleep(min(wait, 0.05, deadline - now))
+        finally:
+            # Cancelled mid-sleep: never leave an orphan ahead of other callers
+            with self.cond:
+                self._abandon(ticket)
+    
+    # ==========================================
+    # ADAPT TO THE EXCHANGE
+    # ==========================================
+    
+    def observe(self, kind, status, headers=None):
+        """Feed back a response's status and rate-limit headers"""
+        headers = headers or {}
+        now = time.monotonic()
+        with self.cond:
+            bucket = self.buckets[kind]
+            retry_after = _header_float(headers, "Retry-After")
+            remaining = _header_float(headers, "X-RateLimit-Remaining")
+            reset = _header_float(headers, "X-RateLimit-Reset")
+            
+            if status == 429:
+                self.metrics[kind]["throttled"] += 1
+                bucket.throttle(retry_after if retry_after is not None else 1.0, now)
+            elif remaining is not None:
+                bucket.refill(now)
+                bucket.tokens = min(bucket.tokens, remaining)
+                if remaining <= 0 and reset:
+                    # Reset may be epoch seconds or seconds from now
+                    delay = reset - time.time() if reset > 1e9 else reset
+                    bucket.paused_until = max(bucket.paused_until, now + max(0.0, delay))
+            elif status < 400:
+                bucket.recover()
+            self.cond.notify_all()
+    
+    def stats(self):
+        now = time.monotonic()
+        with self.cond:
+            depth = {kind: 0 for kind in self.buckets}
+            for _, _, kind in self.waiting:
+                depth[kind] += 1
+            result = {}
+            for kind, bucket in self.buckets.items():
+                bucket.refill(now)
+                m = self.metrics[kind]
+                result[kind] = {
+                    "queue_depth": depth[kind],
+                    "rate": round(bucket.rate, 2),
+                    "tokens": round(bucket.tokens, 2),
+                    "paused_for": round(max(0.0, bucket.paused_until - now), 3),
+                    "acquired": m["acquired"],
+                    "throttled": m["throttled"],
+                    "timeouts": m["timeouts"],
+                    "wait_avg_ms": round(m["wait_total"] / m["acquired"] * 1000, 2) if m["acquired"] else 0.0,
+                    "wait_max_ms": round(m["wait_max"] * 1000, 2)
+                }
+            return result
+
+
+def _header_float(headers, name):
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
\ No newline at end of file
@@ -0,0 +1,290 @@
+"""
+Order Reconciler - fills confirmed in bulk, not per trade
+=========================================================
+Every order the bot places (entries, bookings, exits) is indexed here
+by order id, with the trade legs it belongs to. Once per
+RECONCILE_INTERVAL a pass diffs the index against the exchange:
+
+- active_orders, one call per market with tracked orders: orders still
+  open - a changed remaining_quantity is a partial fill
+- status_multiple for tracked ids no longer open (RECONCILE_BATCH ids
+  per call): their final state - filled, cancelled or rejected
+
+Only orders whose fill changed are reported, as on_update(trade_id,
+kind, delta, order, final) where delta is the change in filled quantity
+for that leg. Until an order is final, only fills beyond what the bot
+already assumed count - a market order acted on as filled isn't undone
+because it still shows as open. The cost of a pass is one request per market plus one per
+batch of orders that just finished - not one per trade. Cancels asked
+for with cancel() go out at the start of the next pass.
+
+An ack that already reports a final state (market orders often do) is
+applied on the spot and never polled.
+"""
+
+import asyncio
+import threading
+import time
+from event_log import EVENT_LOG
+from config import RECONCILE_INTERVAL, RECONCILE_BATCH, RECONCILE_MAX_MISSES
+
+FINAL_STATUSES = ("filled", "cancelled", "rejected", "partially_cancelled")
+
+
+def order_list(result):
+    """Order dicts from a list or {"orders": [...]} response - None on an error"""
+    if isinstance(result, list):
+        return result
+    if isinstance(result, dict) and isinstance(result.get("orders"), list):
+        return result["orders"]
+    return None
+
+
+def filled_fraction(order):
+    """Share of the order filled so far, 0..1"""
+    if order.get("status") == "filled":
+        return 1.0
+    total = float(order.get("total_quantity") or 0)
+    if total <= 0:
+        return 0.0
+    remaining = float(order.get("remaining_quantity") or 0)
+    return max(0.0, min(1.0, (total - remaining) / total))
+
+
+class TrackedOrder:
+    """One exchange order and the trade legs sharing it (netted batches)"""
+    
+    __slots__ = ("order_id", "market", "legs", "misses")
+    
+    def __init__(self, order_id, market):
+        self.order_id = order_id
+        self.market = market
+        self.legs = []   # [trade_id, kind, quantity, fraction already applied]
+        self.misses = 0  # passes in a row the exchange didn't return it
+
+
+class OrderReconciler:
+    
+    def __init__(self, api, on_update, interval=RECONCILE_INTERVAL, batch=RECONCILE_BATCH,
+                 max_misses=RECONCILE_MAX_MISSES):
+        self.api = api
+        self.on_update = on_update
+        self.interval = interval
+        self.batch = batch
+        self.max_misses = max_misses
+        self.orders = {}      # order_id -> TrackedOrder
+        self.cancels = set()  # order ids to cancel on the next pass
+        self.lock = threading.Lock()
+        self.thread = None
+        self._stopped = threading.Event()
+        self._wake = threading.Event()
+        self._async_wake = None
+        self.passes = 0
+        self.requests = 0
+        self.updates = 0
+        self.dropped = 0
+        self.last_pass = None  # seconds
+    
+    # ==========================================
+    # INDEX
+    # ==========================================
+    
+    def track(self, order, trade_id, kind, quantity, applied=0.0):
+        """
+        Follow order (an ack or status dict) for one trade leg.
+        applied: the fill already assumed by the bot (1.0 = acted on as filled)
+        """
+        order_id = order.get("id")
+        if not order_id:
+            return
+        leg = [trade_id, kind, quantity, applied]
+        if order.get("status") in FINAL_STATUSES:
+            self._apply(order, [leg], True)
+            return
+        with self.lock:
+            tracked = self.orders.get(order_id)
+            if tracked is None:
+                tracked = self.orders[order_id] = TrackedOrder(order_id, order.get("market"))
+            tracked.legs.append(leg)
+    
+    def cancel(self, order_id):
+        """Cancel a tracked order on the next pass - False if it isn't open"""
+        with self.lock:
+            if order_id not in self.orders:
+                return False
+            self.cancels.add(order_id)
+        self._wake.set()
+        if self._async_wake is not None:
+            self._async_wake.set()
+        return True
+    
+    def _apply(self, order, legs, final):
+        """Report each leg's fill change since it was last reported"""
+        fraction = filled_fraction(order)
+        for leg in legs:
+            trade_id, kind, quantity, applied = leg
+            if not final and fraction <= applied:
+                continue
+            leg[3] = fraction
+            self.updates += 1
+            try:
+                self.on_update(trade_id, kind, quantity * (fraction - applied), order, final)
+            except Exception as e:
+                EVENT_LOG.message("error", f"Order update error {trade_id}: {e}", trade_id)
+    
+    # ==========================================
+    # PASS
+    # ==========================================
+    
+    def _plan(self):
+        """(cancels, {market: [TrackedOrder]}) for this pass"""
+        with self.lock:
+            cancels, self.cancels = self.cancels, set()
+            markets = {}
+            for tracked in self.orders.values():
+                markets.setdefault(tracked.market, []).append(tracked)
+        return cancels, markets
+    
+    def _diff_active(self, tracked, result):
+        """Apply partial fills of open orders - the tracked orders no longer open"""
+        open_orders = order_list(result)
+        if open_orders is None:
+            return []  # failed call: try the market again next pass
+        by_id = {order.get("id"): order for order in open_orders}
+        gone = []
+        for entry in tracked:
+            order = by_id.get(entry.order_id)
+            if order is None:
+                gone.append(entry)
+                continue
+            entry.misses = 0
+            self._apply(order, entry.legs, False)
+        return gone
+    
+    def _finish(self, gone, result):
+        """Apply final states from status_multiple"""
+        orders = order_list(result)
+        if orders is None:
+            return
+        by_id = {order.get("id"): order for order in orders}
+        for entry in gone:
+            order = by_id.get(entry.order_id)
+            if order is None or order.get("status") not in FINAL_STATUSES:
+                # Not listed as open nor finished yet - look again next pass
+                entry.misses += 1
+                if entry.misses >= self.max_misses:
+                    self._forget(entry)
+                    self.dropped += 1
+                    EVENT_LOG.message("warning", f"Order {entry.order_id} not found on the exchange - no longer tracked")
+                continue
+            self._forget(entry)
+            self._apply(order, entry.legs, True)
+    
+    def _forget(self, entry):
+        with self.lock:
+            self.orders.pop(entry.order_id, None)
+            self.cancels.discard(entry.order_id)
+    
+    def _chunks(self, gone):
+        for i in range(0, len(gone), self.batch):
+            yield gone[i:i + self.batch]
+    
+    def _done(self, started, requests):
+        self.passes += 1
+        self.requests += requests
+        self.last_pass = time.perf_counter() - started
+    
+    def reconcile(self):
+        """One pass with a blocking API client"""
+        started = time.perf_counter()
+        cancels, markets = self._plan()
+        if not markets:
+            return
+        for order_id in cancels:
+            self.api.cancel_order(order_id)
+        
+        gone = []
+        for market, tracked in markets.items():
+            gone.extend(self._diff_active(tracked, self.api.get_active_orders(market)))
+        chunks = list(self._chunks(gone))
+        for chunk in chunks:
+            self._finish(chunk, self.api.get_orders_status([entry.order_id for entry in chunk]))
+        self._done(started, len(cancels) + len(markets) + len(chunks))
+    
+    async def reconcile_async(self):
+        """One pass with AsyncCoinDCXAPI - every call of a step side by side"""
+        started = time.perf_counter()
+        cancels, markets = self._plan()
+        if not markets:
+            return
+        await asyncio.gather(*(self.api.cancel_order(order_id) for order_id in cancels))
+        
+        results = await asyncio.gather(*(self.api.get_active_orders(market) for market in markets))
+        gone = []
+        for tracked, result in zip(markets.values(), results):
+            gone.extend(self._diff_active(tracked, result))
+        chunks = list(self._chunks(gone))
+        results = await asyncio.gather(
+            *(self.api.get_orders_status([entry.order_id for entry in chunk]) for chunk in chunks)
+        )
+        for chunk, result in zip(chunks, results):
+            self._finish(chunk, result)
+        self._done(started, len(cancels) + len(markets) + len(chunks))
+    
+    # ==========================================
+    # LOOP
+    # ==========================================
+    
+    def start(self):
+        """Background thread for the blocking client - idle while nothing is tracked"""
+        with self.lock:
+            if self.thread is not None:
+                return
+            self._stopped.clear()
+            self.thread = threading.Thread(target=self._run, name="order-reconciler", daemon=True)
+            self.thread.start()
+    
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self.reconcile()
+            except Exception as e:
+                EVENT_LOG.message("error", f"Reconcile error: {e}")
+    
+    async def run_async(self):
+        """Loop task for AsyncTrailingBot"""
+        self._async_wake = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._async_wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._async_wake.clear()
+            try:
+                await self.reconcile_async()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                EVENT_LOG.message("error", f"Reconcile error: {e}")
+    
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        if self.thread is not None:
+            self.thread.join(timeout=self.interval + 1)
+            self.thread = None
+    
+    def stats(self):
+        return {
+            "tracked": len(self.orders),
+            "pending_cancels": len(self.cancels),
+            "passes": self.passes,
+            "requests": self.requests,
+            "updates": self.updates,
+            "dropped": self.dropped,
+            "last_pass_ms": None if self.last_pass is None else round(self.last_pass * 1000, 3)
+        }
@@ -2,12 +2,20 @@
 CoinDCX Trading Bot - Server
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 import os
 
 from coindcx_api import CoinDCXAPI
+from rate_limiter import RateLimiter
 from trailing_bot import TrailingBot
+from journal import TradeJournal
+from event_stream import EventBroadcaster
+from metrics import REGISTRY
+from profiler import SamplingProfiler
+from event_log import EVENT_LOG
+from static_assets import StaticAssets, StaticMiddleware
+from config import TRADE_LOG_PAGE, TRADES_PAGE, JOURNAL_ENABLED, BOT_ENGINE, FUTURES_PAIRS, EVENT_PRICE_INTERVAL, STATIC_DIR
 
 # Get PORT from Railway (important!)
 PORT = int(os.environ.get("PORT", 5000))
@@ -15,8 +23,93 @@ PORT = int(os.environ.get("PORT", 5000))
 app = Flask(__name__, static_folder='../frontend')
 CORS(app)
 
-api = CoinDCXAPI()
-bot = TrailingBot()
+limiter = RateLimiter()  # one budget for every client using this API key
+api = CoinDCXAPI(limiter=limiter)
+journal = TradeJournal() if JOURNAL_ENABLED else None
+events = EventBroadcaster()  # bot events -> every dashboard tab
+profiler = SamplingProfiler()
+
+if BOT_ENGINE == "asyncio":
+    # Monitor + orders on one event loop; routes submit commands to it
+    from async_bot import AsyncTrailingBot, BotEngine
+    from async_api import AsyncCoinDCXAPI
+    engine = BotEngine(AsyncTrailingBot(socketio=events, api=AsyncCoinDCXAPI(limiter=limiter), journal=journal)).start()
+    bot = engine.bot
+else:
+    engine = None
+    bot = TrailingBot(socketio=events, api=api, journal=journal)
+
+
+def bot_call(fn, *args):
+    """Run a bot method - on the engine loop when BOT_ENGINE is asyncio"""
+    if engine is not None:
+        return engine.call(fn, *args)
+    return fn(*args)
+
+
+def ticker_read(method, *args):
+    """
+    Ticker/price read from the bot's own snapshot, so routes and bot share
+    one upstream fetch - the engine's async client when BOT_ENGINE is asyncio
+    """
+    return bot_call(getattr(bot.api, method), *args)
+
+
+def pair_prices():
+    """Dashboard price tiles - one ticker read shared by every tab"""
+    index = ticker_read("get_symbol_index")
+    if index is None:
+        return None
+    prices = {}
+    for pair in FUTURES_PAIRS:
+        price = index.price(pair["symbol"])
+        if price:
+            prices[pair["symbol"]] = price
+    return prices
+
+events.feed("prices", pair_prices, EVENT_PRICE_INTERVAL)
+
+@REGISTRY.collect
+def runtime_metrics():
+    """Counters the components already keep, read at scrape time"""
+    cache = bot_call(bot.api.ticker_stats)  # the snapshot the bot and ticker routes read
+    limits = limiter.stats()
+    orders = bot.orders.stats()
+    stream = events.stats()
+    logs = EVENT_LOG.stats()
+    reconcile = bot.reconciler.stats()
+    return [
+        ("ticker_cache_lookups_total", "counter", "Ticker cache lookups by result",
+         [({"result": name}, cache[name]) for name in ("hits", "stale_hits", "misses")]),
+        ("ticker_cache_age_seconds", "gauge", "Age of the cached ticker snapshot",
+         [({}, cache["age"])]),
+        ("rate_limit_queue_depth", "gauge", "Calls waiting for a rate-limit token",
+         [({"kind": kind}, s["queue_depth"]) for kind, s in limits.items()]),
+        ("rate_limit_throttled_total", "counter", "429 responses per endpoint class",
+         [({"kind": kind}, s["throttled"]) for kind, s in limits.items()]),
+        ("orders_in_flight", "gauge", "Order jobs queued or running",
+         [({}, orders["in_flight"])]),
+        ("orders_failed_total", "counter", "Order jobs that raised",
+         [({}, orders["failed"])]),
+        ("bot_active_trades", "gauge", "Open trades being monitored",
+         [({}, len(bot.active_trades))]),
+        ("bot_exit_retries", "gauge", "Closed trades whose exit order failed and is waiting for a retry",
+         [({}, len(bot.exit_retries))]),
+        ("bot_pending_entries", "gauge", "LIMIT entries waiting for a fill",
+         [({}, len(bot.pending_trades))]),
+        ("orders_tracked", "gauge", "Orders the reconciler is following",
+         [({}, reconcile["tracked"])]),
+        ("reconcile_requests_total", "counter", "Signed requests made by reconciliation passes",
+         [({}, reconcile["requests"])]),
+        ("event_clients", "gauge", "Connected dashboard streams",
+         [({}, stream["clients"])]),
+        ("events_dropped_total", "counter", "Price updates dropped for slow clients",
+         [({}, stream["dropped"])]),
+        ("log_queue_pending", "gauge", "Log records waiting for the writer thread",
+         [({}, logs["pending"])]),
+        ("log_records_dropped_total", "counter", "Log records dropped on a full queue",
+         [({}, logs["dropped"])]),
+    ]
 
 print("🤖 CoinDCX Trading Bot Starting...")
 
@@ -24,13 +117,18 @@ print("🤖 CoinDCX Trading Bot Starting...")
 # STATIC FILES
 # ==========================================
 
+# Known files are answered from memory before Flask sees the request;
+# the routes below only serve files added after startup
+assets = StaticAssets(STATIC_DIR)
+app.wsgi_app = StaticMiddleware(app.wsgi_app, assets)
+
 @app.route('/')
 def serve_frontend():
-    return send_from_directory('../frontend', 'index.html')
+    return send_from_directory(STATIC_DIR, 'index.html')
 
 @app.route('/<path:path>')
 def serve_static(path):
-    return send_from_directory('../frontend', path)
+    return send_from_directory(STATIC_DIR, path)
 
 # ==========================================
 # API ENDPOINTS
@@ -38,11 +136,11 @@ def serve_static(path):
 
 @app.route('/api/ticker', methods=['GET'])
 def get_ticker():
-    return jsonify(api.get_ticker())
+    return jsonify(ticker_read("get_ticker"))
 
 @app.route('/api/price/<market>', methods=['GET'])
 def get_price(market):
-    price = api.get_price(market)
+    price = ticker_read("get_price", market)
     return jsonify({"market": market, "price": price})
 
 @app.route('/api/balances', methods=['GET'])
@@ -53,31 +151,145 @@ def get_balances():
 def start_bot_api():
     try:
         data = request.json
-        result = bot.start_trade(data)
+        result = bot_call(bot.start_trade, data)
         return jsonify(result)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/bot/stop/<trade_id>', methods=['POST'])
 def stop_bot_api(trade_id):
-    result = bot.close_trade(trade_id)
+    result = bot_call(bot.close_trade, trade_id)
     return jsonify(result)
 
+def versioned(payload, version):
+    """JSON response tagged with a trade version (ETag)"""
+    response = jsonify(payload)
+    response.set_etag(str(version), weak=True)
+    return response
+
+def not_modified(version):
+    """304 if the client already holds this version - checked before building"""
+    if request.if_none_match.contains_weak(str(version)):
+        response = app.response_class(status=304)
+        response.set_etag(str(version), weak=True)
+        return response
+    return None
+
 @app.route('/api/bot/trades', methods=['GET'])
 def get_trades():
-    return jsonify(bot.get_all_trades())
+    """
+    All trades (list), or with any of ?status=active|closed, ?offset=,
+    ?limit=, ?since_version= a page: {version, trades, ...}. since_version
+    returns only changed trades and fields. ETag / If-None-Match -> 304.
+    """
+    cached = not_modified(bot.trades_version)
+    if cached is not None:
+        return cached
+    
+    if not request.args:
+        version = bot.trades_version
+        return versioned(bot_call(bot.get_all_trades), version)
+    
+    status = request.args.get('status')
+    if status not in (None, 'active', 'closed'):
+        return jsonify({"error": "status must be active or closed"}), 400
+    since_version = request.args.get('since_version', type=int)
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = max(1, min(request.args.get('limit', TRADES_PAGE, type=int), 1000))
+    
+    page = bot_call(bot.query_trades, status, since_version, offset, limit)
+    return versioned(page, page["version"])
 
 @app.route('/api/bot/status/<trade_id>', methods=['GET'])
 def get_status(trade_id):
-    trade = bot.get_trade_status(trade_id)
+    trade = bot_call(bot.get_trade_status, trade_id)
     if trade:
-        return jsonify(trade)
+        cached = not_modified(trade["version"])
+        if cached is not None:
+            return cached
+        return versioned(trade, trade["version"])
     return jsonify({"error": "Not found"}), 404
 
+@app.route('/api/bot/logs/<trade_id>', methods=['GET'])
+def get_logs(trade_id):
+    since = request.args.get('since', 0, type=int)
+    limit = request.args.get('limit', TRADE_LOG_PAGE, type=int)
+    logs = bot_call(bot.get_trade_logs, trade_id, since, max(1, min(limit, 1000)))
+    if logs is None:
+        return jsonify({"error": "Not found"}), 404
+    return jsonify(logs)
+
+@app.route('/api/limits', methods=['GET'])
+def get_limits():
+    """Rate limiter queue depth, wait times and current rates"""
+    return jsonify(limiter.stats())
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """Server-sent events: prices, price_update, level_reached, trade_closed, log"""
+    client = events.subscribe()
+    return Response(
+        events.stream(client),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/events/stats', methods=['GET'])
+def event_stats():
+    return jsonify(events.stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape: tick, fetch, lag and request latency histograms"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/admin/profile', methods=['POST'])
+def profile():
+    """
+    Sample every thread's stack for ?seconds=N (default 10) and return
+    collapsed stacks for flamegraph.pl / speedscope.
+    ?threads=price-monitor,Thread- keeps matching thread names only,
+    ?idle=1 keeps threads parked in waits, ?interval=0.001 samples faster.
+    """
+    try:
+        seconds = float(request.args.get('seconds', 10))
+        interval = float(request.args['interval']) if 'interval' in request.args else None
+    except ValueError:
+        return jsonify({"error": "seconds and interval must be numbers"}), 400
+    threads = [t for t in request.args.get('threads', '').split(',') if t] or None
+    idle = request.args.get('idle') in ('1', 'true')
+    
+    result = profiler.capture(seconds, interval, threads, idle)
+    if result is None:
+        return jsonify({"error": "A profile is already running"}), 409
+    text, samples = result
+    return Response(text, mimetype='text/plain', headers={
+        'Content-Disposition': 'attachment; filename=profile.folded',
+        'X-Profile-Samples': str(samples)
+    })
+
+@app.route('/api/admin/slow-ticks', methods=['GET', 'POST', 'DELETE'])
+def slow_ticks():
+    """
+    GET: ticks slower than the threshold, newest first, with their phases.
+    POST {"threshold_ms": 250} changes the threshold (null = off), DELETE clears.
+    """
+    recorder = bot.slow_ticks
+    if request.method == 'POST':
+        data = request.json or {}
+        threshold = data.get('threshold_ms')
+        try:
+            recorder.configure(None if threshold is None else float(threshold) / 1000)
+        except (TypeError, ValueError):
+            return jsonify({"error": "threshold_ms must be a number or null"}), 400
+    elif request.method == 'DELETE':
+        recorder.clear()
+    return jsonify(recorder.stats())
+
 @app.route('/api/test', methods=['GET'])
 def test_api():
     try:
-        price = api.get_price("BTCINR")
+        price = ticker_read("get_price", "BTCINR")
         return jsonify({"status": "ok", "btc_price": price})
     except Exception as e:
         return jsonify({"status": "error", "error": str(e)})
@@ -0,0 +1,202 @@
+"""
+Static Assets - hashed, precompressed dashboard files served from memory
+=======================================================================
+At startup every file under frontend/ is read once, and scripts,
+stylesheets and images get a content-hashed name (app.js ->
+app.1a2b3c4d5e.js). index.html is rewritten to point at the hashed names,
+and text files are gzipped (and brotli'd when the brotli package is
+installed) ahead of time.
+
+StaticMiddleware answers GET/HEAD for those files at the WSGI layer,
+before Flask routing, request contexts or send_from_directory:
+- hashed names: Cache-Control immutable for a year - a new build is a
+  new URL, so browsers and the PWA never re-download an unchanged file
+- index.html, manifest.json and the plain names: no-cache + ETag, so a
+  reload is a 304 unless the dashboard was redeployed
+Anything it doesn't know (API routes, files added later) goes to Flask.
+Frontend edits need a server restart to be picked up.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+from config import STATIC_MAX_AGE, STATIC_GZIP_LEVEL
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Renamed by content - referenced from index.html, never fetched by a fixed URL
+HASHED_TYPES = (".js", ".css", ".png", ".jpg", ".jpeg", ".svg", ".ico", ".webp", ".woff", ".woff2")
+COMPRESSED_TYPES = (".html", ".js", ".css", ".json", ".svg", ".txt", ".map")
+MIN_COMPRESS = 256  # bytes - smaller files aren't worth a variant
+REFERENCE = re.compile(r'''(\b(?:src|href)=)(["'])([^"']+)\2''')
+
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+mimetypes.add_type("text/javascript", ".js")
+
+
+class Asset:
+    """One URL's body in every encoding, plus its response headers"""
+    
+    __slots__ = ("bodies", "etag", "content_type", "cache_control")
+    
+    def __init__(self, body, content_type, cache_control, digest):
+        self.bodies = {"identity": body}
+        self.etag = digest
+        self.content_type = content_type
+        self.cache_control = cache_control
+    
+    def precompress(self):
+        body = self.bodies["identity"]
+        if len(body) < MIN_COMPRESS:
+            return
+        gz = gzip.compress(body, compresslevel=STATIC_GZIP_LEVEL, mtime=0)
+        if len(gz) < len(body):
+            self.bodies["gzip"] = gz
+        if brotli is not None:
+            br = brotli.compress(body)
+            if len(br) < len(gz):
+                self.bodies["br"] = br
+    
+    def encoding_for(self, accept):
+        """Best encoding this client takes: br, then gzip, then identity"""
+        if len(self.bodies) == 1 or not accept:
+            return "identity"
+        accepted = set()
+        for part in accept.split(","):
+            name, _, params = part.strip().partition(";")
+            if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                continue
+            accepted.add(name.strip().lower())
+        for encoding in ("br", "gzip"):
+            if encoding in self.bodies and (encoding in accepted or "*" in accepted):
+                return encoding
+        return "identity"
+
+
+def _digest(body):
+    return hashlib.sha256(body).hexdigest()[:10]
+
+
+def _content_type(name):
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type.endswith(("json", "javascript")):
+        content_type += "; charset=utf-8"
+    return content_type
+
+
+class StaticAssets:
+    
+    def __init__(self, root, index="index.html", max_age=STATIC_MAX_AGE):
+        self.root = os.path.abspath(root)
+        self.index = index
+        self.immutable = f"public, max-age={max_age}, immutable"
+        self.routes = {}   # URL path -> Asset
+        self.hashed = {}   # relative name -> hashed relative name
+        self.load()
+    
+    def load(self):
+        files = {}
+        for folder, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(folder, name)
+                rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    files[rel] = f.read()
+        
+        routes, hashed = {}, {}
+        for rel, body in files.items():
+            if rel.endswith(HASHED_TYPES):
+                digest = _digest(body)
+                stem, ext = posixpath.splitext(rel)
+                hashed[rel] = f"{stem}.{digest}{ext}"
+                routes["/" + hashed[rel]] = self._asset(rel, body, self.immutable, digest)
+        
+        for rel, body in files.items():
+            if rel.endswith(".html"):
+                body = self._rewrite(body, rel, hashed)
+            # Plain names stay reachable for old pages and bookmarks
+            routes["/" + rel] = self._asset(rel, body, "no-cache", _digest(body))
+        if self.index in files:
+            routes["/"] = routes["/" + self.index]
+        
+        self.routes, self.hashed = routes, hashed
+        print(f"📦 {len(files)} static files loaded, {len(hashed)} content-hashed")
+    
+    def _asset(self, rel, body, cache_control, digest):
+        asset = Asset(body, _content_type(rel), cache_control, digest)
+        if rel.endswith(COMPRESSED_TYPES):
+            asset.precompress()
+        return asset
+    
+    def _rewrite(self, body, rel, hashed):
+        """Point src/href at hashed names, keeping them relative or absolute"""
+        folder = posixpath.dirname(rel)
+        
+        def swap(match):
+            ref = match.group(3)
+            if "://" in ref or ref.startswith(("//", "#", "data:")):
+                return match.group(0)
+            absolute = ref.startswith("/")
+            target = posixpath.normpath(ref[1:] if absolute else posixpath.join(folder, ref))
+            if target not in hashed:
+                return match.group(0)
+            new = "/" + hashed[target] if absolute else posixpath.relpath(hashed[target], folder or ".")
+            return f"{match.group(1)}{match.group(2)}{new}{match.group(2)}"
+        
+        return REFERENCE.sub(swap, body.decode("utf-8")).encode("utf-8")
+    
+    def get(self, path):
+        return self.routes.get(path)
+    
+    def stats(self):
+        assets = set(self.routes.values())
+        return {
+            "routes": len(self.routes),
+            "hashed": dict(self.hashed),
+            "bytes": sum(len(a.bodies["identity"]) for a in assets),
+            "compressed_bytes": sum(min(len(b) for b in a.bodies.values()) for a in assets)
+        }
+
+
+class StaticMiddleware:
+    """WSGI wrapper - known static paths never reach Flask"""
+    
+    def __init__(self, app, assets):
+        self.app = app
+        self.assets = assets
+    
+    def __call__(self, environ, start_response):
+        if environ.get("REQUEST_METHOD") in ("GET", "HEAD"):
+            asset = self.assets.get(environ.get("PATH_INFO", ""))
+            if asset is not None:
+                return self._serve(asset, environ, start_response)
+        return self.app(environ, start_response)
+    
+    def _serve(self, asset, environ, start_response):
+        encoding = asset.encoding_for(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        etag = f'"{asset.etag}"' if encoding == "identity" else f'"{asset.etag}-{encoding}"'
+        headers = [
+            ("ETag", etag),
+            ("Cache-Control", asset.cache_control),
+            ("Vary", "Accept-Encoding")
+        ]
+        
+        if_none_match = environ.get("HTTP_IF_NONE_MATCH", "")
+        if if_none_match and (if_none_match.strip() == "*" or etag in
+                              [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]):
+            start_response("304 Not Modified", headers)
+            return [b""]
+        
+        body = asset.bodies[encoding]
+        headers.append(("Content-Type", asset.content_type))
+        headers.append(("Content-Length", str(len(body))))
+        if encoding != "identity":
+            headers.append(("Content-Encoding", encoding))
+        start_response("200 OK", headers)
+        return [b"" if environ["REQUEST_METHOD"] == "HEAD" else body]
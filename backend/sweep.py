@@ -0,0 +1,214 @@
+"""
+Ladder Sweep - search TRAILING_CONFIG variants across cores
+===========================================================
+Generates candidate ladders (grid or random search), backtests each on
+the same history and writes a ranked table.
+
+A candidate is four numbers (see make_ladder): level spacing in R, how
+far the SL trails behind the level reached, the % booked per level and
+the final level. Work goes to a ProcessPoolExecutor in chunks; price
+data is never pickled - every worker memory-maps the same .npy candle
+caches (candles.py), so the OS shares one copy of the pages and a sweep
+scales with cores instead of with data size.
+    
+    python backend/sweep.py data/*.csv --grid
+    python backend/sweep.py data/*.csv --random 10000 --workers 16 --out sweep.csv --best ladder.json
+    python backend/backtest.py data/*.csv --ladder ladder.json
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from backtest import Backtest, add_arguments, backtest_options, load_files
+from candles import CandleFile
+from config import SWEEP_WORKERS
+
+PARAMS = ("step", "lag", "book", "final")
+GRID = {
+    "step": (0.5, 0.75, 1.0),
+    "lag": (0.5, 1.0, 1.5, 2.0),
+    "book": (0, 10, 20, 30),
+    "final": (3.0, 4.0, 5.0, 6.0)
+}
+RANDOM = {
+    "step": (0.25, 1.5),
+    "lag": (0.25, 2.5),
+    "book": (0, 40),
+    "final": (2.0, 8.0)
+}
+COLUMNS = ("trades", "net_pnl", "avg_r", "median_r", "win_rate", "profit_factor", "max_drawdown")
+# Metrics where smaller is better
+ASCENDING = ("max_drawdown",)
+
+
+def make_ladder(step, lag, book, final):
+    """
+    TRAILING_CONFIG-style ladder: a level every `step` R up to `final`,
+    SL trailing `lag` R behind each level (never below entry once 1R is
+    reached), `book`% more booked per level from 1.5R, all out at final.
+    """
+    ladder = []
+    count = max(1, int(round(final / step)))
+    for k in range(1, count + 1):
+        rr = round(min(step * k, final), 4)
+        sl_move = round(max(0.0, rr - lag), 4) if rr >= 1 else 0
+        if k == count:
+            book_percent = 100
+        elif rr >= 1.5:
+            book_percent = min(100, int(book * sum(1 for j in range(1, k + 1) if step * j >= 1.5)))
+        else:
+            book_percent = 0
+        ladder.append({
+            "rr": rr,
+            "sl_move": sl_move,
+            "action": f"Trail SL to {sl_move}R" + (f", book {book_percent}%" if book_percent else ""),
+            "book_percent": book_percent
+        })
+    return ladder
+
+
+def grid_candidates(grid=GRID):
+    for values in itertools.product(*(grid[name] for name in PARAMS)):
+        yield dict(zip(PARAMS, values))
+
+
+def random_candidates(count, space=RANDOM, seed=1):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {
+            "step": round(rng.uniform(*space["step"]), 3),
+            "lag": round(rng.uniform(*space["lag"]), 3),
+            "book": rng.randint(*space["book"]),
+            "final": round(rng.uniform(*space["final"]), 2)
+        }
+
+
+# ==========================================
+# WORKERS
+# ==========================================
+
+_worker = {}
+
+
+def _init_worker(caches, options):
+    """Map the shared candle caches once per process"""
+    _worker["files"] = [CandleFile(cache, symbol) for cache, symbol in caches]
+    _worker["options"] = options
+
+
+def _evaluate(chunk):
+    rows = []
+    for i, params in chunk:
+        backtest = Backtest(_worker["files"], ladder_config=make_ladder(**params), **_worker["options"])
+        report = backtest.run()
+        row = {"id": i}
+        row.update(params)
+        row.update({name: report.get(name) for name in COLUMNS})
+        rows.append(row)
+    return rows
+
+
+def _chunks(candidates, size):
+    chunk = []
+    for item in enumerate(candidates):
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_sweep(files, candidates, options, workers=SWEEP_WORKERS, chunk_size=None):
+    """Backtest every candidate - rows in completion order"""
+    candidates = list(candidates)
+    workers = workers or os.cpu_count() or 1
+    caches = [(f.cache, f.symbol) for f in files]  # paths only - workers map the data
+    chunk_size = chunk_size or max(1, min(32, len(candidates) // (workers * 8)))
+    
+    rows = []
+    started = time.perf_counter()
+    if workers == 1:
+        _init_worker(caches, options)
+        for chunk in _chunks(candidates, chunk_size):
+            rows.extend(_evaluate(chunk))
+        return rows
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(caches, options)) as pool:
+        futures = [pool.submit(_evaluate, chunk) for chunk in _chunks(candidates, chunk_size)]
+        step = max(1, len(futures) // 20)
+        for done, future in enumerate(as_completed(futures), 1):
+            rows.extend(future.result())
+            if done % step == 0 or done == len(futures):
+                elapsed = time.perf_counter() - started
+                print(f"⏳ {len(rows)}/{len(candidates)} ladders · {elapsed:.1f}s")
+    return rows
+
+
+def rank(rows, metric="net_pnl"):
+    """Best first - rows without trades sort last"""
+    reverse = metric not in ASCENDING
+    present = [row for row in rows if row.get(metric) is not None]
+    missing = [row for row in rows if row.get(metric) is None]
+    return sorted(present, key=lambda row: row[metric], reverse=reverse) + missing
+
+
+def write_table(rows, path):
+    fields = ["rank", "id"] + list(PARAMS) + list(COLUMNS)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for n, row in enumerate(rows, 1):
+            writer.writerow(dict(row, rank=n))
+
+
+def print_table(rows, top=20):
+    header = f"{'#':>4} {'step':>6} {'lag':>6} {'book':>5} {'final':>6} {'trades':>7} {'net P/L':>12} {'avg R':>7} {'win %':>6} {'PF':>6} {'max DD':>10}"
+    print(header)
+    print("-" * len(header))
+    for n, row in enumerate(rows[:top], 1):
+        pf = row["profit_factor"]
+        print(f"{n:>4} {row['step']:>6} {row['lag']:>6} {row['book']:>5} {row['final']:>6} "
+              f"{row['trades'] or 0:>7} {row['net_pnl'] or 0:>12,.2f} {row['avg_r'] or 0:>7.3f} "
+              f"{row['win_rate'] or 0:>6.1f} {pf if pf is not None else '-':>6} {row['max_drawdown'] or 0:>10,.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search trailing ladders over historical candles")
+    add_arguments(parser)
+    search = parser.add_mutually_exclusive_group()
+    search.add_argument("--grid", action="store_true", help="full grid (default)")
+    search.add_argument("--random", type=int, metavar="N", help="N random ladders")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=SWEEP_WORKERS, help="processes (default: all cores)")
+    parser.add_argument("--rank", choices=COLUMNS, default="net_pnl")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--out", help="write the full ranked table as CSV")
+    parser.add_argument("--best", help="write the best ladder as JSON (for backtest.py --ladder)")
+    args = parser.parse_args()
+    
+    files = load_files(args.files)  # converts caches once, before the workers start
+    candidates = random_candidates(args.random, seed=args.seed) if args.random else grid_candidates()
+    
+    started = time.perf_counter()
+    rows = rank(run_sweep(files, candidates, backtest_options(args), args.workers), args.rank)
+    print(f"\n🏁 {len(rows)} ladders in {time.perf_counter() - started:.1f}s\n")
+    print_table(rows, args.top)
+    
+    if args.out:
+        write_table(rows, args.out)
+        print(f"\n💾 Table written to {args.out}")
+    if args.best and rows:
+        best = {name: rows[0][name] for name in PARAMS}
+        with open(args.best, "w") as f:
+            json.dump(make_ladder(**best), f, indent=2)
+        print(f"💾 Best ladder written to {args.best}")
+
+
+if __name__ == "__main__":
+    main()
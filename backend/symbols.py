@@ -0,0 +1,96 @@
+"""
+Symbol Resolution Index
+=======================
+CoinDCX lists the same pair under several names (BTCUSDT, B-BTC_USDT,
+BTC_USDT...). Every alias is reduced to one canonical key and mapped to a
+single preferred market, so lookups are one dict hit instead of a scan.
+"""
+
+from functools import lru_cache
+
+
+# Preferred market when several share a canonical symbol:
+# B- (futures/USDT, where the bot places orders) > native > other prefixes
+def _preference(market):
+    if market.startswith('B-'):
+        return 0
+    if '-' not in market:
+        return 1
+    return 2
+
+
+@lru_cache(maxsize=4096)
+def canonical_symbol(symbol):
+    """BTCUSDT / B-BTC_USDT / btc_usdt -> BTCUSDT"""
+    symbol = symbol.upper()
+    if '-' in symbol:
+        symbol = symbol.split('-', 1)[1]
+    return symbol.replace('_', '').replace('/', '')
+
+
+def futures_market(coin):
+    """Fallback B- market name when the index doesn't know the coin"""
+    if coin.startswith('B-'):
+        return coin
+    return f"B-{coin.replace('USDT', '_USDT')}"
+
+
+class SymbolIndex:
+    """Immutable price snapshot + alias map for one ticker refresh"""
+    
+    def __init__(self, tickers, previous=None):
+        prices = {}
+        for ticker in tickers:
+            market = ticker.get('market')
+            if market:
+                prices[market] = float(ticker.get('last_price') or 0)
+        self.prices = prices
+        self._flat = None
+        
+        # Alias map only changes when the market list does
+        if previous is not None and previous.prices.keys() == prices.keys():
+            self.aliases = previous.aliases
+        else:
+            self.aliases = self._build_aliases(prices)
+    
+    @staticmethod
+    def _build_aliases(prices):
+        preferred = {}
+        for market in prices:
+            key = canonical_symbol(market)
+            current = preferred.get(key)
+            if current is None or _preference(market) < _preference(current):
+                preferred[key] = market
+        
+        aliases = dict(preferred)
+        for market in prices:
+            aliases[market] = preferred[canonical_symbol(market)]
+        return aliases
+    
+    def resolve(self, symbol):
+        """Any alias -> preferred market name (or None)"""
+        market = self.aliases.get(symbol)
+        if market is None:
+            market = self.aliases.get(canonical_symbol(symbol))
+        return market
+    
+    def price(self, symbol):
+        """Price of the preferred market for any alias"""
+        market = self.resolve(symbol)
+        if market is None:
+            return None
+        return self.prices.get(market)
+    
+    def market_price(self, market):
+        """Price of one exact market name"""
+        return self.prices.get(market)
+    
+    def flat_prices(self):
+        """Legacy get_all_prices() dict: markets plus B- stripped names"""
+        if self._flat is None:
+            flat = dict(self.prices)
+            for market, price in self.prices.items():
+                if market.startswith('B-'):
+                    flat[market[2:]] = price
+            self._flat = flat
+        return self._flat
\ No newline at end of file
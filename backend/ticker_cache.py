@@ -0,0 +1,103 @@
+"""
+Ticker Cache - Shared, TTL-bounded
+==================================
+One upstream /exchange/ticker fetch per TTL, no matter how many
+dashboards, routes or monitor ticks ask for prices.
+
+- Fresh (age < ttl): served from memory
+- Stale (age < ttl + max_stale): served from memory, one background refresh
+- Expired / empty: callers block on a single in-flight fetch
+"""
+
+import time
+import threading
+from config import TICKER_CACHE_TTL, TICKER_MAX_STALE
+
+
+class TickerCache:
+    
+    def __init__(self, fetch, ttl=TICKER_CACHE_TTL, max_stale=TICKER_MAX_STALE):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_stale = max_stale
+        
+        self._cond = threading.Condition(threading.Lock())
+        self._data = None
+        self._fetched_at = 0.0
+        self._refreshing = False
+        self._last_error = None
+        
+        self.version = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+    
+    def get(self):
+        """Return ticker rows (shared list - do not mutate) or {"error": ...}"""
+        with self._cond:
+            age = time.monotonic() - self._fetched_at
+            
+            if self._data is not None and age < self.ttl:
+                self.hits += 1
+                return self._data
+            
+            # Stale-while-revalidate
+            if self._data is not None and age < self.ttl + self.max_stale:
+                self.stale_hits += 1
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh, daemon=True).start()
+                return self._data
+            
+            # Nothing usable - single-flight: join the in-flight fetch if any
+            self.misses += 1
+            if self._refreshing:
+                self._cond.wait_for(lambda: not self._refreshing, timeout=30)
+                return self._usable()
+            
+            self._refreshing = True
+        
+        self._refresh()
+        
+        with self._cond:
+            return self._usable()
+    
+    def _usable(self):
+        """Result for a blocking caller (lock held)"""
+        age = time.monotonic() - self._fetched_at
+        if self._data is not None and age < self.ttl + self.max_stale:
+            return self._data
+        return {"error": self._last_error or "Ticker unavailable"}
+    
+    def invalidate(self):
+        with self._cond:
+            self._fetched_at = 0.0
+    
+    def _refresh(self):
+        try:
+            data = self.fetch()
+        except Exception as e:
+            data = {"error": str(e)}
+        
+        with self._cond:
+            if isinstance(data, list):
+                self._data = data
+                self._fetched_at = time.monotonic()
+                self._last_error = None
+                self.version += 1
+            else:
+                # Keep serving the last good snapshot
+                self._last_error = data.get("error") if isinstance(data, dict) else str(data)
+            self._refreshing = False
+            self._cond.notify_all()
+    
+    def stats(self):
+        with self._cond:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "version": self.version,
+                "age": round(time.monotonic() - self._fetched_at, 3) if self._data is not None else None,
+                "last_error": self._last_error
+            }
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Trade Records - compact, slotted
+================================
+A Trade holds only the raw numbers the monitor needs. Trailing levels are
+not stored per trade: every trade shares one Ladder (TRAILING_CONFIG as
+per-config arrays) and level prices/display fields are derived on demand.
+
+to_dict() keeps the original keys, order and rounding. "logs" holds only
+the newest TRADE_LOG_SUMMARY entries plus a count - page the rest through
+TradeLog.read().
+
+to_state() / Trade.from_state() round-trip the raw fields for the journal.
+"""
+
+from config import TRAILING_CONFIG, TRADE_LOG_SUMMARY
+from trade_log import TradeLog
+
+# Not closed: ACTIVE is monitored, PENDING_ENTRY waits for its LIMIT entry to fill
+OPEN_STATUSES = ("ACTIVE", "PENDING_ENTRY")
+
+
+class Ladder:
+    """TRAILING_CONFIG as parallel tuples, shared by every trade"""
+    
+    __slots__ = ("rr", "sl_move", "action", "book_percent")
+    
+    def __init__(self, config=TRAILING_CONFIG):
+        config = sorted(config, key=lambda c: c["rr"])
+        self.rr = tuple(c["rr"] for c in config)
+        self.sl_move = tuple(c["sl_move"] for c in config)
+        self.action = tuple(c["action"] for c in config)
+        self.book_percent = tuple(c["book_percent"] for c in config)
+    
+    def __len__(self):
+        return len(self.rr)
+
+
+DEFAULT_LADDER = Ladder()
+
+
+class TrailingLevel:
+    """Lightweight view of one ladder step for one trade"""
+    
+    __slots__ = ("trade", "index")
+    
+    def __init__(self, trade, index):
+        self.trade = trade
+        self.index = index
+    
+    @property
+    def rr(self):
+        return self.trade.ladder.rr[self.index]
+    
+    @property
+    def action(self):
+        return self.trade.ladder.action[self.index]
+    
+    @property
+    def book_percent(self):
+        return self.trade.ladder.book_percent[self.index]
+    
+    @property
+    def target_price(self):
+        trade = self.trade
+        if trade.is_long:
+            return round(trade.entry_price + (trade.risk_per_unit * self.rr), 2)
+        return round(trade.entry_price - (trade.risk_per_unit * self.rr), 2)
+    
+    @property
+    def new_sl(self):
+        trade = self.trade
+        if self.rr < 1:
+            return round(trade.stop_loss, 2)
+        sl_move = trade.ladder.sl_move[self.index]
+        if trade.is_long:
+            return round(trade.entry_price + (trade.risk_per_unit * sl_move), 2)
+        return round(trade.entry_price - (trade.risk_per_unit * sl_move), 2)
+    
+    @property
+    def reached(self):
+        return self.index <= self.trade.current_level
+    
+    def to_dict(self):
+        trade = self.trade
+        rr = self.rr
+        risk = trade.risk_per_unit
+        return {
+            "rr": rr,
+            "target_price": self.target_price,
+            "new_sl": self.new_sl,
+            "action": self.action,
+            "book_percent": self.book_percent,
+            "profit_amount": round(risk * rr * trade.initial_quantity, 2),
+            "profit_percent": round(((rr * risk) / trade.entry_price) * 100 * trade.leverage, 2),
+            "reached": self.reached
+        }
+
+
+class Trade:
+    
+    __slots__ = (
+        "id", "coin", "symbol", "trade_type", "is_long",
+        "entry_price", "capital", "quantity", "initial_quantity",
+        "stop_loss", "current_sl", "take_profit", "leverage",
+        "risk_per_unit", "risk_amount", "risk_percent",
+        "ladder", "current_level", "order_id", "status", "created_at", "logs",
+        "exit", "version"
+    )
+    
+    def __init__(self, id, coin, symbol, trade_type, entry_price, capital, quantity,
+                 stop_loss, take_profit, leverage, risk_per_unit, risk_amount,
+                 risk_percent, order_id, created_at, ladder=DEFAULT_LADDER,
+                 current_sl=None, current_level=-1, status="ACTIVE",
+                 initial_quantity=None, logs=None, exit=None):
+        self.id = id
+        self.coin = coin
+        self.symbol = symbol
+        self.trade_type = trade_type
+        self.is_long = trade_type == "LONG"
+        self.entry_price = entry_price
+        self.capital = capital
+        self.quantity = quantity
+        self.initial_quantity = quantity if initial_quantity is None else initial_quantity
+        self.stop_loss = stop_loss
+        self.current_sl = stop_loss if current_sl is None else current_sl
+        self.take_profit = take_profit
+        self.leverage = leverage
+        self.risk_per_unit = risk_per_unit
+        self.risk_amount = risk_amount
+        self.risk_percent = risk_percent
+        self.ladder = ladder
+        self.current_level = current_level
+        self.order_id = order_id
+        self.status = status
+        self.created_at = created_at
+        self.logs = TradeLog(id) if logs is None else logs
+        self.exit = exit  # {"price", "reason", "attempts"} until the exit order is acked
+        self.version = 0  # set by the bot on every change
+    
+    def level(self, index):
+        return TrailingLevel(self, index)
+    
+    def next_level_rr(self):
+        """R multiple of the next unreached level (None when all reached)"""
+        index = self.current_level + 1
+        if index < len(self.ladder.rr):
+            return self.ladder.rr[index]
+        return None
+    
+    # Raw fields only - levels derive from the ladder, logs live on disk
+    STATE_FIELDS = (
+        "id", "coin", "symbol", "trade_type", "entry_price", "capital",
+        "quantity", "initial_quantity", "stop_loss", "current_sl", "take_profit",
+        "leverage", "risk_per_unit", "risk_amount", "risk_percent",
+        "current_level", "order_id", "status", "created_at"
+    )
+    
+    def to_state(self):
+        state = {name: getattr(self, name) for name in self.STATE_FIELDS}
+        state["log_seq"] = self.logs.last_seq
+        state["exit"] = dict(self.exit) if self.exit else None
+        return state
+    
+    @classmethod
+    def from_state(cls, state, ladder=DEFAULT_LADDER):
+        fields = {name: state[name] for name in cls.STATE_FIELDS}
+        fields["logs"] = TradeLog.resume(state["id"], state.get("log_seq", 0))
+        fields["exit"] = state.get("exit")
+        return cls(ladder=ladder, **fields)
+    
+    @property
+    def trailing_levels(self):
+        return [TrailingLevel(self, i).to_dict() for i in range(len(self.ladder))]
+    
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "coin": self.coin,
+            "trade_type": self.trade_type,
+            "entry_price": self.entry_price,
+            "capital": self.capital,
+            "quantity": self.quantity,
+            "stop_loss": self.stop_loss,
+            "current_sl": self.current_sl,
+            "take_profit": self.take_profit,
+            "leverage": self.leverage,
+            "risk_per_unit": self.risk_per_unit,
+            "risk_amount": self.risk_amount,
+            "risk_percent": self.risk_percent,
+            "trailing_levels": self.trailing_levels,
+            "current_level": self.current_level,
+            "order_id": self.order_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "exit_pending": self.exit is not None,
+            **self.log_dict()
+        }
+    
+    def log_dict(self):
+        """The to_dict() fields a new log line changes"""
+        return {
+            "logs": self.logs.recent(TRADE_LOG_SUMMARY),
+            "log_count": len(self.logs),
+            "last_log_seq": self.logs.last_seq
+        }
\ No newline at end of file
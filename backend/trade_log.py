@@ -0,0 +1,169 @@
+"""
+Trade Logs - bounded in memory, spilled to disk
+===============================================
+Each trade keeps its newest TRADE_LOG_BUFFER entries in a ring buffer.
+Entries pushed out of the ring are appended to data/trade_logs/<id>.jsonl,
+so the full history is still available through /api/bot/logs/<id>
+without every dashboard poll serializing it.
+
+Spilling never touches the disk on the caller's thread: entries are
+queued on SPILLS and a background writer appends them every
+TRADE_LOG_SPILL_INTERVAL, one open() per file per batch.
+
+Every entry carries a per-trade sequence number ("seq") for paging.
+"""
+
+import atexit
+import os
+import json
+import threading
+from collections import deque
+from event_log import EVENT_LOG
+from config import DATA_DIR, TRADE_LOG_BUFFER, TRADE_LOG_SPILL_INTERVAL
+
+LOG_DIR = os.path.join(DATA_DIR, "trade_logs")
+
+
+class SpillWriter:
+    """Background appends of spilled entries, batched per file"""
+    
+    def __init__(self, interval=TRADE_LOG_SPILL_INTERVAL):
+        self.interval = interval
+        self.pending = {}                    # path -> entries not written yet
+        self.lock = threading.Lock()         # guards pending - held for a dict append only
+        self.flush_lock = threading.Lock()   # one writer (or reader of a file) at a time
+        self.thread = None
+        self._stopped = threading.Event()
+        self.written = 0
+        self.errors = 0
+    
+    def put(self, path, entry):
+        with self.lock:
+            self.pending.setdefault(path, []).append(entry)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="trade-log-spill", daemon=True)
+                self.thread.start()
+                atexit.register(self.close)
+    
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.flush()
+    
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, {}
+            if not batch:
+                return
+            for path, entries in batch.items():
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+                    self.written += len(entries)
+                except OSError as e:
+                    self.errors += 1
+                    EVENT_LOG.message("error", f"Log spill error {os.path.basename(path)}: {e}")
+    
+    def read(self, path):
+        """Every spilled entry for path - written ones, then queued ones"""
+        with self.flush_lock:
+            entries = []
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entries.append(json.loads(line))
+            except OSError:
+                pass
+            with self.lock:
+                entries.extend(self.pending.get(path, ()))
+            return entries
+    
+    def close(self):
+        self._stopped.set()
+        self.flush()
+
+
+SPILLS = SpillWriter()  # shared by every trade's log
+
+
+class TradeLog:
+    
+    __slots__ = ("trade_id", "entries", "next_seq", "spilled")
+    
+    def __init__(self, trade_id, maxlen=TRADE_LOG_BUFFER):
+        self.trade_id = trade_id
+        self.entries = deque(maxlen=maxlen)
+        self.next_seq = 1
+        self.spilled = 0
+    
+    @classmethod
+    def resume(cls, trade_id, last_seq):
+        """
+        Log for a trade restored from the journal: numbering continues
+        after last_seq. Entries that were only in memory are gone; spilled
+        ones are still served by read().
+        """
+        log = cls(trade_id)
+        log.next_seq = last_seq + 1
+        if os.path.exists(log._path()):
+            log.spilled = last_seq
+        return log
+    
+    def __len__(self):
+        return self.next_seq - 1
+    
+    def append(self, entry):
+        """Add an entry (dict) and stamp its seq - returns the entry"""
+        entry["seq"] = self.next_seq
+        self.next_seq += 1
+        if len(self.entries) == self.entries.maxlen:
+            self._spill(self.entries[0])
+        self.entries.append(entry)
+        return entry
+    
+    @property
+    def last_seq(self):
+        return self.next_seq - 1
+    
+    def recent(self, n):
+        if n <= 0:
+            return []
+        entries = self.entries
+        return list(entries)[-n:] if len(entries) > n else list(entries)
+    
+    def read(self, since=0, limit=100):
+        """Entries with seq > since, oldest first, at most limit"""
+        first_buffered = self.entries[0]["seq"] if self.entries else self.next_seq
+        result = []
+        
+        # Older than the ring - read back from the spill file
+        if since + 1 < first_buffered and self.spilled:
+            for entry in self._read_spill():
+                if entry["seq"] > since:
+                    result.append(entry)
+                    if len(result) >= limit:
+                        return result
+        
+        for entry in list(self.entries):
+            if entry["seq"] > since:
+                result.append(entry)
+                if len(result) >= limit:
+                    break
+        return result
+    
+    # ==========================================
+    # SPILL FILE
+    # ==========================================
+    
+    def _path(self):
+        return os.path.join(LOG_DIR, f"{self.trade_id}.jsonl")
+    
+    def _spill(self, entry):
+        """Queue the entry leaving the ring - written by SPILLS' thread"""
+        SPILLS.put(self._path(), entry)
+        self.spilled += 1
+    
+    def _read_spill(self):
+        return SPILLS.read(self._path())
\ No newline at end of file
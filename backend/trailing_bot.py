@@ -6,46 +6,100 @@ Features:
 - Take Profit support
 - Auto trailing SL
 - Futures/USDT pairs
+- REST polling or streaming price feed
+- LIMIT entries wait as PENDING_ENTRY until the reconciler sees them fill
 """
 
 import time
 import threading
-import json
+import itertools
+from collections import OrderedDict
 from datetime import datetime
 from coindcx_api import CoinDCXAPI
-from config import TRAILING_CONFIG, PRICE_CHECK_INTERVAL
+from symbols import canonical_symbol
+from price_feed import RestPricePoller, StreamingPriceSource
+from trigger_book import TriggerBook
+from trade import Trade, Ladder, OPEN_STATUSES
+from vector_book import VectorBook, VECTOR_AVAILABLE
+from order_executor import OrderExecutor
+from rate_limiter import PRIORITY_EXIT, PRIORITY_ORDER
+from order_batch import net_orders, batch_plan, split_results, fan_out
+from reconciler import OrderReconciler
+from metrics import TICK_SECONDS, PRICE_FETCH_SECONDS, TRADE_EVAL_SECONDS
+from profiler import SlowTickRecorder
+from event_log import EVENT_LOG, hms
+from config import (
+    TRAILING_CONFIG, PRICE_FEED, EVALUATION_BACKEND, TRADE_LOG_PAGE, TRADES_PAGE, BATCH_ORDERS,
+    EXIT_RETRY_BACKOFF
+)
 
 
 class TrailingBot:
     
-    def __init__(self, socketio=None):
-        self.api = CoinDCXAPI()
+    def __init__(self, socketio=None, api=None, price_source=None, ladder=None, journal=None,
+                 orders=None):
+        self.api = api or CoinDCXAPI()
         self.socketio = socketio
-        self.active_trades = {}
+        self.ladder = ladder or Ladder(TRAILING_CONFIG)
+        self.active_trades = {}     # open trades only
+        self.pending_trades = {}    # LIMIT entries not filled yet - not monitored
+        self.closed_trades = {}     # archive - never scanned by the monitor
+        self.exit_retries = {}      # trade_id -> (trade, price, reason, attempts, due) - failed exits
+        self.trades_by_symbol = {}  # canonical symbol -> {trade_id: trade}
+        self.trigger_books = {}     # canonical symbol -> TriggerBook / VectorBook
+        self.vectorized = EVALUATION_BACKEND == "numpy" and VECTOR_AVAILABLE
+        if EVALUATION_BACKEND == "numpy" and not VECTOR_AVAILABLE:
+            print("⚠️ numpy not installed - using sorted trigger book")
         self.is_running = False
-        self.monitor_thread = None
+        self.price_source = price_source or self._default_price_source()
+        self._tick_lock = threading.Lock()
+        self.orders = orders or OrderExecutor()  # order I/O off the monitor thread
+        self._tick = threading.local()           # .batch - orders decided this tick
+        self.slow_ticks = SlowTickRecorder()
+        self.reconciler = OrderReconciler(self.api, self._on_order_update)
+        self.event_log = EVENT_LOG
+        self._id_lock = threading.Lock()
+        self._trade_ids = set()
+        # Versions keep rising across restarts, so clients' since_version stays valid
+        start = int(time.time() * 1000)
+        self._versions = itertools.count(start + 1)
+        self._version_lock = threading.Lock()
+        self._views = {}                # trade_id -> (to_dict view, field -> version)
+        self._by_version = OrderedDict()  # trade_id -> trade, least recently changed first
+        self.trades_version = start
+        self.journal = journal
+        if journal is not None:
+            self.restore()
+            journal.start()
+    
+    def _default_price_source(self):
+        poller = RestPricePoller(self.api)
+        if PRICE_FEED == "stream":
+            return StreamingPriceSource(fallback=poller)
+        return poller
     
     def emit(self, event, data):
-        """Send event to frontend"""
+        """Send event to frontend - the process log only queues it"""
         try:
             if self.socketio:
                 self.socketio.emit(event, data)
         except:
             pass
-        print(f"[{event}] {json.dumps(data, default=str)[:200]}")
+        if event != "log":  # log() records its own line
+            self.event_log.event(event, data, data.get("trade_id"))
     
     def log(self, trade_id, message, log_type="info"):
         """Log trade event"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = hms()
         log_entry = {"time": timestamp, "message": message, "type": log_type}
         
-        if trade_id in self.active_trades:
-            if "logs" not in self.active_trades[trade_id]:
-                self.active_trades[trade_id]["logs"] = []
-            self.active_trades[trade_id]["logs"].append(log_entry)
+        trade = self._get_trade(trade_id)
+        if trade is not None:
+            trade.logs.append(log_entry)  # stamps log_entry["seq"]
+            self._touch_logs(trade)
         
         self.emit("log", {"trade_id": trade_id, "log": log_entry})
-        print(f"[{timestamp}] [{log_type.upper()}] {message}")
+        self.event_log.message(log_type, message, trade_id)
     
     # ==========================================
     # START TRADE - CAPITAL BASED
@@ -66,174 +120,182 @@ class TrailingBot:
             "leverage": 10
         }
         """
-        trade_id = f"trade_{int(time.time())}"
+        trade_id = self._new_trade_id()
         
         try:
-            coin = trade_config["coin"]
-            trade_type = trade_config["trade_type"]
-            entry_type = trade_config["entry_type"]
-            capital = float(trade_config["capital"])
-            stop_loss = float(trade_config["stop_loss"])
-            take_profit = float(trade_config.get("take_profit", 0))
-            leverage = float(trade_config.get("leverage", 1))
-            
-            self.log(trade_id, f"🚀 Starting {trade_type} on {coin} with ${capital}", "info")
+            params = self._read_trade_config(trade_id, trade_config)
             
             # Get current price
-            current_price = self.api.get_futures_price(coin)
-            if not current_price:
-                # Try alternate format
-                current_price = self.api.get_price(f"B-{coin.replace('USDT', '_USDT')}")
-            
-            if not current_price:
-                return {"success": False, "error": f"Could not fetch price for {coin}"}
-            
-            self.log(trade_id, f"📊 Current price: ${current_price}", "info")
-            
-            # Entry price
-            if entry_type == "MARKET":
-                entry_price = current_price
-            else:
-                entry_price = float(trade_config["entry_price"])
+            current_price = self.api.get_futures_price(params["coin"])
             
-            # Validate SL
-            if trade_type == "LONG" and stop_loss >= entry_price:
-                return {"success": False, "error": "For LONG, SL must be below entry"}
-            if trade_type == "SHORT" and stop_loss <= entry_price:
-                return {"success": False, "error": "For SHORT, SL must be above entry"}
+            plan = self._plan_trade(trade_id, params, current_price)
+            if "error" in plan:
+                return plan
             
-            # Calculate quantity from capital
-            quantity = self.api.calculate_quantity(capital, entry_price, leverage)
+            method, args = self._entry_order(plan)
+            order_result = method(*args)
             
-            self.log(trade_id, f"📦 Quantity calculated: {quantity:.6f}", "info")
-            
-            # Calculate risk
-            risk_per_unit = abs(entry_price - stop_loss)
-            risk_amount = risk_per_unit * quantity
-            risk_percent = (risk_per_unit / entry_price) * 100 * leverage
-            
-            self.log(trade_id, f"⚠️ Risk: ${risk_amount:.2f} ({risk_percent:.2f}%)", "info")
-            
-            # Auto-calculate TP if not provided (at 2R)
-            if take_profit <= 0:
-                if trade_type == "LONG":
-                    take_profit = entry_price + (risk_per_unit * 2)
-                else:
-                    take_profit = entry_price - (risk_per_unit * 2)
-                self.log(trade_id, f"🎯 Auto TP set at 2R: ${take_profit:.2f}", "info")
-            
-            # Place order
-            self.log(trade_id, f"📝 Placing {entry_type} order...", "info")
-            
-            # Determine market format
-            market = coin
-            if not market.startswith('B-'):
-                # Try B- format for CoinDCX
-                market_alt = f"B-{coin.replace('USDT', '_USDT')}"
-            else:
-                market_alt = coin
-            
-            if trade_type == "LONG":
-                if entry_type == "MARKET":
-                    order_result = self.api.place_market_buy(market, capital)
-                    if "error" in str(order_result) or "message" in order_result:
-                        # Try alternate format
-                        order_result = self.api.place_market_buy(market_alt, capital)
-                else:
-                    order_result = self.api.place_limit_buy(market, entry_price, quantity)
-            else:  # SHORT
-                if entry_type == "MARKET":
-                    order_result = self.api.place_market_sell(market, quantity)
-                    if "error" in str(order_result) or "message" in order_result:
-                        order_result = self.api.place_market_sell(market_alt, quantity)
-                else:
-                    order_result = self.api.place_limit_sell(market, entry_price, quantity)
-            
-            # Check result
-            if "error" in str(order_result).lower():
-                error_msg = str(order_result)
-                self.log(trade_id, f"❌ Order failed: {error_msg}", "error")
-                return {"success": False, "error": error_msg}
-            
-            order_id = "pending"
-            if "orders" in order_result and len(order_result["orders"]) > 0:
-                order_id = order_result["orders"][0].get("id", "unknown")
-            
-            self.log(trade_id, f"✅ Order placed! ID: {order_id}", "success")
-            
-            # Calculate trailing levels
-            trailing_levels = self._calculate_levels(
-                entry_price, stop_loss, risk_per_unit, quantity, leverage, trade_type
-            )
-            
-            # Store trade
-            self.active_trades[trade_id] = {
-                "id": trade_id,
-                "coin": coin,
-                "trade_type": trade_type,
-                "entry_price": entry_price,
-                "capital": capital,
-                "quantity": quantity,
-                "stop_loss": stop_loss,
-                "current_sl": stop_loss,
-                "take_profit": take_profit,
-                "leverage": leverage,
-                "risk_per_unit": risk_per_unit,
-                "risk_amount": risk_amount,
-                "risk_percent": risk_percent,
-                "trailing_levels": trailing_levels,
-                "current_level": -1,
-                "order_id": order_id,
-                "status": "ACTIVE",
-                "created_at": datetime.now().isoformat(),
-                "logs": []
-            }
-            
-            # Start monitoring
-            if not self.is_running:
-                self.start_monitoring()
-            
-            self.emit("trade_started", self.active_trades[trade_id])
-            
-            return {
-                "success": True, 
-                "trade_id": trade_id, 
-                "trade": self.active_trades[trade_id]
-            }
+            return self._open_trade(trade_id, plan, order_result)
             
         except Exception as e:
             error_msg = str(e)
             self.log(trade_id, f"❌ Error: {error_msg}", "error")
             return {"success": False, "error": error_msg}
     
-    def _calculate_levels(self, entry, sl, risk, quantity, leverage, trade_type):
-        """Calculate all trailing SL levels"""
-        levels = []
-        is_long = trade_type == "LONG"
+    def _read_trade_config(self, trade_id, trade_config):
+        params = {
+            "coin": trade_config["coin"],
+            "trade_type": trade_config["trade_type"],
+            "entry_type": trade_config["entry_type"],
+            "capital": float(trade_config["capital"]),
+            "stop_loss": float(trade_config["stop_loss"]),
+            "take_profit": float(trade_config.get("take_profit", 0)),
+            "leverage": float(trade_config.get("leverage", 1)),
+            "limit_price": trade_config.get("entry_price")
+        }
+        
+        self.log(trade_id, f"🚀 Starting {params['trade_type']} on {params['coin']} with ${params['capital']}", "info")
+        return params
+    
+    def _plan_trade(self, trade_id, params, current_price):
+        """Entry, size, risk and TP - an error dict if the trade is invalid"""
+        coin = params["coin"]
+        trade_type = params["trade_type"]
+        entry_type = params["entry_type"]
+        capital = params["capital"]
+        stop_loss = params["stop_loss"]
+        take_profit = params["take_profit"]
+        leverage = params["leverage"]
         
-        for config in TRAILING_CONFIG:
-            if is_long:
-                target_price = entry + (risk * config["rr"])
-                new_sl = entry + (risk * config["sl_move"]) if config["rr"] >= 1 else sl
+        if not current_price:
+            return {"success": False, "error": f"Could not fetch price for {coin}"}
+        
+        self.log(trade_id, f"📊 Current price: ${current_price}", "info")
+        
+        # Entry price
+        if entry_type == "MARKET":
+            entry_price = current_price
+        else:
+            entry_price = float(params["limit_price"])
+        
+        # Validate SL
+        if trade_type == "LONG" and stop_loss >= entry_price:
+            return {"success": False, "error": "For LONG, SL must be below entry"}
+        if trade_type == "SHORT" and stop_loss <= entry_price:
+            return {"success": False, "error": "For SHORT, SL must be above entry"}
+        
+        # Calculate quantity from capital
+        quantity = self.api.calculate_quantity(capital, entry_price, leverage)
+        
+        self.log(trade_id, f"📦 Quantity calculated: {quantity:.6f}", "info")
+        
+        # Calculate risk
+        risk_per_unit = abs(entry_price - stop_loss)
+        risk_amount = risk_per_unit * quantity
+        risk_percent = (risk_per_unit / entry_price) * 100 * leverage
+        
+        self.log(trade_id, f"⚠️ Risk: ${risk_amount:.2f} ({risk_percent:.2f}%)", "info")
+        
+        # Auto-calculate TP if not provided (at 2R)
+        if take_profit <= 0:
+            if trade_type == "LONG":
+                take_profit = entry_price + (risk_per_unit * 2)
             else:
-                target_price = entry - (risk * config["rr"])
-                new_sl = entry - (risk * config["sl_move"]) if config["rr"] >= 1 else sl
-            
-            profit_amount = risk * config["rr"] * quantity
-            profit_percent = ((config["rr"] * risk) / entry) * 100 * leverage
-            
-            levels.append({
-                "rr": config["rr"],
-                "target_price": round(target_price, 2),
-                "new_sl": round(new_sl, 2) if config["rr"] >= 1 else round(sl, 2),
-                "action": config["action"],
-                "book_percent": config["book_percent"],
-                "profit_amount": round(profit_amount, 2),
-                "profit_percent": round(profit_percent, 2),
-                "reached": False
-            })
+                take_profit = entry_price - (risk_per_unit * 2)
+            self.log(trade_id, f"🎯 Auto TP set at 2R: ${take_profit:.2f}", "info")
+        
+        # Place order
+        self.log(trade_id, f"📝 Placing {entry_type} order...", "info")
         
-        return levels
+        return {
+            "coin": coin,
+            "trade_type": trade_type,
+            "entry_type": entry_type,
+            "capital": capital,
+            "entry_price": entry_price,
+            "quantity": quantity,
+            "stop_loss": stop_loss,
+            "take_profit": take_profit,
+            "leverage": leverage,
+            "risk_per_unit": risk_per_unit,
+            "risk_amount": risk_amount,
+            "risk_percent": risk_percent,
+            # Exchange market name (BTCUSDT -> B-BTC_USDT) from the symbol index
+            "market": self.api.resolve_market(coin)
+        }
+    
+    def _entry_order(self, plan):
+        """(api method, args) for the entry order"""
+        market = plan["market"]
+        if plan["trade_type"] == "LONG":
+            if plan["entry_type"] == "MARKET":
+                return self.api.place_market_buy, (market, plan["capital"])
+            return self.api.place_limit_buy, (market, plan["entry_price"], plan["quantity"])
+        # SHORT
+        if plan["entry_type"] == "MARKET":
+            return self.api.place_market_sell, (market, plan["quantity"])
+        return self.api.place_limit_sell, (market, plan["entry_price"], plan["quantity"])
+    
+    def _open_trade(self, trade_id, plan, order_result):
+        """Check the entry order, then store and start monitoring the trade"""
+        if "error" in str(order_result).lower():
+            error_msg = str(order_result)
+            self.log(trade_id, f"❌ Order failed: {error_msg}", "error")
+            return {"success": False, "error": error_msg}
+        
+        order_id = "pending"
+        if "orders" in order_result and len(order_result["orders"]) > 0:
+            order_id = order_result["orders"][0].get("id", "unknown")
+        
+        self.log(trade_id, f"✅ Order placed! ID: {order_id}", "success")
+        
+        # A LIMIT entry is only monitored once the exchange reports a fill
+        pending = plan["entry_type"] != "MARKET"
+        
+        # Store trade (trailing levels derive from the shared ladder)
+        trade = Trade(
+            id=trade_id,
+            coin=plan["coin"],
+            symbol=canonical_symbol(plan["coin"]),
+            trade_type=plan["trade_type"],
+            entry_price=plan["entry_price"],
+            capital=plan["capital"],
+            quantity=plan["quantity"],
+            stop_loss=plan["stop_loss"],
+            take_profit=plan["take_profit"],
+            leverage=plan["leverage"],
+            risk_per_unit=plan["risk_per_unit"],
+            risk_amount=plan["risk_amount"],
+            risk_percent=plan["risk_percent"],
+            order_id=order_id,
+            status="PENDING_ENTRY" if pending else "ACTIVE",
+            created_at=datetime.now().isoformat(),
+            ladder=self.ladder
+        )
+        with self._tick_lock:
+            if pending:
+                self.pending_trades[trade_id] = trade
+            else:
+                self._add_trade(trade)
+            self._journal("open", trade)
+        
+        if pending:
+            self.log(trade_id, f"⏳ Waiting for the limit order to fill at ${plan['entry_price']}", "info")
+        else:
+            # Start monitoring
+            self._watch(plan["market"])
+        
+        trade_data = trade.to_dict()
+        self.emit("trade_started", trade_data)
+        
+        # Market entries are traded as filled right away; the reconciler corrects them
+        self._track_order(trade_id, "entry", plan["quantity"], order_result, 0.0 if pending else 1.0)
+        
+        return {
+            "success": True, 
+            "trade_id": trade_id, 
+            "trade": trade_data
+        }
     
     # ==========================================
     # MONITORING
@@ -244,54 +306,151 @@ class TrailingBot:
             return
         
         self.is_running = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        self.price_source.subscribe(
+            {self.api.resolve_market(t.coin) for t in self.active_trades.values()}
+        )
+        self.price_source.start(self._on_prices)
         print("🔄 Price monitoring started")
     
+    def _watch(self, market):
+        """Make sure prices for market reach the monitor"""
+        self.price_source.subscribe([market])
+        if not self.is_running:
+            self.start_monitoring()
+    
     def stop_monitoring(self):
         self.is_running = False
+        self.price_source.stop()
         print("⏹️ Monitoring stopped")
     
-    def _monitor_loop(self):
-        while self.is_running:
-            try:
-                self._check_all_trades()
-                time.sleep(PRICE_CHECK_INTERVAL)
-            except Exception as e:
-                print(f"Monitor error: {e}")
-                time.sleep(5)
+    def _on_prices(self, prices, symbols):
+        """Price source callback - serialised so REST and stream never overlap"""
+        with self._tick_lock:
+            self._check_all_trades(prices, symbols)
     
-    def _check_all_trades(self):
-        for trade_id, trade in list(self.active_trades.items()):
-            if trade["status"] != "ACTIVE":
+    def _check_all_trades(self, prices=None, symbols=None):
+        """
+        prices:  anything with .price(symbol) - fetched if not given
+        symbols: canonical symbols that ticked (None = every trade)
+        """
+        trace = self.slow_ticks.begin()  # None unless slow-tick capture is on
+        if prices is None:
+            started = time.perf_counter()
+            prices = self.api.get_symbol_index()
+            fetched = time.perf_counter() - started
+            PRICE_FETCH_SECONDS.observe(fetched)
+            if trace is not None:
+                trace.phase("fetch", fetched)
+            if prices is None:
+                return
+        
+        # Orders decided during the tick go out together at the end
+        started = time.perf_counter()
+        self._tick.batch = [] if BATCH_ORDERS else None
+        covered = 0
+        try:
+            if self.exit_retries:
+                self._retry_exits(prices)
+            covered = self._check_buckets(prices, symbols, trace)
+        finally:
+            batch, self._tick.batch = self._tick.batch, None
+            if batch:
+                sending = time.perf_counter()
+                self._send_batch(batch)
+                if trace is not None:
+                    trace.phase("send_batch", time.perf_counter() - sending, count=len(batch))
+        
+        elapsed = time.perf_counter() - started
+        TICK_SECONDS.observe(elapsed)
+        if covered:
+            TRADE_EVAL_SECONDS.observe(elapsed / covered)
+        if trace is not None:
+            self.slow_ticks.finish(trace, covered)
+    
+    def _check_buckets(self, prices, symbols, trace=None):
+        """Run the tick for the given symbols - returns how many trades it covered"""
+        # Only buckets for symbols that ticked - closed trades live elsewhere
+        if symbols is None:
+            buckets = list(self.trades_by_symbol.items())
+        else:
+            buckets = [(s, self.trades_by_symbol.get(s)) for s in symbols]
+        
+        covered = 0
+        for symbol, bucket in buckets:
+            if not bucket:
                 continue
-            try:
-                self._check_trade(trade_id, trade)
-            except Exception as e:
-                print(f"Check error {trade_id}: {e}")
-    
-    def _check_trade(self, trade_id, trade):
-        coin = trade["coin"]
-        trade_type = trade["trade_type"]
-        entry_price = trade["entry_price"]
-        current_sl = trade["current_sl"]
-        take_profit = trade["take_profit"]
-        risk = trade["risk_per_unit"]
-        levels = trade["trailing_levels"]
-        current_level = trade["current_level"]
-        
-        # Get price
-        current_price = self.api.get_futures_price(coin)
-        if not current_price:
-            current_price = self.api.get_price(f"B-{coin.replace('USDT', '_USDT')}")
+            current_price = prices.price(symbol)
+            if not current_price:
+                continue
+            covered += len(bucket)
+            if trace is not None:
+                lap = time.perf_counter()
+            
+            book = self.trigger_books.get(symbol)
+            if self.vectorized and book is not None:
+                fired = self._publish_vector(book, bucket, current_price)
+            else:
+                # Display updates for every trade on the symbol
+                for trade_id, trade in list(bucket.items()):
+                    try:
+                        self._publish_price(trade_id, trade, current_price)
+                    except Exception as e:
+                        self.event_log.message("error", f"Check error {trade_id}: {e}", trade_id)
+                fired = book.crossed(current_price) if book is not None else ()
+            if trace is not None:
+                now = time.perf_counter()
+                trace.phase("publish", now - lap, symbol, len(bucket))
+                lap = evaluating = now
+            
+            # State transitions only for trades whose triggers were crossed
+            for trade_id in fired:
+                trade = bucket.get(trade_id)
+                if trade is None:
+                    continue
+                try:
+                    self._evaluate_trade(trade_id, trade, current_price)
+                except Exception as e:
+                    self.event_log.message("error", f"Check error {trade_id}: {e}", trade_id)
+                if trace is not None:
+                    now = time.perf_counter()
+                    trace.call("evaluate", trade_id, now - lap)
+                    lap = now
+            if trace is not None and fired:
+                trace.phase("evaluate", time.perf_counter() - evaluating, symbol, len(fired))
+        return covered
+    
+    def _publish_vector(self, book, bucket, current_price):
+        """Columnar tick: one array pass for R:R, P/L and hit masks"""
+        rr, pnl, pnl_percent, fired = book.evaluate(current_price)
+        ids = list(book.ids)
         
-        if not current_price:
-            return
+        for trade_id, row_rr, row_pnl, row_pct in zip(ids, rr.tolist(), pnl.tolist(), pnl_percent.tolist()):
+            trade = bucket.get(trade_id)
+            if trade is None:
+                continue
+            self.emit("price_update", {
+                "trade_id": trade_id,
+                "current_price": round(current_price, 2),
+                "current_rr": round(row_rr, 2),
+                "pnl": round(row_pnl, 2),
+                "pnl_percent": round(row_pct, 2),
+                "current_sl": trade.current_sl,
+                "take_profit": trade.take_profit
+            })
         
-        is_long = trade_type == "LONG"
+        return [ids[i] for i in fired.nonzero()[0]]
+    
+    def _check_trade(self, trade_id, trade, current_price):
+        """Full check of one trade, bypassing the trigger book"""
+        self._publish_price(trade_id, trade, current_price)
+        self._evaluate_trade(trade_id, trade, current_price)
+    
+    def _publish_price(self, trade_id, trade, current_price):
+        entry_price = trade.entry_price
+        risk = trade.risk_per_unit
         
         # Calculate R:R
-        if is_long:
+        if trade.is_long:
             price_change = current_price - entry_price
         else:
             price_change = entry_price - current_price
@@ -299,8 +458,8 @@ class TrailingBot:
         current_rr = price_change / risk if risk > 0 else 0
         
         # P/L
-        pnl = price_change * trade["quantity"]
-        pnl_percent = (price_change / entry_price) * 100 * trade["leverage"]
+        pnl = price_change * trade.quantity
+        pnl_percent = (price_change / entry_price) * 100 * trade.leverage
         
         # Emit update
         self.emit("price_update", {
@@ -309,9 +468,26 @@ class TrailingBot:
             "current_rr": round(current_rr, 2),
             "pnl": round(pnl, 2),
             "pnl_percent": round(pnl_percent, 2),
-            "current_sl": current_sl,
-            "take_profit": take_profit
+            "current_sl": trade.current_sl,
+            "take_profit": trade.take_profit
         })
+    
+    def _evaluate_trade(self, trade_id, trade, current_price):
+        """TP, then SL, then trailing levels"""
+        entry_price = trade.entry_price
+        current_sl = trade.current_sl
+        take_profit = trade.take_profit
+        risk = trade.risk_per_unit
+        current_level = trade.current_level
+        
+        is_long = trade.is_long
+        
+        if is_long:
+            price_change = current_price - entry_price
+        else:
+            price_change = entry_price - current_price
+        
+        current_rr = price_change / risk if risk > 0 else 0
         
         # Check TP hit
         if take_profit > 0:
@@ -326,74 +502,237 @@ class TrailingBot:
             self._handle_sl_hit(trade_id, current_price)
             return
         
-        # Check trailing levels
-        for i, level in enumerate(levels):
-            if current_rr >= level["rr"] and i > current_level:
-                self._handle_level_reached(trade_id, i, level, current_price)
+        # Check trailing levels (ladder is sorted by R)
+        ladder_rr = trade.ladder.rr
+        for i in range(current_level + 1, len(ladder_rr)):
+            if current_rr >= ladder_rr[i]:
+                self._handle_level_reached(trade_id, i, trade.level(i), current_price)
     
     def _handle_level_reached(self, trade_id, level_index, level, current_price):
         trade = self.active_trades[trade_id]
         
-        trade["current_level"] = level_index
-        level["reached"] = True
+        # Levels up to current_level read as reached
+        trade.current_level = level_index
         
-        new_sl = level["new_sl"]
-        is_long = trade["trade_type"] == "LONG"
+        new_sl = level.new_sl
+        is_long = trade.is_long
         
-        should_update = (is_long and new_sl > trade["current_sl"]) or \
-                       (not is_long and new_sl < trade["current_sl"])
+        should_update = (is_long and new_sl > trade.current_sl) or \
+                       (not is_long and new_sl < trade.current_sl)
         
         if should_update:
-            old_sl = trade["current_sl"]
-            trade["current_sl"] = new_sl
+            old_sl = trade.current_sl
+            trade.current_sl = new_sl
             
             self.log(trade_id, 
-                f"🎯 {level['rr']}R HIT! Trail SL: ${old_sl:.2f} → ${new_sl:.2f}", 
+                f"🎯 {level.rr}R HIT! Trail SL: ${old_sl:.2f} → ${new_sl:.2f}", 
                 "alert")
             
             self.emit("level_reached", {
                 "trade_id": trade_id,
-                "level": level,
+                "level": level.to_dict(),
                 "new_sl": new_sl,
-                "action": level["action"]
+                "action": level.action
             })
         
+        self._update_triggers(trade)
+        self._journal("level", trade)
+        
         # Book profits
-        if level["book_percent"] > 0:
+        if level.book_percent > 0:
             self._book_profit(trade_id, level)
     
     def _book_profit(self, trade_id, level):
+        """Queue a partial close - sized when the order is actually sent"""
         trade = self.active_trades[trade_id]
+        book_percent = level.book_percent
         
-        book_percent = level["book_percent"]
-        quantity_to_close = trade["quantity"] * (book_percent / 100) * 0.3
+        def prepare():
+            # Runs after this trade's earlier orders have been applied
+            quantity_to_close = trade.quantity * (book_percent / 100) * 0.3
+            if quantity_to_close < 0.00001:
+                return None
+            
+            self.log(trade_id, f"💰 Booking {book_percent}% profit...", "success")
+            return quantity_to_close, self._close_order(trade, quantity_to_close, trade.entry_price)
         
-        if quantity_to_close < 0.00001:
-            return
+        def done(outcome, error):
+            if error is not None:
+                self.log(trade_id, f"⚠️ Booking failed: {error}", "error")
+                return
+            if outcome is None:
+                return
+            quantity_to_close, result = outcome
+            if "orders" not in result:
+                return
+            with self._tick_lock:
+                trade.quantity -= quantity_to_close
+                if trade_id in self.active_trades:
+                    self._update_triggers(trade)
+                self._journal("book", trade)
+            self.log(trade_id, f"✅ Profit booked! Remaining: {trade.quantity:.6f}", "success")
+            self._track_order(trade_id, "book", quantity_to_close, result, 1.0)
         
-        self.log(trade_id, f"💰 Booking {book_percent}% profit...", "success")
+        self._submit_order(trade_id, (trade_id, "book", level.index), prepare, done)
+    
+    def _submit_exit(self, trade, price, reason, attempts=0):
+        """Queue a market order closing whatever quantity is left - retried until sent"""
+        trade_id = trade.id
         
-        coin = trade["coin"]
-        market = coin if coin.startswith('B-') else f"B-{coin.replace('USDT', '_USDT')}"
+        def prepare():
+            # Exits jump every rate-limit queue
+            return None, self._close_order(trade, trade.quantity, price, PRIORITY_EXIT)
         
-        try:
-            if trade["trade_type"] == "LONG":
-                result = self.api.place_market_sell(market, quantity_to_close)
+        def done(outcome, error):
+            result = outcome[1] if outcome else None
+            if error is not None or "error" in str(result).lower():
+                self._exit_failed(trade, price, reason, attempts + 1, error or result)
+                return
+            with self._tick_lock:
+                trade.exit = None
+                self._journal("close", trade)
+            self.log(trade_id, f"📤 Exit order sent ({reason})", "info")
+            self._track_order(trade_id, "exit", trade.quantity, result, 1.0)
+        
+        return self._submit_order(trade_id, (trade_id, "exit"), prepare, done)
+    
+    def _exit_failed(self, trade, price, reason, attempts, error):
+        """The trade is out of the monitor but its position is still open - retry later"""
+        trade_id = trade.id
+        delay = EXIT_RETRY_BACKOFF[min(attempts, len(EXIT_RETRY_BACKOFF)) - 1]
+        with self._tick_lock:
+            self.exit_retries[trade_id] = (trade, price, reason, attempts, time.monotonic() + delay)
+            trade.exit = {"price": price, "reason": reason, "attempts": attempts}
+            self._journal("exit_failed", trade)
+        
+        self.log(trade_id, f"⚠️ Exit order failed ({reason}): {error} - retry {attempts} in {delay}s", "error")
+        if attempts == len(EXIT_RETRY_BACKOFF):
+            self.log(trade_id, f"🚨 Exit still failing after {attempts} attempts - check the position on the exchange", "error")
+        self.emit("exit_failed", {
+            "trade_id": trade_id,
+            "reason": reason,
+            "attempts": attempts,
+            "error": str(error)[:200]
+        })
+    
+    def _retry_exits(self, prices):
+        """Resend failed exits whose backoff is over, at the current price"""
+        now = time.monotonic()
+        for trade_id, (trade, price, reason, attempts, due) in list(self.exit_retries.items()):
+            if due > now:
+                continue
+            del self.exit_retries[trade_id]
+            self._submit_exit(trade, prices.price(trade.symbol) or price, reason, attempts)
+    
+    def _resume_exit(self, trade):
+        """An exit journaled before a restart but never acked - resend it on the first tick"""
+        exit = trade.exit
+        price = exit["price"] or trade.entry_price
+        self.exit_retries[trade.id] = (trade, price, exit["reason"], exit["attempts"], time.monotonic())
+        if self.price_source is not None:
+            self.price_source.subscribe([self.api.resolve_market(trade.coin)])
+    
+    def _close_order(self, trade, quantity, price, priority=PRIORITY_ORDER):
+        """place_order() kwargs for a market order reducing the position"""
+        order = {
+            "market": self.api.resolve_market(trade.coin),
+            "order_type": "market_order",
+            "priority": priority
+        }
+        if trade.is_long:
+            order.update(side="sell", quantity=quantity)
+        else:
+            order.update(side="buy", total_quantity=quantity * price)
+        return order
+    
+    def _submit_order(self, trade_id, key, prepare, on_done):
+        """
+        Hand an order to the executor. prepare() runs on the worker and
+        returns (tag, order kwargs) or None; on_done gets (tag, result).
+        During a tick the order is held back for the tick's batch.
+        """
+        batch = getattr(self._tick, "batch", None)
+        if batch is not None:
+            batch.append((trade_id, key, (prepare, on_done)))
+            return True
+        
+        def job():
+            prepared = prepare()
+            if prepared is None:
+                return None
+            tag, order = prepared
+            return tag, self.api.place_order(**order)
+        
+        return self.orders.submit(trade_id, key, job, on_done)
+    
+    # ==========================================
+    # BATCHED ORDERS
+    # ==========================================
+    
+    def _send_batch(self, batch):
+        """
+        Submit one tick's orders. Round k holds every trade's k-th order,
+        so several orders of one trade still run one after another.
+        """
+        rounds = []
+        seen = {}
+        for item in batch:
+            k = seen.get(item[0], 0)
+            seen[item[0]] = k + 1
+            if k == len(rounds):
+                rounds.append([])
+            rounds[k].append(item)
+        
+        for items in rounds:
+            if len(items) == 1:
+                trade_id, key, (prepare, on_done) = items[0]
+                self._submit_order(trade_id, key, prepare, on_done)
             else:
-                usdt = quantity_to_close * trade["entry_price"]
-                result = self.api.place_market_buy(market, usdt)
-            
-            if "orders" in result:
-                trade["quantity"] -= quantity_to_close
-                self.log(trade_id, f"✅ Profit booked! Remaining: {trade['quantity']:.6f}", "success")
-        except Exception as e:
-            self.log(trade_id, f"⚠️ Booking failed: {e}", "error")
+                self.orders.submit_group(items, self._run_batch, self._batch_done)
+    
+    def _prepare_batch(self, items):
+        """Size every leg now, then net them per market/side"""
+        legs = [prepare() for _, _, (prepare, _) in items]
+        orders, owner = net_orders([leg[1] for leg in legs if leg is not None])
+        return legs, orders, owner
+    
+    def _run_batch(self, items):
+        legs, orders, owner = self._prepare_batch(items)
+        if not orders:
+            return [None] * len(legs)
+        
+        priority = min(order.pop("priority") for order in orders)
+        batched, single = batch_plan(orders)
+        
+        def place(i):
+            return lambda: self.api.place_order(priority=priority, **orders[i])
+        
+        calls = [place(i) for i in single]
+        if batched:
+            calls.append(lambda: self.api.place_orders([orders[i] for i in batched], priority))
+        placed = self.orders.run_all(calls)
+        
+        results = dict(zip(single, placed))
+        if batched:
+            batch = split_results(placed[-1], len(batched))
+            if batch is None:
+                # Batch endpoint refused - its orders one request each, side by side
+                batch = self.orders.run_all([place(i) for i in batched])
+            results.update(zip(batched, batch))
+        return fan_out(legs, owner, [results[i] for i in range(len(orders))])
+    
+    def _batch_done(self, items, outcomes, error):
+        for i, (trade_id, _, (_, on_done)) in enumerate(items):
+            try:
+                on_done(outcomes[i] if outcomes else None, error)
+            except Exception as e:
+                self.event_log.message("error", f"Order callback error {trade_id}: {e}", trade_id)
     
     def _handle_tp_hit(self, trade_id, price):
-        trade = self.active_trades[trade_id]
-        trade["status"] = "CLOSED_TP"
+        trade = self._archive_trade(trade_id, "CLOSED_TP", "take profit", price)
+        self._submit_exit(trade, price, "take profit")
         
-        pnl = abs(price - trade["entry_price"]) * trade["quantity"]
+        pnl = abs(price - trade.entry_price) * trade.quantity
         
         self.log(trade_id, f"🎉 TAKE PROFIT HIT at ${price:.2f}! Profit: ${pnl:.2f}", "success")
         
@@ -405,8 +744,8 @@ class TrailingBot:
         })
     
     def _handle_sl_hit(self, trade_id, price):
-        trade = self.active_trades[trade_id]
-        trade["status"] = "CLOSED_SL"
+        trade = self._archive_trade(trade_id, "CLOSED_SL", "stop loss", price)
+        self._submit_exit(trade, price, "stop loss")
         
         self.log(trade_id, f"⚠️ STOP LOSS HIT at ${price:.2f}", "error")
         
@@ -417,42 +756,399 @@ class TrailingBot:
         })
     
     def close_trade(self, trade_id):
-        trade = self.active_trades.get(trade_id)
-        if not trade:
-            return {"success": False, "error": "Trade not found"}
+        trade = self._begin_close(trade_id)
+        if isinstance(trade, dict):
+            return trade
         
         try:
-            coin = trade["coin"]
-            current_price = self.api.get_futures_price(coin) or trade["entry_price"]
-            
-            market = coin if coin.startswith('B-') else f"B-{coin.replace('USDT', '_USDT')}"
-            
-            if trade["trade_type"] == "LONG":
-                result = self.api.place_market_sell(market, trade["quantity"])
+            current_price = self.api.get_futures_price(trade.coin) or trade.entry_price
+            return self._finish_close(trade, current_price)
+        except Exception as e:
+            # Already out of the monitor - the exit must still go out
+            self._exit_failed(trade, trade.entry_price, "manual", 1, e)
+            return {"success": False, "error": str(e)}
+    
+    def _begin_close(self, trade_id):
+        """Archive a trade for a manual close - the trade, or an error dict"""
+        with self._tick_lock:
+            if trade_id in self.pending_trades:
+                return self._cancel_entry(trade_id)
+            trade = self.active_trades.get(trade_id)
+            if not trade:
+                if trade_id in self.closed_trades:
+                    return {"success": False, "error": "Trade already closed"}
+                return {"success": False, "error": "Trade not found"}
+            # Out of the monitor first, so a concurrent SL/TP can't also exit
+            return self._archive_trade(trade_id, "CLOSED_MANUAL", "manual")
+    
+    def _cancel_entry(self, trade_id):
+        """Close a trade whose LIMIT entry hasn't filled - no position to exit"""
+        trade = self._archive_trade(trade_id, "CANCELLED")
+        self.log(trade_id, "🚫 Entry order cancelled", "info")
+        self.emit("trade_closed", {
+            "trade_id": trade_id,
+            "reason": "Entry Cancelled"
+        })
+        return {"success": True, "cancelled": trade.order_id}
+    
+    def _finish_close(self, trade, current_price):
+        trade_id = trade.id
+        trade.exit["price"] = current_price
+        self._submit_exit(trade, current_price, "manual")
+        
+        self.log(trade_id, f"✅ Closed at ${current_price:.2f}", "success")
+        
+        self.emit("trade_closed", {
+            "trade_id": trade_id,
+            "reason": "Manual Close",
+            "exit_price": current_price
+        })
+        
+        return {"success": True, "exit_price": current_price}
+    
+    # ==========================================
+    # ORDER FILLS
+    # ==========================================
+    
+    def _track_order(self, trade_id, kind, quantity, result, applied):
+        """Hand an acked order to the reconciler - kind: entry / book / exit"""
+        orders = result.get("orders") if isinstance(result, dict) else None
+        if not orders:
+            return
+        self.reconciler.track(orders[0], trade_id, kind, quantity, applied)
+        self._start_reconciler()
+    
+    def _start_reconciler(self):
+        self.reconciler.start()
+    
+    def _on_order_update(self, trade_id, kind, delta, order, final):
+        """
+        Reconciler callback: the leg's filled quantity changed by delta
+        (negative when less filled than the bot assumed).
+        """
+        with self._tick_lock:
+            trade = self._get_trade(trade_id)
+            if trade is None:
+                return
+            if kind == "entry":
+                self._entry_filled(trade, delta, order, final)
+            elif kind == "book":
+                self._booking_filled(trade, delta, order, final)
+            elif final:
+                self._exit_filled(trade, delta, order)
+    
+    def _entry_filled(self, trade, delta, order, final):
+        trade_id = trade.id
+        status = order.get("status")
+        price = float(order.get("avg_price") or 0) or trade.entry_price
+        
+        if trade.status == "PENDING_ENTRY":
+            if delta > 0:
+                # First fill - monitor whatever is filled, more may follow
+                self.pending_trades.pop(trade_id)
+                trade.quantity = delta
+                trade.status = "ACTIVE"
+                self._add_trade(trade)
+                self._journal("fill", trade)
+                self._watch(self.api.resolve_market(trade.coin))
+                filled = "filled" if status == "filled" else "partially filled"
+                self.log(trade_id, f"✅ Entry {filled}: {delta:.6f} at ${price:.2f}", "success")
+                self.emit("trade_filled", {"trade_id": trade_id, "quantity": trade.quantity, "price": price})
+            elif final:
+                self._entry_failed(trade_id, status)
+            return
+        
+        if trade.status != "ACTIVE":
+            if delta > 0:
+                self.log(trade_id, f"⚠️ Entry filled {delta:.6f} more after the trade closed - close it on the exchange", "error")
+            return
+        
+        if delta:
+            trade.quantity += delta
+            if final and trade.quantity <= 1e-12:
+                # Acted on as filled, but nothing was
+                self._entry_failed(trade_id, status)
+                return
+            self._update_triggers(trade)
+            self._journal("fill", trade)
+            self.log(trade_id, f"📦 Entry fill update: quantity now {trade.quantity:.6f}", "info")
+        elif final:
+            self.log(trade_id, f"✅ Entry filled at ${price:.2f}", "info")
+    
+    def _entry_failed(self, trade_id, status):
+        closed = "REJECTED" if status == "rejected" else "CANCELLED"
+        self._archive_trade(trade_id, closed)
+        self.log(trade_id, f"❌ Entry order {status} - nothing filled", "error")
+        self.emit("trade_closed", {
+            "trade_id": trade_id,
+            "reason": f"Entry {closed.title()}"
+        })
+    
+    def _booking_filled(self, trade, delta, order, final):
+        """The booking was applied at ack - give back what didn't fill"""
+        if not delta:
+            return
+        trade.quantity -= delta
+        if trade.id in self.active_trades:
+            self._update_triggers(trade)
+        self._journal("book", trade)
+        self.log(trade.id, f"⚠️ Booking order {order.get('status')}: {-delta:.6f} back in the position", "error")
+    
+    def _exit_filled(self, trade, delta, order):
+        status = order.get("status")
+        if status == "filled":
+            self.log(trade.id, f"📤 Exit filled at ${float(order.get('avg_price') or 0):.2f}", "info")
+        else:
+            self.log(trade.id, f"⚠️ Exit order {status}: {-delta:.6f} still open on the exchange", "error")
+    
+    # ==========================================
+    # TRADE INDEX
+    # ==========================================
+    
+    def _add_trade(self, trade):
+        self.active_trades[trade.id] = trade
+        self.trades_by_symbol.setdefault(trade.symbol, {})[trade.id] = trade
+        self._update_triggers(trade)
+    
+    def _new_book(self):
+        return VectorBook() if self.vectorized else TriggerBook()
+    
+    def _update_triggers(self, trade):
+        """Re-register a trade's nearest TP/SL/next-level prices"""
+        book = self.trigger_books.get(trade.symbol)
+        if book is None:
+            book = self.trigger_books[trade.symbol] = self._new_book()
+        book.track(trade)
+    
+    def _archive_trade(self, trade_id, status, exit_reason=None, price=None):
+        """
+        Close a trade and move it out of the monitored index. With an
+        exit_reason the position still has to be exited: the trade is
+        journaled as "exiting" until the exit order is acked.
+        """
+        trade = self.pending_trades.pop(trade_id, None)
+        if trade is None:
+            trade = self._unindex(trade_id)
+        trade.status = status
+        if exit_reason is not None:
+            trade.exit = {"price": price, "reason": exit_reason, "attempts": 0}
+        
+        # An entry still (partly) open on the exchange must not fill later
+        self.reconciler.cancel(trade.order_id)
+        
+        self.closed_trades[trade_id] = trade
+        self._journal("close" if trade.exit is None else "exiting", trade)
+        return trade
+    
+    def _unindex(self, trade_id):
+        """Take an active trade out of the monitor's buckets and books"""
+        trade = self.active_trades.pop(trade_id)
+        
+        symbol = trade.symbol
+        bucket = self.trades_by_symbol.get(symbol)
+        if bucket is not None:
+            bucket.pop(trade_id, None)
+            if not bucket:
+                del self.trades_by_symbol[symbol]
+        
+        book = self.trigger_books.get(symbol)
+        if book is not None:
+            book.remove(trade_id)
+            if not book:
+                del self.trigger_books[symbol]
+        return trade
+    
+    def _new_trade_id(self):
+        """trade_<unix seconds>, suffixed when several start in one second"""
+        base = f"trade_{int(time.time())}"
+        with self._id_lock:
+            trade_id, n = base, 1
+            while trade_id in self._trade_ids:
+                n += 1
+                trade_id = f"{base}_{n}"
+            self._trade_ids.add(trade_id)
+        return trade_id
+    
+    def _get_trade(self, trade_id):
+        trade = self.active_trades.get(trade_id)
+        if trade is None:
+            trade = self.pending_trades.get(trade_id) or self.closed_trades.get(trade_id)
+        return trade
+    
+    # ==========================================
+    # JOURNAL
+    # ==========================================
+    
+    def _journal(self, kind, trade):
+        """Record a state change: new trade version, then the journal"""
+        self._touch(trade)
+        if self.journal is not None:
+            self.journal.record(kind, trade)
+    
+    def restore(self):
+        """Rebuild trades from the journal and resume monitoring open ones"""
+        start = time.perf_counter()
+        for state in self.journal.load():
+            trade = Trade.from_state(state, self.ladder)
+            self._trade_ids.add(trade.id)
+            if trade.status == "ACTIVE":
+                self._add_trade(trade)
+            elif trade.status == "PENDING_ENTRY":
+                self.pending_trades[trade.id] = trade
+                # Ask the exchange what happened to the entry while we were down
+                order = {"id": trade.order_id, "market": self.api.resolve_market(trade.coin)}
+                self.reconciler.track(order, trade.id, "entry", trade.quantity)
             else:
-                usdt = trade["quantity"] * current_price
-                result = self.api.place_market_buy(market, usdt)
-            
-            trade["status"] = "CLOSED_MANUAL"
-            
-            self.log(trade_id, f"✅ Closed at ${current_price:.2f}", "success")
-            
-            self.emit("trade_closed", {
-                "trade_id": trade_id,
-                "reason": "Manual Close",
-                "exit_price": current_price
-            })
+                self.closed_trades[trade.id] = trade
+                if trade.exit is not None:
+                    self._resume_exit(trade)
+            self._touch(trade)
+        
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"♻️ Restored {len(self.active_trades)} open / {len(self.pending_trades)} pending / "
+              f"{len(self.closed_trades)} closed trades ({len(self.exit_retries)} exits to resend) "
+              f"in {elapsed:.1f} ms")
+        
+        if self.active_trades or self.exit_retries:
+            self.start_monitoring()
+        if self.pending_trades:
+            self._start_reconciler()
+    
+    # ==========================================
+    # VERSIONS
+    # ==========================================
+    
+    def _touch(self, trade):
+        """New version for a changed trade - remembers which fields changed"""
+        with self._version_lock:
+            version = next(self._versions)
+            view = trade.to_dict()
+            view["version"] = version
             
-            return {"success": True, "exit_price": current_price}
+            old = self._views.get(trade.id)
+            if old is None:
+                fields = dict.fromkeys(view, version)
+            else:
+                previous, fields = old
+                for key, value in view.items():
+                    if previous.get(key) != value:
+                        fields[key] = version
             
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+            self._store(trade, version, view, fields)
+    
+    def _touch_logs(self, trade):
+        """New version for a log line - only the log fields are rebuilt"""
+        with self._version_lock:
+            cached = self._views.get(trade.id)
+            if cached is not None:
+                version = next(self._versions)
+                view = dict(cached[0])  # pages already served keep the old view
+                view.update(trade.log_dict())
+                view["version"] = version
+                
+                fields = cached[1]
+                for key in ("logs", "log_count", "last_log_seq", "version"):
+                    fields[key] = version
+                self._store(trade, version, view, fields)
+                return
+        self._touch(trade)  # no view yet - build the full one
+    
+    def _store(self, trade, version, view, fields):
+        """Publish a trade's new version (version lock held)"""
+        trade.version = version
+        self.trades_version = version
+        self._views[trade.id] = (view, fields)
+        self._by_version[trade.id] = trade
+        self._by_version.move_to_end(trade.id)
+    
+    def _view(self, trade):
+        """Cached to_dict() of the trade's current version"""
+        cached = self._views.get(trade.id)
+        if cached is None:
+            self._touch(trade)
+            cached = self._views[trade.id]
+        return cached[0]
     
     def get_trade_status(self, trade_id):
-        return self.active_trades.get(trade_id)
+        trade = self._get_trade(trade_id)
+        return self._view(trade) if trade else None
+    
+    def _all_trades(self):
+        return (list(self.closed_trades.values()) + list(self.pending_trades.values())
+                + list(self.active_trades.values()))
     
     def get_all_trades(self):
-        return list(self.active_trades.values())
+        return [self._view(trade) for trade in self._all_trades()]
+    
+    def query_trades(self, status=None, since_version=None, offset=0, limit=TRADES_PAGE):
+        """
+        One page of trades, status "active" (incl. PENDING_ENTRY) / "closed" / None for all.
+        With since_version: only trades changed after it (oldest change
+        first), each with just the fields that changed; trades that no
+        longer match the status are listed in "removed". Pass the returned
+        "version" back as since_version for the next call.
+        """
+        with self._version_lock:
+            if since_version is None:
+                trades = [trade for trade in self._all_trades() if _status_matches(trade, status)]
+                page = trades[offset:offset + limit]
+                return {
+                    "version": self.trades_version,
+                    "trades": [self._views[trade.id][0] for trade in page],
+                    "total": len(trades),
+                    "offset": offset,
+                    "has_more": offset + len(page) < len(trades)
+                }
+            
+            changed = []
+            for trade in reversed(self._by_version.values()):
+                if trade.version <= since_version:
+                    break
+                changed.append(trade)
+            changed.reverse()
+            
+            page = changed[:limit]
+            has_more = len(changed) > len(page)
+            trades, removed = [], []
+            for trade in page:
+                if not _status_matches(trade, status):
+                    removed.append(trade.id)
+                    continue
+                view, fields = self._views[trade.id]
+                delta = {key: view[key] for key, version in fields.items() if version > since_version}
+                delta["id"] = trade.id
+                trades.append(delta)
+            
+            return {
+                "version": page[-1].version if has_more else max(self.trades_version, since_version),
+                "since_version": since_version,
+                "trades": trades,
+                "removed": removed,
+                "has_more": has_more
+            }
+    
+    def get_trade_logs(self, trade_id, since=0, limit=TRADE_LOG_PAGE):
+        """Log entries with seq > since (oldest first), one page at a time"""
+        trade = self._get_trade(trade_id)
+        if trade is None:
+            return None
+        entries = trade.logs.read(since, limit)
+        next_since = entries[-1]["seq"] if entries else since
+        return {
+            "trade_id": trade_id,
+            "logs": entries,
+            "next_since": next_since,
+            "last_seq": trade.logs.last_seq,
+            "has_more": next_since < trade.logs.last_seq
+        }
+
+
+def _status_matches(trade, status):
+    if status is None:
+        return True
+    if status == "active":
+        return trade.status in OPEN_STATUSES
+    return trade.status not in OPEN_STATUSES
 
 
 if __name__ == "__main__":
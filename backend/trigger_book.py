@@ -0,0 +1,109 @@
+"""
+Trigger Book - sorted SL/TP/trailing-level prices per symbol
+============================================================
+Each open trade registers at most two prices:
+- up:   fire when price >= up   (LONG: TP / next level, SHORT: SL)
+- down: fire when price <= down (LONG: SL, SHORT: TP / next level)
+
+A new price resolves to the crossed trades with two bisects, so a tick
+costs O(log n + fired) instead of checking every trade's ladder.
+"""
+
+from bisect import bisect_left, bisect_right
+
+# Register triggers a hair early so float rounding in the R:R maths can
+# never make the book miss a level the exact check would have hit.
+EPSILON = 1e-9
+
+
+def trigger_prices(trade):
+    """(up, down) - the nearest prices at which this trade needs a check"""
+    entry = trade.entry_price
+    risk = trade.risk_per_unit
+    take_profit = trade.take_profit if trade.take_profit > 0 else None
+    next_rr = trade.next_level_rr()
+    is_long = trade.is_long
+    
+    level_target = None
+    if next_rr is not None:
+        level_target = entry + risk * next_rr if is_long else entry - risk * next_rr
+    targets = [p for p in (take_profit, level_target) if p is not None]
+    
+    if is_long:
+        return min(targets, default=None), trade.current_sl
+    return trade.current_sl, max(targets, default=None)
+
+
+class TriggerBook:
+    
+    def __init__(self):
+        self.up_prices = []
+        self.up_ids = []
+        self.down_prices = []
+        self.down_ids = []
+        self.entries = {}  # trade_id -> (up, down)
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def track(self, trade):
+        """Add or refresh a trade after any SL/level/TP change"""
+        up, down = trigger_prices(trade)
+        self.set(trade.id, up, down)
+    
+    def set(self, trade_id, up=None, down=None):
+        """(Re)register a trade's nearest upward and downward triggers"""
+        if up is not None:
+            up -= abs(up) * EPSILON
+        if down is not None:
+            down += abs(down) * EPSILON
+        
+        if self.entries.get(trade_id) == (up, down):
+            return
+        self.remove(trade_id)
+        
+        if up is not None:
+            i = bisect_right(self.up_prices, up)
+            self.up_prices.insert(i, up)
+            self.up_ids.insert(i, trade_id)
+        if down is not None:
+            i = bisect_right(self.down_prices, down)
+            self.down_prices.insert(i, down)
+            self.down_ids.insert(i, trade_id)
+        self.entries[trade_id] = (up, down)
+    
+    def remove(self, trade_id):
+        entry = self.entries.pop(trade_id, None)
+        if entry is None:
+            return
+        up, down = entry
+        if up is not None:
+            self._delete(self.up_prices, self.up_ids, up, trade_id)
+        if down is not None:
+            self._delete(self.down_prices, self.down_ids, down, trade_id)
+    
+    @staticmethod
+    def _delete(prices, ids, price, trade_id):
+        i = bisect_left(prices, price)
+        while i < len(prices) and prices[i] == price:
+            if ids[i] == trade_id:
+                del prices[i]
+                del ids[i]
+                return
+            i += 1
+    
+    def crossed(self, price):
+        """Trade ids whose up or down trigger this price has reached"""
+        n = bisect_right(self.up_prices, price)
+        m = bisect_left(self.down_prices, price)
+        if not n and m == len(self.down_prices):
+            return ()
+        fired = self.up_ids[:n]
+        fired.extend(self.down_ids[m:])
+        return fired
+    
+    def bounds(self):
+        """(lowest up trigger, highest down trigger) - nothing fires between"""
+        up = self.up_prices[0] if self.up_prices else None
+        down = self.down_prices[-1] if self.down_prices else None
+        return up, down
\ No newline at end of file
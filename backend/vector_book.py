@@ -0,0 +1,110 @@
+"""
+Vector Book - columnar NumPy evaluation for large trade books
+=============================================================
+Drop-in alternative to TriggerBook (EVALUATION_BACKEND = "numpy").
+Open trades on one symbol are kept as parallel float64 columns, so a
+tick's R:R, P/L and TP/SL/level hit masks are a handful of array ops.
+Only rows that fired go back through TrailingBot._evaluate_trade.
+
+NumPy is optional - see VECTOR_AVAILABLE.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+VECTOR_AVAILABLE = np is not None
+
+COLUMNS = ("entry", "risk", "quantity", "leverage", "sl", "tp", "sign", "next_rr")
+
+
+class VectorBook:
+    
+    def __init__(self, capacity=64):
+        self.ids = []
+        self.rows = {}  # trade_id -> row
+        self.size = 0
+        self.capacity = capacity
+        self.cols = {name: np.zeros(capacity) for name in COLUMNS}
+    
+    def __len__(self):
+        return self.size
+    
+    def _grow(self):
+        self.capacity *= 2
+        for name, col in self.cols.items():
+            bigger = np.zeros(self.capacity)
+            bigger[:self.size] = col[:self.size]
+            self.cols[name] = bigger
+    
+    def track(self, trade):
+        """Add or refresh a trade's row after any SL/level/TP change"""
+        trade_id = trade.id
+        row = self.rows.get(trade_id)
+        if row is None:
+            if self.size == self.capacity:
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.rows[trade_id] = row
+            self.ids.append(trade_id)
+        
+        next_rr = trade.next_level_rr()
+        cols = self.cols
+        cols["entry"][row] = trade.entry_price
+        cols["risk"][row] = trade.risk_per_unit
+        cols["quantity"][row] = trade.quantity
+        cols["leverage"][row] = trade.leverage
+        cols["sl"][row] = trade.current_sl
+        cols["tp"][row] = trade.take_profit
+        cols["sign"][row] = 1.0 if trade.is_long else -1.0
+        cols["next_rr"][row] = np.inf if next_rr is None else next_rr
+    
+    def remove(self, trade_id):
+        """Swap the last row into the hole - O(1)"""
+        row = self.rows.pop(trade_id, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            for col in self.cols.values():
+                col[row] = col[last]
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.rows[moved] = row
+        self.ids.pop()
+        self.size -= 1
+    
+    def evaluate(self, price):
+        """
+        One tick for every row:
+        returns (current_rr, pnl, pnl_percent, fired_mask) arrays
+        """
+        n = self.size
+        c = self.cols
+        sign = c["sign"][:n]
+        entry = c["entry"][:n]
+        risk = c["risk"][:n]
+        tp = c["tp"][:n]
+        
+        # Same float ops as the per-trade path (sign flip is exact)
+        change = sign * (price - entry)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rr = np.where(risk > 0, change / risk, 0.0)
+        pnl = change * c["quantity"][:n]
+        pnl_percent = (change / entry) * 100 * c["leverage"][:n]
+        
+        tp_hit = (tp > 0) & (sign * (price - tp) >= 0)
+        sl_hit = sign * (price - c["sl"][:n]) <= 0
+        level_hit = rr >= c["next_rr"][:n]
+        
+        return rr, pnl, pnl_percent, tp_hit | sl_hit | level_hit
+    
+    def crossed(self, price):
+        """Trade ids that need the full TP/SL/level state machine"""
+        if not self.size:
+            return ()
+        fired = self.evaluate(price)[3]
+        ids = self.ids
+        return [ids[i] for i in np.flatnonzero(fired)]
\ No newline at end of file
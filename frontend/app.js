@@ -13,7 +13,7 @@ const State = {
     price: 0,
     leverage: 1,
     trade: null,
-    socket: null,
+    events: null,
     prices: {}
 };
 
@@ -22,35 +22,59 @@ const State = {
 // ==========================================
 
 document.addEventListener('DOMContentLoaded', () => {
-    initSocket();
-    fetchPrices();
-    setInterval(fetchPrices, 2000);
+    if (window.EventSource) {
+        initEvents();
+    } else {
+        // No push support - poll the ticker instead
+        fetchPrices();
+        setInterval(fetchPrices, 2000);
+    }
 });
 
-function initSocket() {
+function initEvents() {
+    // One stream for prices and bot events; the browser reconnects on its own
+    const events = new EventSource(`${SERVER}/api/events`);
+    State.events = events;
+    
+    events.onopen = () => {
+        if (!State.connected) log('Connected to server', 'success');
+        State.connected = true;
+        updateStatus(true);
+    };
+    
+    events.onerror = () => {
+        if (State.connected) log('Disconnected', 'error');
+        State.connected = false;
+        updateStatus(false);
+    };
+    
+    const on = (name, handler) => events.addEventListener(name, (e) => handler(JSON.parse(e.data)));
+    
+    on('prices', (data) => {
+        State.prices = data;
+        renderPrices();
+    });
+    on('price_update', onPriceUpdate);
+    on('level_reached', onLevelReached);
+    on('trade_closed', onTradeClosed);
+    on('log', (data) => log(data.log.message, data.log.type));
+    on('resync', resyncTrade);
+}
+
+async function resyncTrade() {
+    // Events were dropped while this tab was too slow - reload the trade
+    if (!State.trade) return;
     try {
-        State.socket = io(SERVER);
-        
-        State.socket.on('connect', () => {
-            State.connected = true;
-            updateStatus(true);
-            log('Connected to server', 'success');
-        });
-        
-        State.socket.on('disconnect', () => {
-            State.connected = false;
-            updateStatus(false);
-            log('Disconnected', 'error');
-        });
-        
-        State.socket.on('price_update', onPriceUpdate);
-        State.socket.on('level_reached', onLevelReached);
-        State.socket.on('trade_closed', onTradeClosed);
-        State.socket.on('log', (data) => log(data.log.message, data.log.type));
+        const res = await fetch(`${SERVER}/api/bot/status/${State.trade.id}`);
+        const trade = await res.json();
+        if (!res.ok || !['ACTIVE', 'PENDING_ENTRY'].includes(trade.status)) {
+            hideMonitor();
+        } else {
+            State.trade = trade;
+            showMonitor(trade);
+        }
     } catch (e) {
-        console.error('Socket error:', e);
-        // Fallback to polling
-        setInterval(pollStatus, 3000);
+        console.error('Resync error:', e);
     }
 }
 
@@ -95,23 +119,7 @@ async function fetchPrices() {
             }
         });
         
-        // Update UI
-        const pairs = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT', 'DOGEUSDT', 'ADAUSDT'];
-        pairs.forEach(pair => {
-            const price = getPrice(pair);
-            const el = document.getElementById(`price-${pair}`);
-            if (el && price) {
-                el.textContent = formatPrice(price);
-            }
-            
-            if (State.coin === pair && price) {
-                State.price = price;
-                document.getElementById('livePrice').textContent = `$${price.toLocaleString()}`;
-            }
-        });
-        
-        updateSummary();
-        updateSLSuggestions();
+        renderPrices();
         
     } catch (e) {
         console.error('Fetch error:', e);
@@ -119,6 +127,25 @@ async function fetchPrices() {
     }
 }
 
+function renderPrices() {
+    const pairs = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT', 'DOGEUSDT', 'ADAUSDT'];
+    pairs.forEach(pair => {
+        const price = getPrice(pair);
+        const el = document.getElementById(`price-${pair}`);
+        if (el && price) {
+            el.textContent = formatPrice(price);
+        }
+        
+        if (State.coin === pair && price) {
+            State.price = price;
+            document.getElementById('livePrice').textContent = `$${price.toLocaleString()}`;
+        }
+    });
+    
+    updateSummary();
+    updateSLSuggestions();
+}
+
 function getPrice(symbol) {
     // Try different formats
     const formats = [